@@ -0,0 +1,96 @@
+"""
+bench_approx_quantiles.py
+
+Compares the KLL sketch used by 'compute_statistics.py --approx' with the
+exact calculate_median on the TC1-TC7 inputs and on synthetic data.
+
+For every input it reports the time of the exact median, the time to
+feed the sketch in parser-sized batches, the items the sketch retains,
+and the normalized rank error of the approximate median, p90 and p99
+(|rank(estimate) / n - requested fraction|).
+
+Usage: python bench_approx_quantiles.py [max_exponent] [sketch_k]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+
+P1_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '..', 'p1', 'source')
+sys.path.insert(0, P1_SOURCE)
+
+# pylint: disable=wrong-import-position
+from compute_statistics import calculate_median, read_file  # noqa: E402
+from quantile_sketch import DEFAULT_K, KLLSketch  # noqa: E402
+
+FRACTIONS = (0.5, 0.9, 0.99)
+BATCH_SIZE = 65536
+
+
+def rank_error(sorted_data, estimate, fraction):
+    """
+    Returns the normalized rank error of an estimate. Any rank inside
+    the run of values equal to the estimate counts as exact.
+    """
+    n_items = len(sorted_data)
+    low = bisect_left(sorted_data, estimate) / n_items
+    high = bisect_right(sorted_data, estimate) / n_items
+    if low <= fraction <= high:
+        return 0.0
+    return min(abs(low - fraction), abs(high - fraction))
+
+
+def benchmark(name, data, sketch_k):
+    """Prints one CSV row comparing exact and approximate quantiles."""
+    start = time.perf_counter()
+    calculate_median(data)
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sketch = KLLSketch(sketch_k, seed=0)
+    for start_index in range(0, len(data), BATCH_SIZE):
+        sketch.update_many(data[start_index:start_index + BATCH_SIZE])
+    estimates = sketch.quantiles(FRACTIONS)
+    sketch_time = time.perf_counter() - start
+
+    sorted_data = sorted(data)
+    errors = [rank_error(sorted_data, estimate, fraction)
+              for estimate, fraction in zip(estimates, FRACTIONS)]
+    retained = sum(len(compactor) for compactor in sketch.compactors)
+    print(f"{name},{len(data)},{exact_time:.6f},{sketch_time:.6f},"
+          f"{retained},"
+          + ",".join(f"{error * 100:.3f}" for error in errors))
+
+
+def main():
+    """
+    Main execution function.
+    """
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    sketch_k = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_K
+
+    print(f"Input,N,Exact median (s),Sketch (s),Retained items,"
+          f"Median error %,P90 error %,P99 error % (k={sketch_k})")
+
+    for case in range(1, 8):
+        file_path = os.path.join(P1_SOURCE, f"TC{case}.txt")
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = read_file(file_path)
+        benchmark(f"TC{case}", data, sketch_k)
+
+    rng = random.Random(42)
+    for exponent in range(4, max_exponent + 1):
+        n_items = 10 ** exponent
+        benchmark("uniform", [rng.uniform(0, 1000)
+                              for _ in range(n_items)], sketch_k)
+        benchmark("lognormal", [rng.lognormvariate(0, 2)
+                                for _ in range(n_items)], sketch_k)
+
+
+if __name__ == "__main__":
+    main()
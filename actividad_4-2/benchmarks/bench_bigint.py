@@ -0,0 +1,71 @@
+"""
+bench_bigint.py
+
+Compares the conversions of convert_numbers.py on single integers whose
+size sweeps from 1 to 10**5 decimal digits:
+
+- basic:    to_binary() + to_hexadecimal(), one digit per step
+- table:    to_binary_and_hex(), one byte per step
+- split:    to_binary_and_hex_big(), divide and conquer (--bigint)
+
+Every result is checked against the table conversion. The basic
+algorithms are skipped above max_basic_digits because they are
+quadratic with a large constant.
+
+Usage: python bench_bigint.py [max_digits] [max_basic_digits]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'p2', 'source'))
+
+# pylint: disable=wrong-import-position
+from convert_numbers import (  # noqa: E402
+    to_binary, to_binary_and_hex, to_binary_and_hex_big, to_hexadecimal)
+
+
+def timed(function, number):
+    """Returns (result, seconds) of function(number)."""
+    start = time.perf_counter()
+    result = function(number)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """
+    Main execution function.
+    """
+    max_digits = int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000
+    max_basic = int(float(sys.argv[2])) if len(sys.argv) > 2 else 3_000
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+
+    rng = random.Random(42)
+    print("Digits,Basic (s),Table (s),Split (s),Split speedup,Matches")
+    sweep = [scale * 10 ** exponent
+             for exponent in range(len(str(max_digits)))
+             for scale in (1, 3)]
+    for digits in (value for value in sweep if value <= max_digits):
+        number = rng.randrange(10 ** (digits - 1), 10 ** digits)
+
+        expected, table_time = timed(to_binary_and_hex, number)
+        result, split_time = timed(to_binary_and_hex_big, number)
+        matches = result == expected
+        basic = ""
+        if digits <= max_basic:
+            result, basic_time = timed(
+                lambda value: (to_binary(value), to_hexadecimal(value)),
+                number)
+            matches = matches and result == expected
+            basic = f"{basic_time:.6f}"
+
+        print(f"{digits},{basic},{table_time:.6f},{split_time:.6f},"
+              f"{table_time / split_time:.2f},{matches}")
+
+
+if __name__ == "__main__":
+    main()
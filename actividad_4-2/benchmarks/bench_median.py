@@ -0,0 +1,63 @@
+"""
+bench_median.py
+
+Compares the sort-based and the selection-based median of
+compute_statistics.calculate_median on random data of growing size.
+
+Usage: python bench_median.py [max_exponent]
+"""
+
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'p1', 'source'))
+
+# pylint: disable=wrong-import-position
+from compute_statistics import calculate_median  # noqa: E402
+
+
+def time_call(func, *args, repeat=3, **kwargs):
+    """Returns the best wall-clock time of several calls and the result."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def main():
+    """
+    Main execution function.
+    """
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    rng = random.Random(42)
+
+    print("Distribution,N,Sort (s),Select (s),Speedup,Match")
+    for exponent in range(3, max_exponent + 1):
+        n_items = 10 ** exponent
+        datasets = {
+            "uniform": array('d', (rng.uniform(0, 1000)
+                                   for _ in range(n_items))),
+            "integers": array('d', (float(rng.randint(0, 500))
+                                    for _ in range(n_items))),
+            "sorted": array('d', range(n_items)),
+        }
+        for name, data in datasets.items():
+            sort_time, sort_median = time_call(calculate_median, data)
+            select_time, select_median = time_call(calculate_median, data,
+                                                   method="select")
+            print(f"{name},{n_items},{sort_time:.6f},{select_time:.6f},"
+                  f"{sort_time / select_time:.2f},"
+                  f"{sort_median == select_median}")
+
+
+if __name__ == "__main__":
+    main()
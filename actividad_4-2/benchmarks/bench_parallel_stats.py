@@ -0,0 +1,61 @@
+"""
+bench_parallel_stats.py
+
+Measures how the stream backend of compute_statistics scales with the
+number of worker processes on a synthetic input file, and checks that
+every run matches the serial result.
+
+Usage: python bench_parallel_stats.py [n_lines] [max_jobs]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'p1', 'source'))
+
+# pylint: disable=wrong-import-position
+from compute_statistics import (  # noqa: E402
+    SummaryOptions, summarize_stream)
+
+
+def write_synthetic_file(file_path, n_lines, seed=42):
+    """Writes n_lines random readings with one decimal place."""
+    rng = random.Random(seed)
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for _ in range(n_lines):
+            file.write(f"{rng.randint(0, 99999) / 10}\n")
+
+
+def main():
+    """
+    Main execution function.
+    """
+    n_lines = int(float(sys.argv[1])) if len(sys.argv) > 1 else 2_000_000
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "synthetic.txt")
+        write_synthetic_file(file_path, n_lines)
+
+        print("Jobs,Lines,Time (s),Speedup,Matches serial")
+        serial_time = None
+        serial_result = None
+        jobs = 1
+        while jobs <= max_jobs:
+            start = time.perf_counter()
+            result = summarize_stream(
+                file_path, SummaryOptions(jobs=jobs, input_format="text"))
+            elapsed = time.perf_counter() - start
+            if serial_time is None:
+                serial_time, serial_result = elapsed, result
+            print(f"{jobs},{n_lines},{elapsed:.4f},"
+                  f"{serial_time / elapsed:.2f},{result == serial_result}")
+            jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
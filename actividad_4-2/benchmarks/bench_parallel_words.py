@@ -0,0 +1,60 @@
+"""
+bench_parallel_words.py
+
+Measures how 'word_count.py --jobs N' scales from 1 to max_jobs worker
+processes on a synthetic corpus, and checks that every run produces the
+same frequency-sorted rows as the serial count.
+
+Usage: python bench_parallel_words.py [n_lines] [max_jobs]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'p3', 'source'))
+
+# pylint: disable=wrong-import-position
+from word_count import count_file, parallel_count_file  # noqa: E402
+from generate_data import generate_words  # noqa: E402
+
+
+def sorted_rows(word_counts):
+    """Returns the CSV rows main() writes for a frequency table."""
+    return [f"{word}, {count}"
+            for word, count in sorted(word_counts.items(),
+                                      key=lambda item: item[1],
+                                      reverse=True)]
+
+
+def main():
+    """
+    Main execution function.
+    """
+    n_lines = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "corpus.txt")
+        generate_words(file_path, n_lines)
+
+        start = time.perf_counter()
+        serial_rows = sorted_rows(count_file(file_path))
+        serial_time = time.perf_counter() - start
+
+        print("Jobs,Lines,Time (s),Speedup,Matches serial")
+        print(f"serial,{n_lines},{serial_time:.4f},1.00,True")
+        jobs = 1
+        while jobs <= max_jobs:
+            start = time.perf_counter()
+            rows = sorted_rows(parallel_count_file(file_path, jobs))
+            elapsed = time.perf_counter() - start
+            print(f"{jobs},{n_lines},{elapsed:.4f},"
+                  f"{serial_time / elapsed:.2f},{rows == serial_rows}")
+            jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+bench_tokenizer.py
+
+Measures the cost of the word_count.py normalization options against
+counting the plain split() words of the same corpus:
+
+- lowercase:   --lowercase
+- casefold:    --casefold
+- punctuation: --strip-punctuation
+- all:         --casefold --strip-punctuation --stopwords
+
+The corpus is the synthetic Zipf word list of generate_data.py with
+capitalized words and trailing punctuation mixed in. Every option is
+also checked against normalizing each word of the whole file at once.
+
+Usage: python bench_tokenizer.py [n_lines] [repeat]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'p3', 'source'))
+
+# pylint: disable=wrong-import-position
+from word_count import (  # noqa: E402
+    build_normalizer, count_file, remove_stopwords)
+from generate_data import generate_words  # noqa: E402
+
+OPTIONS = {
+    "plain": {},
+    "lowercase": {"lowercase": True},
+    "casefold": {"casefold": True},
+    "punctuation": {"strip_punctuation": True},
+    "all": {"casefold": True, "strip_punctuation": True},
+}
+STOPWORDS = {f"word{rank}" for rank in range(20)}
+
+
+def add_noise(file_path, seed=42):
+    """Capitalizes some words and appends punctuation to others."""
+    rng = random.Random(seed)
+    with open(file_path, 'r', encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    for line_index, line in enumerate(lines):
+        words = line.split()
+        for index, word in enumerate(words):
+            draw = rng.random()
+            if draw < 0.1:
+                words[index] = word.capitalize()
+            elif draw < 0.2:
+                words[index] = word + rng.choice(",.;:!?")
+        lines[line_index] = " ".join(words)
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def reference_count(file_path, normalize):
+    """Normalizes the whole file at once, then counts its words."""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+        text = file.read()
+    return Counter(normalize(text).split() if normalize else text.split())
+
+
+def main():
+    """
+    Main execution function.
+    """
+    n_lines = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "corpus.txt")
+        generate_words(file_path, n_lines)
+        add_noise(file_path)
+
+        print("Option,Lines,Distinct Words,Time (s),Overhead %,"
+              "Matches reference")
+        plain_time = None
+        for name, options in OPTIONS.items():
+            normalize = build_normalizer(**options)
+            stopwords = STOPWORDS if name == "all" else set()
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                counts = remove_stopwords(
+                    count_file(file_path, normalize=normalize), stopwords)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            if plain_time is None:
+                plain_time = best
+
+            reference = remove_stopwords(
+                reference_count(file_path, normalize), stopwords)
+            print(f"{name},{n_lines},{len(counts)},{best:.4f},"
+                  f"{100 * (best / plain_time - 1):.1f},"
+                  f"{list(counts.items()) == list(reference.items())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+generate_data.py
+
+Generates synthetic inputs for the actividad_4-2 programs.
+
+- numbers: one number per line, as read by compute_statistics.py and
+  convert_numbers.py. A share of the lines can be invalid and a share
+  can use a comma as decimal separator.
+- words: lines of whitespace separated words, as read by word_count.py,
+  drawn from a Zipf-like vocabulary.
+
+Usage:
+    python generate_data.py numbers output.txt [--lines N] [--invalid F]
+                                               [--comma F] [--integers]
+    python generate_data.py words output.txt [--lines N] [--vocabulary V]
+"""
+
+import argparse
+import random
+
+INVALID_TOKENS = ("ABC", "12.5.1", "--", "n/a", "1e", "#")
+
+
+# The settings mirror the command line options and are keyword-only
+# pylint: disable-next=too-many-arguments
+def generate_numbers(file_path, n_lines, *, invalid_share=0.0,
+                     comma_share=0.0, integers=False, seed=42):
+    """
+    Writes n_lines numbers. invalid_share and comma_share are the
+    fractions of invalid lines and of decimals written with a comma
+    (with integers, a comma share adds a one-digit fraction).
+    """
+    rng = random.Random(seed)
+    with open(file_path, 'w', encoding='utf-8') as file:
+        lines = []
+        for _ in range(n_lines):
+            draw = rng.random()
+            if draw < invalid_share:
+                lines.append(rng.choice(INVALID_TOKENS))
+            elif integers:
+                text = str(rng.randint(-10_000_000, 10_000_000))
+                if draw < invalid_share + comma_share:
+                    text += f",{rng.randint(1, 9)}"
+                lines.append(text)
+            else:
+                text = f"{rng.uniform(0, 1000):.2f}"
+                if draw < invalid_share + comma_share:
+                    text = text.replace('.', ',')
+                lines.append(text)
+            if len(lines) >= 100_000:
+                file.write("\n".join(lines) + "\n")
+                lines = []
+        if lines:
+            file.write("\n".join(lines) + "\n")
+
+
+def generate_words(file_path, n_lines, vocabulary=50_000, words_per_line=10,
+                   seed=42):
+    """
+    Writes n_lines lines of words_per_line words drawn from a vocabulary
+    with a Zipf-like frequency distribution.
+    """
+    rng = random.Random(seed)
+    words = [f"word{index}" for index in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    with open(file_path, 'w', encoding='utf-8') as file:
+        remaining = n_lines
+        while remaining:
+            block = min(remaining, 10_000)
+            tokens = rng.choices(words, weights, k=block * words_per_line)
+            file.write("".join(
+                " ".join(tokens[start:start + words_per_line]) + "\n"
+                for start in range(0, len(tokens), words_per_line)))
+            remaining -= block
+
+
+def main():
+    """
+    Main execution function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("kind", choices=("numbers", "words"))
+    parser.add_argument("output")
+    parser.add_argument("--lines", type=lambda text: int(float(text)),
+                        default=1000, help="lines to write (e.g. 1e6)")
+    parser.add_argument("--invalid", type=float, default=0.0,
+                        help="share of invalid lines (numbers)")
+    parser.add_argument("--comma", type=float, default=0.0,
+                        help="share of comma decimals (numbers)")
+    parser.add_argument("--integers", action="store_true",
+                        help="write integers instead of decimals (numbers)")
+    parser.add_argument("--vocabulary", type=int, default=50_000,
+                        help="distinct words (words)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.kind == "numbers":
+        generate_numbers(args.output, args.lines, invalid_share=args.invalid,
+                         comma_share=args.comma, integers=args.integers,
+                         seed=args.seed)
+    else:
+        generate_words(args.output, args.lines, args.vocabulary,
+                       seed=args.seed)
+    print(f"Wrote {args.lines} lines to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+run_benchmarks.py
+
+Benchmark harness for compute_statistics.py, convert_numbers.py and
+word_count.py.
+
+For every program and input size it generates a synthetic input with
+generate_data.py and runs the program's own main() on it in a fresh
+worker process, so batches are streamed exactly as in a normal run.
+The wall time is split into stages by timing the program's functions:
+
+- parse:   the batch parser (iter_number_batches, iter_numbers or
+           iter_chunk_words), while it produces each batch
+- compute: everything else until the results file is opened
+           (statistics, base conversions or word counts)
+- format:  building the CSV lines once the results file is open
+- write:   ResultWriter opening, flushing and closing the results file
+           in a temporary tests directory
+
+The report holds the throughput (lines and MB per second) and the peak
+RSS of the worker, and is saved as JSON together with the git commit, so
+results can be compared across commits.
+
+Usage:
+    python run_benchmarks.py [--sizes 1e3,1e4,1e5,1e6] [--invalid F]
+                             [--comma F] [--programs stats,convert,words]
+                             [--repeat N] [--data-dir DIR] [--output FILE]
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib
+import inspect
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+for program_dir in ('p1', 'p2', 'p3'):
+    sys.path.insert(0, os.path.join(BENCH_DIR, '..', program_dir, 'source'))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'common'))
+
+# pylint: disable=wrong-import-position
+from result_writer import ResultWriter  # noqa: E402
+from generate_data import generate_numbers, generate_words  # noqa: E402
+
+PROGRAMS = ("stats", "convert", "words")
+STAGES = ("parse", "compute", "format", "write")
+DEFAULT_SIZES = "1e3,1e4,1e5,1e6"
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "benchmark_results.json")
+
+
+# program -> (module, {function: stage}); the functions are charged to
+# their stage while they run, everything else to the current stage
+STAGE_FUNCTIONS = {
+    "stats": ("compute_statistics", {"iter_number_batches": "parse"}),
+    "convert": ("convert_numbers", {
+        "iter_numbers": "parse",
+        "ConversionCache.iter_convert": "compute",
+    }),
+    "words": ("word_count", {"iter_chunk_words": "parse"}),
+}
+
+
+class StageClock:
+    """
+    Splits the wall time of a run into STAGES.
+
+    Time is charged to the current stage. A patched function switches
+    to its own stage while it runs and, if it returns a generator, while
+    each item is produced, so nested stages are charged exclusively.
+    """
+
+    def __init__(self, stage):
+        self.timings = dict.fromkeys(STAGES, 0.0)
+        self.stage = stage
+        self.mark = time.perf_counter()
+
+    def switch(self, stage):
+        """Charges the time so far to the current stage; returns it."""
+        now = time.perf_counter()
+        self.timings[self.stage] += now - self.mark
+        self.mark = now
+        previous, self.stage = self.stage, stage
+        return previous
+
+    def iterate(self, stage, iterator):
+        """Yields the items of an iterator, charging them to stage."""
+        while True:
+            previous = self.switch(stage)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.switch(previous)
+            yield item
+
+    def patch(self, owner, name, stage, then=None):
+        """
+        Replaces owner.name with a version charged to stage. With then,
+        the clock stays in that stage after each call.
+        """
+        function = getattr(owner, name)
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            previous = self.switch(stage)
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                self.switch(then or previous)
+            if inspect.isgenerator(result):
+                return self.iterate(stage, result)
+            return result
+
+        setattr(owner, name, timed)
+
+
+def peak_rss_kib():
+    """Returns the peak resident set size of this process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_worker(program, file_path):
+    """
+    Runs the main() of one program on one file and prints the stage
+    timings as JSON. Console output of the program is discarded.
+    """
+    module_name, functions = STAGE_FUNCTIONS[program]
+    # Imported before timing so that start-up cost is not counted as parsing
+    module = importlib.import_module(module_name)
+    clock = StageClock("compute")
+    for path, stage in functions.items():
+        *owners, name = path.split(".")
+        owner = functools.reduce(getattr, owners, module)
+        clock.patch(owner, name, stage)
+    # Opening the results file ends the computation
+    clock.patch(ResultWriter, "__init__", "write", then="format")
+    clock.patch(ResultWriter, "flush", "write")
+    clock.patch(ResultWriter, "close", "write")
+
+    sys.argv = [module.__file__, file_path, "--quiet"]
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            clock.switch("compute")
+            module.main()
+            clock.switch(clock.stage)
+    print(json.dumps({"stages": clock.timings,
+                      "peak_rss_kib": peak_rss_kib()}))
+
+
+def generate_input(program, n_lines, args, data_dir):
+    """Generates (or reuses) the input file for a benchmark case."""
+    if program == "words":
+        file_path = os.path.join(data_dir, f"words_{n_lines}.txt")
+        if not os.path.exists(file_path):
+            generate_words(file_path, n_lines)
+        return file_path
+
+    integers = program == "convert"
+    kind = "integers" if integers else "decimals"
+    file_path = os.path.join(
+        data_dir,
+        f"{kind}_{n_lines}_i{args.invalid:g}_c{args.comma:g}.txt")
+    if not os.path.exists(file_path):
+        generate_numbers(file_path, n_lines, invalid_share=args.invalid,
+                         comma_share=args.comma, integers=integers)
+    return file_path
+
+
+def run_case(program, file_path, n_lines, repeat):
+    """
+    Runs a benchmark case repeat times in fresh processes and returns
+    the fastest run.
+    """
+    runs = []
+    for _ in range(max(repeat, 1)):
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", program,
+             file_path],
+            capture_output=True, text=True, check=True)
+        run = json.loads(completed.stdout.splitlines()[-1])
+        run["total"] = sum(run["stages"].values())
+        runs.append(run)
+
+    best = min(runs, key=lambda run: run["total"])
+
+    size_mb = os.path.getsize(file_path) / 1e6
+    best["program"] = program
+    best["lines"] = n_lines
+    best["size_mb"] = size_mb
+    best["lines_per_second"] = n_lines / best["total"]
+    best["mb_per_second"] = size_mb / best["total"]
+    return best
+
+
+def git_commit():
+    """Returns the current git commit, or None outside a repository."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BENCH_DIR,
+            capture_output=True, text=True, check=True)
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_sizes(text):
+    """Parses a comma separated list of sizes such as '1e3,1e6'."""
+    try:
+        sizes = [int(float(size)) for size in text.split(",") if size]
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(f"Invalid size: {err}") from err
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError("Sizes must be positive.")
+    return sizes
+
+
+def main():
+    """
+    Main execution function.
+    """
+    if len(sys.argv) == 4 and sys.argv[1] == "--worker":
+        run_worker(sys.argv[2], sys.argv[3])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sizes", type=parse_sizes,
+                        default=parse_sizes(DEFAULT_SIZES),
+                        help=f"input sizes in lines (default {DEFAULT_SIZES},"
+                             f" up to 1e8)")
+    parser.add_argument("--invalid", type=float, default=0.01,
+                        help="share of invalid lines (default 0.01)")
+    parser.add_argument("--comma", type=float, default=0.1,
+                        help="share of comma decimals (default 0.1)")
+    parser.add_argument("--programs", default=",".join(PROGRAMS),
+                        help="programs to run (default stats,convert,words)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per case; the fastest is kept")
+    parser.add_argument("--data-dir",
+                        help="keep generated inputs here and reuse them")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="JSON report (default "
+                             "benchmarks/benchmark_results.json)")
+    args = parser.parse_args()
+
+    programs = [program for program in args.programs.split(",") if program]
+    unknown = set(programs) - set(PROGRAMS)
+    if unknown:
+        parser.error(f"Unknown programs: {', '.join(sorted(unknown))}")
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "invalid_share": args.invalid,
+        "comma_share": args.comma,
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+
+        print("Program,Lines," + ",".join(f"{stage} (s)" for stage in STAGES)
+              + ",Total (s),Lines/s,MB/s,Peak RSS (MiB)")
+        for n_lines in args.sizes:
+            for program in programs:
+                file_path = generate_input(program, n_lines, args, data_dir)
+                result = run_case(program, file_path, n_lines, args.repeat)
+                report["results"].append(result)
+                print(f"{program},{n_lines},"
+                      + ",".join(f"{result['stages'][stage]:.4f}"
+                                 for stage in STAGES)
+                      + f",{result['total']:.4f},"
+                        f"{result['lines_per_second']:.0f},"
+                        f"{result['mb_per_second']:.2f},"
+                        f"{result['peak_rss_kib'] / 1024:.1f}")
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
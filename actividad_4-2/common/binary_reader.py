@@ -0,0 +1,178 @@
+"""
+binary_reader.py
+
+Readers for numbers that are already stored in binary form:
+
+- int64:   raw little-endian 64-bit integers (.i64, .int64)
+- float64: raw little-endian IEEE 754 doubles (.f64, .float64)
+- npy:     NumPy .npy files with a numeric dtype (.npy)
+
+The file is memory-mapped and each batch is a memoryview cast straight
+over the mapped bytes, so nothing is parsed or copied until the caller
+iterates or calls tolist(). Big-endian data (or little-endian data on a
+big-endian machine) is byte-swapped into a copy instead. NumPy itself is
+not needed to read .npy files.
+"""
+
+import ast
+import math
+import mmap
+import os
+import sys
+from array import array
+from dataclasses import dataclass
+
+FORMATS = ("auto", "text", "int64", "float64", "npy")
+EXTENSIONS = {
+    ".i64": "int64",
+    ".int64": "int64",
+    ".f64": "float64",
+    ".float64": "float64",
+    ".npy": "npy",
+}
+DEFAULT_BATCH_ITEMS = 1 << 19
+
+NPY_MAGIC = b'\x93NUMPY'
+# .npy dtype (kind, item size) -> memoryview / array type code
+NPY_TYPE_CODES = {
+    ("i", 1): "b", ("u", 1): "B",
+    ("i", 2): "h", ("u", 2): "H",
+    ("i", 4): "i", ("u", 4): "I",
+    ("i", 8): "q", ("u", 8): "Q",
+    ("f", 4): "f", ("f", 8): "d",
+}
+RAW_TYPE_CODES = {"int64": "q", "float64": "d"}
+
+
+def detect_format(file_path, requested="auto"):
+    """
+    Returns the input format of a file: the requested one, or for 'auto'
+    the one implied by its extension ('text' when it has no binary
+    extension).
+    """
+    if requested != "auto":
+        return requested
+    extension = os.path.splitext(file_path)[1].lower()
+    return EXTENSIONS.get(extension, "text")
+
+
+def read_npy_header(mapped):
+    """
+    Parses the header of a mapped .npy file.
+
+    Returns (type code, byte order, item count, data offset). Raises
+    ValueError for files that are not a 1-D or C-ordered numeric array.
+    """
+    if mapped[:6] != NPY_MAGIC:
+        raise ValueError("not a .npy file")
+    major = mapped[6]
+    if major == 1:
+        header_start = 10
+        header_len = int.from_bytes(mapped[8:10], 'little')
+    elif major in (2, 3):
+        header_start = 12
+        header_len = int.from_bytes(mapped[8:12], 'little')
+    else:
+        raise ValueError(f"unsupported .npy version {major}")
+
+    encoding = 'utf-8' if major == 3 else 'latin1'
+    header = ast.literal_eval(
+        mapped[header_start:header_start + header_len].decode(encoding))
+    descr, shape = header["descr"], header["shape"]
+    if not isinstance(descr, str) or len(descr) < 3:
+        raise ValueError(f"unsupported .npy dtype {descr!r}")
+    if header["fortran_order"] and len(shape) > 1:
+        raise ValueError("Fortran-ordered .npy arrays are not supported")
+
+    byte_order, kind, size = descr[0], descr[1], int(descr[2:])
+    type_code = NPY_TYPE_CODES.get((kind, size))
+    if type_code is None:
+        raise ValueError(f"unsupported .npy dtype {descr!r}")
+    if byte_order in "|=":
+        byte_order = '<' if sys.byteorder == 'little' else '>'
+    return type_code, byte_order, math.prod(shape), header_start + header_len
+
+
+@dataclass(frozen=True)
+class BinaryLayout:
+    """
+    Where the numbers of a mapped binary file are: their memoryview /
+    array type code, the byte offset of the first one, how many there
+    are and whether their byte order differs from this machine's.
+    """
+
+    type_code: str
+    offset: int
+    count: int
+    swap: bool
+
+
+def read_layout(mapped, file_path, input_format):
+    """
+    Returns the BinaryLayout of a mapped file: from its header for .npy,
+    or every whole number of the file for the raw formats (trailing
+    bytes are reported and ignored). Raises ValueError for truncated
+    .npy data.
+    """
+    if input_format == "npy":
+        type_code, byte_order, count, offset = read_npy_header(mapped)
+    else:
+        type_code, byte_order, offset = RAW_TYPE_CODES[input_format], '<', 0
+        count = None
+
+    item_size = array(type_code).itemsize
+    available = (len(mapped) - offset) // item_size
+    if count is None:
+        count = available
+        trailing = len(mapped) - offset - count * item_size
+        if trailing:
+            print(f"Warning: Ignoring {trailing} trailing bytes "
+                  f"in '{file_path}'.")
+    elif available < count:
+        raise ValueError(f"truncated .npy data ({available} of "
+                         f"{count} items)")
+
+    native = '<' if sys.byteorder == 'little' else '>'
+    return BinaryLayout(type_code, offset, count, byte_order != native)
+
+
+def iter_views(mapped, layout, batch_items):
+    """
+    Yields typed memoryviews of at most batch_items numbers of a mapped
+    file laid out as layout, cast over the mapped bytes (byte-swapped
+    copies when layout.swap is set).
+    """
+    item_size = array(layout.type_code).itemsize
+    with memoryview(mapped) as raw:
+        for first in range(0, layout.count, batch_items):
+            n_items = min(batch_items, layout.count - first)
+            start = layout.offset + first * item_size
+            with raw[start:start + n_items * item_size] as chunk:
+                if layout.swap:
+                    values = array(layout.type_code, chunk.tobytes())
+                    values.byteswap()
+                    yield memoryview(values)
+                    continue
+                with chunk.cast(layout.type_code) as values:
+                    yield values
+
+
+def iter_binary_batches(file_path, input_format,
+                        batch_items=DEFAULT_BATCH_ITEMS):
+    """
+    Memory-maps a binary file and yields typed memoryviews of at most
+    batch_items numbers. A view is only valid until the next batch is
+    requested. Trailing bytes that do not form a whole number are
+    reported and ignored. OSError and ValueError are left to the caller.
+    """
+    if input_format not in RAW_TYPE_CODES and input_format != "npy":
+        raise ValueError(f"unknown binary format {input_format!r}")
+
+    with open(file_path, 'rb') as file:
+        if not os.fstat(file.fileno()).st_size:
+            if input_format == "npy":
+                raise ValueError("not a .npy file")
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            layout = read_layout(mapped, file_path, input_format)
+            yield from iter_views(mapped, layout, batch_items)
@@ -0,0 +1,214 @@
+"""
+number_parser.py
+
+Shared fast parser for the numeric input files of actividad_4-2.
+
+The file is memory-mapped and tokenized in large byte chunks aligned to
+line boundaries. Decimal separators are normalized for a whole chunk with
+a single bytes.translate() call and the chunk is converted with one
+map(float, ...) call. Chunks that contain blank or invalid lines are
+retried in blocks, and only the failing blocks fall back to a per-line
+loop, which reports every invalid line with its number.
+"""
+
+import mmap
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from itertools import count
+
+DEFAULT_CHUNK_SIZE = 1 << 22
+BLOCK_LINES = 128
+
+
+class NumberBatch:
+    """
+    A batch of parsed numbers together with the line each one came from.
+    """
+
+    __slots__ = ("values", "line_numbers", "n_lines", "_chunk",
+                 "_first_line", "_raw_lines")
+
+    def __init__(self, values, line_numbers, chunk, first_line, n_lines):
+        self.values = values
+        self.line_numbers = line_numbers
+        self.n_lines = n_lines
+        self._chunk = chunk
+        self._first_line = first_line
+        self._raw_lines = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def source_text(self, line_num):
+        """Returns the original stripped text of a line of this batch."""
+        if self._raw_lines is None:
+            self._raw_lines = self._chunk.splitlines()
+        raw_line = self._raw_lines[line_num - self._first_line]
+        return raw_line.strip().decode('utf-8', errors='replace')
+
+
+def report_invalid(line_num, text):
+    """Default handler for lines that could not be converted."""
+    print(f"Error: Line {line_num} contains invalid data: '{text}'")
+
+
+def make_translation(separators):
+    """Returns a bytes.translate() table mapping separators to '.'."""
+    return bytes.maketrans(separators, b'.' * len(separators))
+
+
+@dataclass(frozen=True)
+class ParseOptions:
+    """
+    How iter_batches() reads a file: the bytes treated as a decimal
+    point, the function converting each line, the handler called with
+    (line number, text) for every invalid line and the chunk size.
+    """
+
+    separators: bytes = b',;'
+    convert: Callable = float
+    on_invalid: Callable = report_invalid
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    table: bytes = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # The translation table is built once, not once per chunk
+        object.__setattr__(self, "table", make_translation(self.separators))
+
+
+DEFAULT_OPTIONS = ParseOptions()
+
+
+def parse_chunk(chunk, first_line, options=DEFAULT_OPTIONS):
+    """
+    Converts every line of a chunk of bytes.
+
+    Returns a NumberBatch covering all the lines of the chunk.
+    """
+    lines = chunk.translate(options.table).splitlines()
+    try:
+        values = list(map(options.convert, lines))
+        line_numbers = range(first_line, first_line + len(lines))
+    except ValueError:
+        # Slow path: at least one line is blank or invalid
+        values, line_numbers = parse_blocks(lines, chunk.splitlines(),
+                                            first_line, options)
+    return NumberBatch(values, line_numbers, chunk, first_line, len(lines))
+
+
+def parse_blocks(lines, raw_lines, first_line, options):
+    """
+    Converts the translated lines of a chunk in blocks of BLOCK_LINES;
+    only the failing blocks go line by line (see parse_lines()).
+    Returns the values and their line numbers as two lists.
+    """
+    values = []
+    line_numbers = []
+    for block_start in range(0, len(lines), BLOCK_LINES):
+        block_end = block_start + BLOCK_LINES
+        block = lines[block_start:block_end]
+        block_line = first_line + block_start
+        try:
+            values.extend(list(map(options.convert, block)))
+            line_numbers.extend(range(block_line, block_line + len(block)))
+        except ValueError:
+            parse_lines(block, raw_lines[block_start:block_end], block_line,
+                        options, (values, line_numbers))
+    return values, line_numbers
+
+
+def parse_lines(lines, raw_lines, first_line, options, output):
+    """
+    Converts lines one by one, appending the valid values and their line
+    numbers to the two lists of output. Every non-blank invalid line is
+    passed to options.on_invalid with its original text.
+    """
+    values, line_numbers = output
+    for line_num, line, raw_line in zip(count(first_line), lines, raw_lines):
+        try:
+            number = options.convert(line)
+        except ValueError:
+            stripped_line = raw_line.strip()
+            if stripped_line:
+                options.on_invalid(line_num,
+                                   stripped_line.decode('utf-8',
+                                                        errors='replace'))
+            continue
+        values.append(number)
+        line_numbers.append(line_num)
+
+
+def iter_chunks(mapped, start, end, chunk_size):
+    """
+    Yields consecutive chunks of mapped[start:end], each one ending on a
+    line boundary (or at end).
+    """
+    position = start
+    while position < end:
+        limit = position + chunk_size
+        if limit >= end:
+            boundary = end
+        else:
+            newline = mapped.find(b'\n', limit, end)
+            boundary = end if newline == -1 else newline + 1
+        yield mapped[position:boundary]
+        position = boundary
+
+
+def iter_batches(file_path, options=DEFAULT_OPTIONS, start=0, end=None,
+                 first_line=1):
+    """
+    Memory-maps a file and yields a NumberBatch per chunk, parsed with
+    a ParseOptions.
+
+    Each separator byte is treated as a decimal point (e.g., '12,5' ->
+    12.5). start and end select a byte range that must begin and end on
+    line boundaries; first_line is the number of the line at start.
+    OSError (including FileNotFoundError) is left to the caller.
+    """
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            line_num = first_line
+            for chunk in iter_chunks(mapped, start, end,
+                                     options.chunk_size):
+                batch = parse_chunk(chunk, line_num, options)
+                line_num += batch.n_lines
+                yield batch
+
+
+def complete_lines_end(file_path):
+    """
+    Returns the byte offset just after the last newline of a file, i.e.
+    the end of its complete lines (0 if it has none).
+    """
+    with open(file_path, 'rb') as file:
+        if not os.fstat(file.fileno()).st_size:
+            return 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped.rfind(b'\n') + 1
+
+
+def split_line_ranges(file_path, n_parts):
+    """
+    Splits a file into at most n_parts (start, end) byte ranges of
+    similar size, each one starting and ending on a line boundary.
+    """
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if not size:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            bounds = [0]
+            for part in range(1, n_parts):
+                target = max(size * part // n_parts, bounds[-1] + 1)
+                newline = mapped.find(b'\n', target - 1)
+                if newline == -1 or newline + 1 >= size:
+                    break
+                bounds.append(newline + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
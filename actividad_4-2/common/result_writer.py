@@ -0,0 +1,132 @@
+"""
+result_writer.py
+
+Shared streaming output stage for the actividad_4-2 programs.
+
+Rows are collected in a small buffer and written to the results file
+(optionally gzip-compressed) and to the console in large blocks, so the
+programs never hold the whole output in memory and do not pay one
+print() call per row. The console mode decides what is echoed:
+
+- all:     every row, as the programs always did (default)
+- summary: only the header and footer rows (--summary-only)
+- quiet:   nothing but warnings and errors (--quiet)
+"""
+
+import gzip
+import sys
+
+CONSOLE_MODES = ("all", "summary", "quiet")
+BUFFER_ROWS = 8192
+FILE_BUFFER_BYTES = 1 << 20
+
+
+def add_output_arguments(parser):
+    """Adds --quiet, --summary-only and --gzip to an ArgumentParser."""
+    console = parser.add_mutually_exclusive_group()
+    console.add_argument("--quiet", action="store_true",
+                         help="do not echo results to the console")
+    console.add_argument("--summary-only", action="store_true",
+                         help="echo only the header and footer rows")
+    parser.add_argument("--gzip", action="store_true",
+                        help="write the results file gzip-compressed "
+                             "(adds .gz to its name)")
+
+
+def console_mode(args):
+    """Returns the console mode selected by add_output_arguments()."""
+    if args.quiet:
+        return "quiet"
+    if args.summary_only:
+        return "summary"
+    return "all"
+
+
+class ResultWriter:
+    """
+    Buffered writer for result rows. Use it as a context manager; the
+    file is flushed and closed on exit. announce controls the 'Results
+    written to' message (by default it is shown unless the mode is quiet).
+    """
+
+    def __init__(self, output_path, console="all", compress=False,
+                 announce=None, buffer_rows=BUFFER_ROWS):
+        if console not in CONSOLE_MODES:
+            raise ValueError(f"Unknown console mode: {console}")
+        self.output_path = output_path + ".gz" if compress else output_path
+        self.console = console
+        self.announce = console != "quiet" if announce is None else announce
+        self.buffer_rows = buffer_rows
+        self.rows_written = 0
+        self._buffer = []
+        try:
+            if compress:
+                self._file = gzip.open(self.output_path, "wt",
+                                       encoding='utf-8')
+            else:
+                # The writer is the context manager: close() (run by
+                # __exit__) closes the file, reporting any write error
+                # pylint: disable-next=consider-using-with
+                self._file = open(self.output_path, "w", encoding='utf-8',
+                                  buffering=FILE_BUFFER_BYTES)
+        except OSError as err:
+            print(f"Error writing output file: {err}")
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_row(self, line):
+        """Adds a body row; echoed only in the 'all' console mode."""
+        self._buffer.append(line)
+        if len(self._buffer) >= self.buffer_rows:
+            self.flush()
+
+    def write_rows(self, lines):
+        """Adds many body rows."""
+        for line in lines:
+            self.write_row(line)
+
+    def write_summary(self, line):
+        """Adds a header or footer row; echoed unless the mode is quiet."""
+        self.flush()
+        self._buffer.append(line)
+        self.flush(summary=True)
+
+    def flush(self, summary=False):
+        """Writes the buffered rows to the file and the console."""
+        if not self._buffer:
+            return
+        block = "\n".join(self._buffer) + "\n"
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+        if self.console == "all" or (summary and self.console == "summary"):
+            sys.stdout.write(block)
+        if self._file is not None:
+            try:
+                self._file.write(block)
+            except OSError as err:
+                print(f"Error writing output file: {err}")
+                self._close_file()
+
+    def _close_file(self):
+        """Closes the results file; returns False if that failed."""
+        file, self._file = self._file, None
+        try:
+            file.close()
+        except OSError as err:
+            print(f"Error writing output file: {err}")
+            return False
+        return True
+
+    def close(self):
+        """Flushes the remaining rows and closes the results file."""
+        self.flush()
+        if self._file is None:
+            return
+        if self._close_file() and self.announce:
+            print(f"Results written to: {self.output_path}")
@@ -0,0 +1,97 @@
+"""
+checkpoint.py
+
+Sidecar checkpoints for the --incremental mode of compute_statistics.py.
+
+A checkpoint is a pickle file stored next to StatisticsResults_*.txt.
+It records how far the input was read (byte offset and line count), a
+fingerprint of the bytes before that offset, and the accumulator state
+at that point, with the frequency table kept as sorted typed arrays so
+that large tables load, merge and save quickly. When the input has only
+grown since, a rerun resumes from the offset.
+
+The fingerprint is the CRC-32 of the first and the last
+FINGERPRINT_BLOCK_SIZE bytes before the offset, so checking it costs
+the same whatever the size of the input. A truncated input, or one that
+was rewritten or edited near its start or near the resume point, no
+longer matches and the checkpoint is ignored; an in-place edit in the
+middle of a large input is not detected. Delete the checkpoint (or run
+without --incremental) after editing already processed data.
+"""
+
+import os
+import pickle
+import zlib
+
+CHECKPOINT_VERSION = 3
+FINGERPRINT_BLOCK_SIZE = 1 << 16
+
+
+def get_checkpoint_path(output_dir, input_file_path):
+    """Returns the checkpoint path that belongs to an input file."""
+    base_name = os.path.basename(input_file_path)
+    file_name_no_ext = os.path.splitext(base_name)[0]
+    return os.path.join(output_dir,
+                        f"StatisticsResults_{file_name_no_ext}"
+                        f".checkpoint")
+
+
+def fingerprint(input_file_path, offset):
+    """
+    Returns the CRC-32 of the first and the last FINGERPRINT_BLOCK_SIZE
+    bytes of [0, offset) of the input (each byte read once).
+    """
+    with open(input_file_path, 'rb') as file:
+        head = file.read(min(FINGERPRINT_BLOCK_SIZE, offset))
+        tail_start = max(len(head), offset - FINGERPRINT_BLOCK_SIZE)
+        file.seek(tail_start)
+        tail = file.read(offset - tail_start)
+    return zlib.crc32(tail, zlib.crc32(head))
+
+
+def load_checkpoint(checkpoint_path, input_file_path):
+    """
+    Returns the saved checkpoint as a dict, or None when there is none
+    or it does not match the current input file.
+    """
+    if not os.path.exists(checkpoint_path):
+        return None
+    try:
+        with open(checkpoint_path, 'rb') as file:
+            checkpoint = pickle.load(file)
+        offset = checkpoint["offset"]
+        if (checkpoint.get("version") != CHECKPOINT_VERSION
+                or os.path.getsize(input_file_path) < offset
+                or fingerprint(input_file_path, offset)
+                != checkpoint["fingerprint"]):
+            print(f"Warning: Checkpoint '{checkpoint_path}' does not match "
+                  f"the input, recomputing from the start.")
+            return None
+        return checkpoint
+    except (OSError, EOFError, ValueError, KeyError, TypeError,
+            pickle.UnpicklingError) as err:
+        print(f"Warning: Ignoring unreadable checkpoint "
+              f"'{checkpoint_path}': {err}")
+        return None
+
+
+def save_checkpoint(checkpoint_path, input_file_path, record):
+    """
+    Writes a checkpoint for the first record["offset"] bytes of the
+    input. record holds that offset, the number of lines before it
+    ("lines") and the accumulator state ("state").
+    """
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "offset": record["offset"],
+        "lines": record["lines"],
+        "fingerprint": fingerprint(input_file_path, record["offset"]),
+        "state": record["state"],
+    }
+    temp_path = checkpoint_path + ".tmp"
+    try:
+        with open(temp_path, 'wb') as file:
+            pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, checkpoint_path)
+    except OSError as err:
+        print(f"Error writing checkpoint file: {err}")
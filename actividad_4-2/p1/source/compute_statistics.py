@@ -5,36 +5,89 @@ This module reads a file containing numbers, computes descriptive statistics
 (count, mean, median, mode, standard deviation, and variance) using basic
 algorithms, and outputs the results to the console and a file in CSV format.
 It handles inputs with commas as decimal separators.
+The file is read in a single pass; only the distinct values are kept.
 """
 
+import argparse
+import glob
 import sys
 import time
 import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from itertools import islice, repeat
+from math import fsum
+from operator import mul
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'common'))
+
+# pylint: disable=wrong-import-position
+from number_parser import (  # noqa: E402
+    ParseOptions, complete_lines_end, iter_batches, report_invalid,
+    split_line_ranges)
+from result_writer import (  # noqa: E402
+    ResultWriter, add_output_arguments, console_mode)
+from binary_reader import (  # noqa: E402
+    FORMATS, detect_format, iter_binary_batches)
+from checkpoint import (  # noqa: E402
+    get_checkpoint_path, load_checkpoint, save_checkpoint)
+from frequency_table import FrequencyTable  # noqa: E402
+from heavy_hitters import DEFAULT_CAPACITY, ModeEstimator  # noqa: E402
+from quantile_sketch import DEFAULT_K, KLLSketch  # noqa: E402
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; the pure-Python path is used
+    numpy = None
+
+BACKENDS = ("stream", "python", "numpy")
+HEADER = "Count,Mean,Median,Mode,Standard Deviation,Variance,Time"
+
+
+@dataclass(frozen=True)
+class SummaryOptions:
+    """
+    What compute_summary() computes for a file: the backend, the worker
+    processes over its byte ranges, approx as (sketch k, mode capacity)
+    for the --approx estimators (None for exact results), the extra
+    percentiles, the number of most frequent values, whether to resume
+    from a checkpoint and the input format (see binary_reader.FORMATS).
+    """
+
+    backend: str = "stream"
+    jobs: int = 1
+    approx: Any = None
+    percentiles: tuple = ()
+    top_values: int = 0
+    incremental: bool = False
+    input_format: str = "auto"
 
 
-def read_file(file_path):
+@dataclass(frozen=True)
+class BatchOptions:
     """
-    Reads a file and returns a list of valid numbers.
+    How run_batch() runs and reports a batch of files: the worker
+    processes, the combined CSV path (None for StatisticsResults_Batch.txt
+    next to the results), the console mode of result_writer and gzip.
+    """
+
+    jobs: int = 1
+    combined_path: Any = None
+    console: str = "all"
+    compress: bool = False
+
+
+def iter_number_batches(file_path, **kwargs):
+    """
+    Reads a file in large chunks and yields batches of valid numbers.
     Invalid lines are logged to the console.
     Handles numbers with commas as decimal separators (e.g., '12,5' -> 12.5).
     """
-    data = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                stripped_line = line.strip()
-                if not stripped_line:
-                    continue
-                try:
-                    # Handle special case: replace comma with dot for decimals
-                    sanitized_line = stripped_line.replace(',', '.').replace(';', '.')
-
-                    # Attempt to convert line to float
-                    number = float(sanitized_line)
-                    data.append(number)
-                except ValueError:
-                    print(f"Error: Line {line_num} contains invalid data: "
-                          f"'{stripped_line}'")
+        yield from iter_batches(file_path, **kwargs)
     except FileNotFoundError:
         print(f"Error: The file '{file_path}' was not found.")
         sys.exit(1)
@@ -42,6 +95,44 @@ def read_file(file_path):
         print(f"Error reading file: {err}")
         sys.exit(1)
 
+
+def iter_number_values(file_path, input_format="text"):
+    """
+    Yields batches of valid numbers from a text file (see
+    iter_number_batches) or from a binary int64, float64 or .npy file
+    (see binary_reader.py). Binary batches are only valid until the
+    next one is requested.
+    """
+    if input_format == "text":
+        for batch in iter_number_batches(file_path):
+            yield batch.values
+        return
+
+    try:
+        for values in iter_binary_batches(file_path, input_format):
+            # The statistics are computed on floats, as for text input
+            yield values if values.format == 'd' else list(
+                map(float, values))
+    except FileNotFoundError:
+        print(f"Error: The file '{file_path}' was not found.")
+        sys.exit(1)
+    except OSError as err:
+        print(f"Error reading file: {err}")
+        sys.exit(1)
+    except ValueError as err:
+        print(f"Error: The file '{file_path}' is not valid {input_format} "
+              f"data: {err}")
+        sys.exit(1)
+
+
+def read_file(file_path, input_format="text"):
+    """
+    Reads a file and returns a list of valid numbers.
+    Invalid lines are logged to the console.
+    """
+    data = []
+    for values in iter_number_values(file_path, input_format):
+        data.extend(values)
     return data
 
 
@@ -52,18 +143,80 @@ def calculate_mean(data):
     return sum(data) / len(data)
 
 
-def calculate_median(data):
+def select_kth(buffer, k):
+    """
+    Returns the k-th smallest element (0-based) of a mutable sequence
+    such as array('d'), using quickselect in expected O(n) time.
+
+    The buffer is partitioned in place (Hoare's FIND): each round swaps
+    the elements of the range that contains k around a pivot and keeps
+    only the side that contains k, so no copies are made. On return
+    buffer[k] is the result and no element before it is larger. The
+    pivot is the median of five sampled elements; if the loop gets too
+    deep the remaining range is sorted instead (introselect), bounding
+    the worst case to O(n log n).
+    """
+    low, high = 0, len(buffer) - 1
+    depth_limit = 2 * len(buffer).bit_length()
+    while high - low >= 32 and depth_limit:
+        depth_limit -= 1
+        span = high - low
+        pivot = sorted((buffer[low], buffer[low + span // 4],
+                        buffer[low + span // 2], buffer[low + 3 * span // 4],
+                        buffer[high]))[2]
+
+        i, j = low, high
+        while i <= j:
+            while buffer[i] < pivot:
+                i += 1
+            while buffer[j] > pivot:
+                j -= 1
+            if i <= j:
+                buffer[i], buffer[j] = buffer[j], buffer[i]
+                i += 1
+                j -= 1
+
+        # buffer[low:j + 1] <= pivot <= buffer[i:high + 1], and the
+        # elements in between equal the pivot
+        if k <= j:
+            high = j
+        elif k >= i:
+            low = i
+        else:
+            return buffer[k]
+
+    for index, value in enumerate(sorted(buffer[low:high + 1]), low):
+        buffer[index] = value
+    return buffer[k]
+
+
+def calculate_median(data, method="sort"):
     """
     Calculates the median of the data.
-    Requires the data to be sorted first.
+    The 'sort' method sorts a copy of the data first; the 'select'
+    method partitions an array('d') copy with select_kth instead.
+    Any sequence works as input, including an array('d') buffer.
     """
     if not data:
         return 0.0
 
-    sorted_data = sorted(data)
-    n_items = len(sorted_data)
+    n_items = len(data)
     mid_index = n_items // 2
 
+    if method == "select":
+        buffer = array('d', data)
+        upper = select_kth(buffer, mid_index)
+        if n_items % 2 != 0:
+            return upper
+        # select_kth left the smaller half in front of mid_index
+        lower = max(islice(buffer, mid_index))
+        return (lower + upper) / 2.0
+
+    if method != "sort":
+        raise ValueError(f"Unknown median method: '{method}'")
+
+    sorted_data = sorted(data)
+
     if n_items % 2 != 0:
         return sorted_data[mid_index]
 
@@ -116,20 +269,388 @@ def calculate_stdev(variance):
     return variance ** 0.5
 
 
-def write_results(results, input_file_path):
+class RunningStatistics:
+    """
+    Single-pass accumulator for the descriptive statistics.
+
+    Count, mean and the sum of squared differences (M2) are updated with
+    Welford's method. Median and mode are derived from a FrequencyTable
+    of the distinct values, so memory grows with the number of distinct
+    values instead of the number of lines; the table also gives the
+    exact mean and variance (see exact_mean_variance()).
+
+    In the --approx mode a quantile sketch and a bounded ModeEstimator
+    replace the frequency table, so memory no longer depends on the data.
+    """
+
+    def __init__(self, sketch=None, mode_estimator=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = sketch
+        self.mode_estimator = mode_estimator
+        self.frequency = FrequencyTable() if mode_estimator is None else None
+
+    def update(self, number):
+        """Adds a single number to the accumulator."""
+        self.update_many((number,))
+
+    def update_many(self, numbers):
+        """
+        Adds a batch of numbers to the accumulator.
+        The batch mean and M2 are computed first and then combined with
+        the running values (Chan et al. form of Welford's update).
+        """
+        values = numbers if isinstance(numbers, list) else list(numbers)
+        n_batch = len(values)
+        if not n_batch:
+            return
+
+        batch_mean = fsum(values) / n_batch
+        deviations = list(map((-batch_mean).__add__, values))
+        batch_m2 = fsum(map(mul, deviations, deviations))
+        if self.frequency is not None:
+            self.frequency.update_many(values)
+        else:
+            self.mode_estimator.update_many(values)
+        if self.sketch is not None:
+            self.sketch.update_many(values)
+
+        total = self.count + n_batch
+        delta = batch_mean - self.mean
+        self.mean += delta * n_batch / total
+        self.m2 += batch_m2 + delta * delta * self.count * n_batch / total
+        self.count = total
+
+    def merge(self, other):
+        """
+        Adds the partial results of another accumulator, e.g. one built
+        by a worker process over a later part of the same file.
+        """
+        if not other.count:
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += (other.m2
+                    + delta * delta * self.count * other.count / total)
+        self.count = total
+        if self.frequency is not None:
+            self.frequency.merge(other.frequency)
+        else:
+            self.mode_estimator.merge(other.mode_estimator)
+        if self.sketch is not None:
+            self.sketch.merge(other.sketch)
+
+    def to_state(self):
+        """
+        Returns the exact accumulator as plain data. The frequency table
+        is stored as sorted typed arrays (see FrequencyTable.to_state()).
+        """
+        return {"count": self.count, "mean": self.mean, "m2": self.m2,
+                "table": self.frequency.to_state()}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuilds an accumulator saved with to_state()."""
+        stats = cls()
+        stats.count = state["count"]
+        stats.mean = state["mean"]
+        stats.m2 = state["m2"]
+        stats.frequency = FrequencyTable.from_state(state["table"])
+        return stats
+
+    def median(self):
+        """Returns the median from the frequency table."""
+        return self.frequency.median()
+
+    def mode(self):
+        """
+        Returns the most frequent number.
+        Ties are resolved in favour of the first value read.
+        """
+        if self.frequency is None:
+            return self.mode_estimator.mode()
+        return self.frequency.mode()
+
+    def top_values(self, k):
+        """
+        Returns up to k (value, count, max error) tuples, most frequent
+        first; the error is 0 when the counts are exact.
+        """
+        if self.frequency is None:
+            return self.mode_estimator.top(k)
+        return self.frequency.top(k)
+
+    def variance(self):
+        """Returns the sample variance (N-1) from the accumulated M2."""
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def exact_mean_variance(self):
+        """
+        Recomputes mean and variance from the frequency table, giving
+        the same results as calculate_mean and calculate_variance on the
+        full list whatever the batches, workers or checkpoints.
+        """
+        return self.frequency.mean_variance()
+
+
+def new_statistics(approx=None):
+    """
+    Returns an empty RunningStatistics. approx, when given, is a
+    (sketch_k, mode_capacity) pair for the bounded-memory structures.
+    """
+    if not approx:
+        return RunningStatistics()
+    sketch_k, mode_capacity = approx
+    return RunningStatistics(KLLSketch(sketch_k),
+                             ModeEstimator(mode_capacity))
+
+
+def stream_file(file_path, approx=None, input_format="text"):
+    """
+    Reads a file once and returns a RunningStatistics with its numbers.
+    """
+    stats = new_statistics(approx)
+    for values in iter_number_values(file_path, input_format):
+        stats.update_many(values)
+    return stats
+
+
+def stream_range(file_path, start, end, approx=None):
+    """
+    Worker task: accumulates the numbers of one byte range of a file.
+
+    Returns the partial RunningStatistics, the number of lines in the
+    range and its invalid lines as (line number within range, text).
+    """
+    stats = new_statistics(approx)
+    invalid_lines = []
+    n_lines = 0
+
+    def collect_invalid(line_num, text):
+        invalid_lines.append((line_num, text))
+
+    options = ParseOptions(on_invalid=collect_invalid)
+    for batch in iter_batches(file_path, options, start=start, end=end):
+        stats.update_many(batch.values)
+        n_lines += batch.n_lines
+    return stats, n_lines, invalid_lines
+
+
+def parallel_stream_file(file_path, jobs, approx=None):
+    """
+    Splits a file into line-aligned byte ranges, accumulates them in a
+    pool of worker processes and merges the partial results in order.
+    Invalid lines are logged with their line number in the whole file.
+    """
+    try:
+        ranges = split_line_ranges(file_path, jobs)
+    except FileNotFoundError:
+        print(f"Error: The file '{file_path}' was not found.")
+        sys.exit(1)
+    except OSError as err:
+        print(f"Error reading file: {err}")
+        sys.exit(1)
+
+    stats = new_statistics(approx)
+    line_offset = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        partials = executor.map(stream_range, repeat(file_path),
+                                [start for start, _ in ranges],
+                                [end for _, end in ranges],
+                                repeat(approx))
+        for partial, n_lines, invalid_lines in partials:
+            for line_num, text in invalid_lines:
+                report_invalid(line_offset + line_num, text)
+            stats.merge(partial)
+            line_offset += n_lines
+    return stats
+
+
+def incremental_stream_file(file_path):
+    """
+    Reads only what was appended to a file since its last checkpoint.
+
+    The accumulator is restored from the checkpoint next to the results
+    file, updated with the new complete lines and checkpointed again. A
+    trailing line without newline is counted but not checkpointed, since
+    it may still be growing.
+    """
+    checkpoint_path = get_checkpoint_path(get_output_dir(file_path),
+                                          file_path)
+    try:
+        checkpoint = load_checkpoint(checkpoint_path, file_path)
+        end = complete_lines_end(file_path)
+    except FileNotFoundError:
+        print(f"Error: The file '{file_path}' was not found.")
+        sys.exit(1)
+    except OSError as err:
+        print(f"Error reading file: {err}")
+        sys.exit(1)
+
+    if checkpoint is None:
+        stats, offset, n_lines = RunningStatistics(), 0, 0
+    else:
+        stats = RunningStatistics.from_state(checkpoint["state"])
+        offset, n_lines = checkpoint["offset"], checkpoint["lines"]
+
+    for batch in iter_number_batches(file_path, start=offset, end=end,
+                                     first_line=n_lines + 1):
+        stats.update_many(batch.values)
+        n_lines += batch.n_lines
+    if end != offset or checkpoint is None:
+        save_checkpoint(checkpoint_path, file_path,
+                        {"offset": end, "lines": n_lines,
+                         "state": stats.to_state()})
+
+    for batch in iter_number_batches(file_path, start=end,
+                                     first_line=n_lines + 1):
+        stats.update_many(batch.values)
+    return stats
+
+
+def summarize_stream(file_path, options=SummaryOptions(input_format="text")):
+    """
+    Computes (count, mean, median, mode, variance, percentiles, top) in
+    a single pass, split across options.jobs worker processes when it
+    is above 1. top holds the options.top_values most frequent numbers
+    with their counts.
+
+    Mean and variance are recomputed exactly from the frequency table,
+    or come from the running Welford values with options.approx, where
+    the median and the requested percentiles come from a KLL sketch and
+    the mode from a ModeEstimator. With options.incremental only the
+    data appended since the last checkpoint is read. jobs and
+    incremental only apply to text input.
+    """
+    approx = options.approx
+    if options.input_format != "text":
+        stats = stream_file(file_path, approx, options.input_format)
+    elif options.incremental:
+        stats = incremental_stream_file(file_path)
+    elif options.jobs > 1:
+        stats = parallel_stream_file(file_path, options.jobs, approx)
+    else:
+        stats = stream_file(file_path, approx)
+
+    if stats.sketch is None:
+        mean, variance = stats.exact_mean_variance()
+        return (stats.count, mean, stats.median(), stats.mode(), variance,
+                (), stats.top_values(options.top_values))
+
+    quantiles = stats.sketch.quantiles(
+        [0.5] + [percentile / 100 for percentile in options.percentiles])
+    return (stats.count, stats.mean, quantiles[0], stats.mode(),
+            stats.variance(), tuple(quantiles[1:]),
+            stats.top_values(options.top_values))
+
+
+def summarize_python(data):
+    """
+    Computes (count, mean, median, mode, variance, (), ()) with the
+    list-based calculate_* functions.
+    """
+    mean_val = calculate_mean(data)
+    return (len(data), mean_val, calculate_median(data),
+            calculate_mode(data), calculate_variance(data, mean_val), (),
+            ())
+
+
+def summarize_numpy(data):
     """
-    Writes the results to a file in the ../tests directory relative
-    to the source file.
+    Computes (count, mean, median, mode, variance, (), ()) with vectorized
+    NumPy operations over a contiguous array('d') buffer.
+    The buffer is partitioned in place to find the median.
+    """
+    values = numpy.frombuffer(data, dtype=numpy.float64)
+    n_items = values.size
+
+    mean_val = float(values.mean())
+    variance_val = float(values.var(ddof=1)) if n_items > 1 else 0.0
+
+    # Mode: among the most frequent values pick the one read first
+    uniques, first_index, counts = numpy.unique(
+        values, return_index=True, return_counts=True)
+    candidates = counts == counts.max()
+    winner = numpy.argmin(first_index[candidates])
+    mode_val = float(uniques[candidates][winner])
+
+    mid_index = n_items // 2
+    if n_items % 2 != 0:
+        values.partition(mid_index)
+        median_val = float(values[mid_index])
+    else:
+        values.partition((mid_index - 1, mid_index))
+        median_val = float((values[mid_index - 1] + values[mid_index]) / 2.0)
+
+    return n_items, mean_val, median_val, mode_val, variance_val, (), ()
+
+
+def compute_summary(file_path, options=SummaryOptions()):
+    """
+    Computes (count, mean, median, mode, variance, percentiles, top) for
+    a file as set by a SummaryOptions. The 'numpy' backend falls back to
+    the pure-Python functions when NumPy is not installed. jobs, approx,
+    top_values and incremental only apply to the 'stream' backend. The
+    'auto' input format goes by the file extension.
+    """
+    options = replace(options, input_format=detect_format(
+        file_path, options.input_format))
+    if options.backend == "stream":
+        return summarize_stream(file_path, options)
+
+    data = array('d')
+    for values in iter_number_values(file_path, options.input_format):
+        data.extend(values)
+    if not data:
+        return 0, 0.0, 0.0, 0.0, 0.0, (), ()
+
+    if options.backend == "numpy":
+        if numpy is not None:
+            return summarize_numpy(data)
+        print("Warning: NumPy is not installed, "
+              "falling back to the python backend.")
+
+    return summarize_python(data)
+
+
+def build_header(percentiles=()):
+    """Returns the CSV header, with a column per extra percentile."""
+    if not percentiles:
+        return HEADER
+    labels = "".join(f"P{percentile:g}," for percentile in percentiles)
+    return HEADER.replace("Time", labels + "Time")
+
+
+def format_row(summary, elapsed_time):
+    """
+    Formats (count, mean, median, mode, variance, percentiles) and a time
+    as a CSV row.
+    """
+    (count_val, mean_val, median_val, mode_val, variance_val,
+     percentile_vals) = summary[:6]
+    stdev_val = calculate_stdev(variance_val)
+    if mode_val is None:
+        # The --approx mode estimator found no value above the others
+        mode_val = "n/a"
+    extra = "".join(f"{value}," for value in percentile_vals)
+    return (f"{count_val},{mean_val},{median_val},{mode_val},"
+            f"{stdev_val},{variance_val},{extra}{elapsed_time:.6f}")
+
+
+def get_output_dir(input_file_path):
+    """
+    Returns (and creates) the ../tests directory relative to the
+    directory of the input file.
     """
     # 1. Get the absolute directory of the input file (e.g., .../p1/source)
     input_dir = os.path.dirname(os.path.abspath(input_file_path))
 
-    # 2. Determine the filename (e.g., TC1.txt -> TC1)
-    base_name = os.path.basename(input_file_path)
-    file_name_no_ext = os.path.splitext(base_name)[0]
-    output_filename = f"StatisticsResults_{file_name_no_ext}.txt"
-
-    # 3. Construct the output directory path
+    # 2. Construct the output directory path
     # Replace 'source' with 'tests' in the path
     if 'source' in input_dir:
         output_dir = input_dir.replace('source', 'tests')
@@ -137,63 +658,225 @@ def write_results(results, input_file_path):
         # Fallback: Create a 'tests' folder in the current directory
         output_dir = os.path.join(input_dir, 'tests')
 
-    # 4. Create the directory if it doesn't exist
+    # 3. Create the directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
+    return output_dir
 
-    # 5. Full output path
-    output_path = os.path.join(output_dir, output_filename)
 
+def get_output_path(input_file_path):
+    """
+    Returns the StatisticsResults_*.txt path that belongs to an input file.
+    """
+    # Determine the filename (e.g., TC1.txt -> TC1)
+    base_name = os.path.basename(input_file_path)
+    file_name_no_ext = os.path.splitext(base_name)[0]
+    output_filename = f"StatisticsResults_{file_name_no_ext}.txt"
+    return os.path.join(get_output_dir(input_file_path), output_filename)
+
+
+def parse_percentiles(text):
+    """
+    Parses a comma separated list of percentiles (e.g., '90,99,99.9').
+    """
     try:
-        with open(output_path, "w", encoding='utf-8') as out_file:
-            for line in results:
-                out_file.write(line + "\n")
-        print(f"Results written to: {output_path}")
-    except OSError as err:
-        print(f"Error writing output file: {err}")
+        percentiles = tuple(float(item) for item in text.split(',') if item)
+    except ValueError as err:
+        message = f"invalid percentiles: '{text}'"
+        raise argparse.ArgumentTypeError(message) from err
+    if not all(0 < percentile < 100 for percentile in percentiles):
+        raise argparse.ArgumentTypeError(
+            "percentiles must be between 0 and 100")
+    return percentiles
 
 
-def main():
+def expand_paths(patterns):
     """
-    Main execution function.
+    Expands glob patterns (e.g., 'TC*.txt') into file paths.
+    Patterns without matches are kept so that they report as missing.
+    """
+    file_paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        file_paths.extend(matches if matches else [pattern])
+    return file_paths
+
+
+def timed_summary(file_path, options):
+    """
+    Worker task for batch mode: returns the summary of one file (None if
+    it could not be read) and the seconds spent on it.
     """
     start_time = time.time()
+    try:
+        summary = compute_summary(file_path, options)
+    except SystemExit:
+        summary = None
+    return summary, time.time() - start_time
 
-    if len(sys.argv) != 2:
-        print("Usage: python compute_statistics.py fileWithData.txt")
-        sys.exit(1)
 
-    input_file = sys.argv[1]
-    data = read_file(input_file)
+def submit_batch(file_paths, options, executor):
+    """
+    Submits a timed_summary() job per file to a process pool. Returns an
+    iterator of (file_path, (summary, seconds)) in the order of
+    file_paths, each one available as soon as its file is done.
+    """
+    # Each worker summarizes a whole file in a single process
+    file_options = replace(options, jobs=1, top_values=0)
+    outcomes = executor.map(timed_summary, file_paths, repeat(file_options))
+    return zip(file_paths, outcomes)
 
-    if not data:
+
+def write_batch_report(outcomes, header, combined, batch):
+    """
+    Writes the StatisticsResults_*.txt of every file of submit_batch()
+    as it completes, and its row, with its own time, to the combined
+    ResultWriter. Returns the number of files that produced results.
+    """
+    combined.write_summary("File," + header)
+    n_done = 0
+    for file_path, (summary, elapsed_time) in outcomes:
+        if summary is None or not summary[0]:
+            print(f"No valid data found in '{file_path}'.")
+            continue
+        row = format_row(summary, elapsed_time)
+        # The combined report echoes the row; this file stays silent
+        with ResultWriter(get_output_path(file_path), "quiet",
+                          batch.compress,
+                          announce=batch.console != "quiet") as writer:
+            writer.write_rows([header, row])
+        combined.write_row(f"{file_path},{row}")
+        n_done += 1
+    return n_done
+
+
+def run_batch(file_paths, options, batch=BatchOptions()):
+    """
+    Computes the statistics of many files, as set by a SummaryOptions,
+    in a pool of batch.jobs worker processes.
+
+    Every file gets its own StatisticsResults_*.txt and a row, with its
+    own time, in a combined CSV (StatisticsResults_Batch.txt by default)
+    that is streamed as the files complete.
+    Returns the number of files that produced results.
+    """
+    start_time = time.time()
+    combined_path = batch.combined_path or os.path.join(
+        get_output_dir(file_paths[0]), "StatisticsResults_Batch.txt")
+
+    with ResultWriter(combined_path, batch.console,
+                      batch.compress) as combined, \
+            ProcessPoolExecutor(max_workers=batch.jobs) as executor:
+        n_done = write_batch_report(
+            submit_batch(file_paths, options, executor),
+            build_header(options.percentiles), combined, batch)
+        combined.write_summary(f"Wall Time,{time.time() - start_time:.6f}")
+    return n_done
+
+
+def main():
+    """
+    Main execution function.
+    """
+    start_time = time.time()
+
+    parser = argparse.ArgumentParser(
+        usage="python compute_statistics.py fileWithData.txt [more.txt ...] "
+              "[--backend {stream,python,numpy}] [--jobs N] "
+              "[--combined PATH] [--approx] [--sketch-k K] "
+              "[--percentiles 90,99] [--mode-capacity C] [--top-values K] "
+              "[--incremental] [--format FORMAT] "
+              "[--quiet | --summary-only] [--gzip]")
+    parser.add_argument("input_files", nargs="+",
+                        help="input files or glob patterns (e.g. 'TC*.txt')")
+    parser.add_argument("--backend", choices=BACKENDS, default="stream",
+                        help="statistics engine (default: stream)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes: byte ranges of a single "
+                             "file (default: 1) or files of a batch "
+                             "(default: CPU count)")
+    parser.add_argument("--combined", default=None,
+                        help="combined CSV path for a batch of files")
+    parser.add_argument("--approx", action="store_true",
+                        help="approximate the median and percentiles with "
+                             "a KLL sketch (bounded memory)")
+    parser.add_argument("--sketch-k", type=int, default=DEFAULT_K,
+                        help=f"KLL sketch parameter; the rank error is "
+                             f"about 1.65%% for k=200 (default: {DEFAULT_K})")
+    parser.add_argument("--percentiles", type=parse_percentiles,
+                        default=(90.0, 99.0),
+                        help="extra percentiles reported with --approx "
+                             "(default: 90,99)")
+    parser.add_argument("--mode-capacity", type=int,
+                        default=DEFAULT_CAPACITY,
+                        help="counters of the --approx mode estimator; "
+                             "counts are off by at most N/(C+1) "
+                             f"(default: {DEFAULT_CAPACITY})")
+    parser.add_argument("--top-values", type=int, default=0,
+                        help="also report the K most frequent values with "
+                             "their counts and maximum error")
+    parser.add_argument("--incremental", action="store_true",
+                        help="resume from the checkpoint next to the "
+                             "results file and read only appended data")
+    parser.add_argument("--format", choices=FORMATS, default="auto",
+                        help="input format: text, or raw little-endian "
+                             "int64/float64 or .npy read without parsing "
+                             "(default: auto, by extension: .i64, .f64, "
+                             ".npy, anything else is text)")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    if args.backend != "stream" and (args.approx or args.top_values):
+        parser.error("--approx and --top-values require the stream backend")
+    if args.sketch_k < 8:
+        parser.error("--sketch-k must be at least 8")
+    if args.mode_capacity < 1:
+        parser.error("--mode-capacity must be at least 1")
+    if args.incremental and (args.backend != "stream" or args.approx):
+        parser.error("--incremental requires the exact stream backend")
+    options = SummaryOptions(
+        backend=args.backend, jobs=max(args.jobs or 1, 1),
+        approx=(args.sketch_k, args.mode_capacity) if args.approx else None,
+        percentiles=args.percentiles if args.approx else (),
+        top_values=args.top_values, incremental=args.incremental,
+        input_format=args.format)
+
+    input_files = expand_paths(args.input_files)
+    binary_input = any(detect_format(file_path, args.format) != "text"
+                       for file_path in input_files)
+    if binary_input and (args.incremental or (
+            len(input_files) == 1 and (args.jobs or 1) > 1)):
+        parser.error("--incremental and --jobs on a single file require "
+                     "text input")
+    if len(input_files) > 1:
+        if args.top_values:
+            parser.error("--top-values supports a single input file")
+        batch = BatchOptions(
+            jobs=max(args.jobs or os.cpu_count() or 1, 1),
+            combined_path=args.combined, console=console_mode(args),
+            compress=args.gzip)
+        if not run_batch(input_files, options, batch):
+            sys.exit(1)
+        return
+
+    input_file = input_files[0]
+    summary = compute_summary(input_file, options)
+
+    if not summary[0]:
         print("No valid data found in the file.")
         sys.exit(1)
 
-    # Compute Statistics
-    count_val = len(data)
-    mean_val = calculate_mean(data)
-    median_val = calculate_median(data)
-    mode_val = calculate_mode(data)
-    variance_val = calculate_variance(data, mean_val)
-    stdev_val = calculate_stdev(variance_val)
-
     end_time = time.time()
     elapsed_time = end_time - start_time
 
-    # Format Results (CSV Style)
-    results = []
-    # Header Row
-    results.append("Count,Mean,Median,Mode,Standard Deviation,Variance,Time")
-    # Data Row
-    results.append(f"{count_val},{mean_val},{median_val},{mode_val},"
-                   f"{stdev_val},{variance_val},{elapsed_time:.6f}")
-
-    # Print to Screen
-    for line in results:
-        print(line)
-
-    # Write to File using dynamic path logic
-    write_results(results, input_file)
+    # Stream Results (CSV Style) to the screen and the file
+    with ResultWriter(get_output_path(input_file), console_mode(args),
+                      args.gzip) as writer:
+        writer.write_summary(build_header(options.percentiles))
+        writer.write_summary(format_row(summary, elapsed_time))
+        if args.top_values:
+            writer.write_summary("Value,Count,Max Error")
+            writer.write_rows(f"{value},{count},{error}"
+                              for value, count, error in summary[6])
 
 
 if __name__ == "__main__":
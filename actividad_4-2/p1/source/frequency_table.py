@@ -0,0 +1,265 @@
+"""
+frequency_table.py
+
+Exact frequency table of the distinct values, used by compute_statistics.py
+outside the --approx mode for the median, the mode, the most frequent
+values and the exact mean and variance.
+
+Numbers are counted in a Counter. When the results are needed the table
+is sorted once into typed arrays (values, counts, first-read ranks) and
+kept; a table restored from a checkpoint keeps those arrays as its base
+and only counts the numbers read since, which are sorted on their own
+and inserted into the base by slices.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from heapq import nlargest
+from itertools import accumulate, chain, compress, repeat
+from math import fsum, isfinite
+from operator import mul, neg, not_, sub
+
+# Veltkamp splitting for weighted_fsum(): 2**27 + 1 splits a double into
+# two 26-bit halves; the limits keep half * count exact and finite
+SPLIT_FACTOR = 134217729.0
+SPLIT_COUNT_LIMIT = 1 << 26
+SPLIT_VALUE_LIMIT = 2.0 ** 995
+
+
+class FrequencyTable:
+    """
+    Counts of every distinct value read, in memory that grows with the
+    number of distinct values instead of the number of lines.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.counter = Counter()
+        # Sorted (values, counts, first-read ranks) of a restored table
+        self.base = None
+        self._sorted = None
+
+    def update_many(self, values):
+        """Adds a batch of numbers to the table."""
+        self.counter.update(values)
+        self.count += len(values)
+        self._sorted = None
+
+    def merge(self, other):
+        """
+        Adds the counts of another table, e.g. one built by a worker
+        process over a later part of the same file. other must not have
+        been restored from a checkpoint.
+        """
+        self.counter.update(other.counter)
+        self.count += other.count
+        self._sorted = None
+
+    def sorted_table(self, with_ranks=False):
+        """
+        Returns the table as (values, counts, ranks) in ascending order
+        of value. ranks, the order in which each value was first read,
+        is None unless with_ranks is set or the table was restored. The
+        arrays are built once per update.
+        """
+        table = self._sorted
+        if table is not None and (table[2] is not None or not with_ranks):
+            return table
+        if self.base is not None:
+            self._sorted = self._merge_base()
+            return self._sorted
+
+        counter = self.counter
+        if with_ranks:
+            # Sorting the positions gives the first-read ranks for free
+            keys = list(counter)
+            ranks = sorted(range(len(keys)), key=keys.__getitem__)
+            values = array('d', map(keys.__getitem__, ranks))
+            counts = array('q', map(list(counter.values()).__getitem__,
+                                    ranks))
+            self._sorted = (values, counts, array('q', ranks))
+            return self._sorted
+
+        values = sorted(counter)
+        counts = array('q', [1]) * len(values)
+        if len(values) != self.count:
+            # Only the values read more than once need a lookup
+            for value, count in compress(counter.items(),
+                                         map((1).__lt__, counter.values())):
+                counts[bisect_left(values, value)] = count
+        self._sorted = (values, counts, None)
+        return self._sorted
+
+    def _merge_base(self):
+        """Inserts the numbers read since a checkpoint into its table."""
+        counter = self.counter
+        base_values, base_counts, base_ranks = self.base
+        # Values not in the base are ranked after it, in reading order
+        new_ranks = {}
+        for value in counter:
+            index = bisect_left(base_values, value)
+            if index == len(base_values) or base_values[index] != value:
+                new_ranks[value] = len(base_values) + len(new_ranks)
+
+        values, counts, ranks = array('d'), array('q'), array('q')
+        position = 0
+        for value in sorted(counter):
+            index = bisect_left(base_values, value, position)
+            values.extend(base_values[position:index])
+            counts.extend(base_counts[position:index])
+            ranks.extend(base_ranks[position:index])
+            if value in new_ranks:
+                counts.append(counter[value])
+                ranks.append(new_ranks[value])
+            else:
+                counts.append(base_counts[index] + counter[value])
+                ranks.append(base_ranks[index])
+                index += 1
+            values.append(value)
+            position = index
+        values.extend(base_values[position:])
+        counts.extend(base_counts[position:])
+        ranks.extend(base_ranks[position:])
+        return values, counts, ranks
+
+    def to_state(self):
+        """
+        Returns the table as plain data: the count and the sorted typed
+        arrays of sorted_table(). The table keeps them as its base, so
+        later numbers are merged into it rather than re-sorted.
+        """
+        values, counts, ranks = self.sorted_table(with_ranks=True)
+        self.base = (values, counts, ranks)
+        self.counter = Counter()
+        return {"count": self.count, "values": values, "counts": counts,
+                "ranks": ranks}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuilds a table saved with to_state()."""
+        table = cls()
+        table.count = state["count"]
+        table.base = (state["values"], state["counts"], state["ranks"])
+        return table
+
+    def median(self):
+        """Returns the median from the running counts of sorted values."""
+        if not self.count:
+            return 0.0
+
+        values, counts, _ = self.sorted_table()
+        mid_index = self.count // 2
+        if len(values) == self.count:
+            # Every value was read once
+            upper_index, lower_index = mid_index, mid_index - 1
+        else:
+            # seen[i] numbers are <= values[i]
+            seen = list(accumulate(counts))
+            upper_index = bisect_right(seen, mid_index)
+            lower_index = bisect_left(seen, mid_index)
+        if self.count % 2 != 0:
+            return values[upper_index]
+        return (values[lower_index] + values[upper_index]) / 2.0
+
+    def mode(self):
+        """
+        Returns the most frequent number.
+        Ties are resolved in favour of the first value read.
+        """
+        if not self.count:
+            return 0.0
+        if self.base is None:
+            # The first value read with the highest count
+            counter = self.counter
+            max_count = max(counter.values())
+            return next(compress(counter,
+                                 map(max_count.__eq__, counter.values())))
+
+        values, counts, ranks = self.sorted_table()
+        max_count = max(counts)
+        first_rank = min(compress(ranks, map(max_count.__eq__, counts)))
+        return values[ranks.index(first_rank)]
+
+    def top(self, k):
+        """
+        Returns up to k (value, count, max error) tuples, most frequent
+        first. The error is always 0: the counts are exact.
+        """
+        if self.base is None:
+            return [(value, count, 0)
+                    for value, count in self.counter.most_common(k)]
+        values, counts, ranks = self.sorted_table()
+        top = nlargest(k, zip(counts, map(neg, ranks), values))
+        return [(value, count, 0) for count, _, value in top]
+
+    def mean_variance(self):
+        """
+        Computes mean and sample variance from the table, giving the same
+        results as calculate_mean and calculate_variance on the full
+        list in O(distinct values) instead of O(count), however the
+        numbers were split into batches, workers or checkpoints.
+        """
+        if not self.count:
+            return 0.0, 0.0
+
+        values, counts, _ = self.sorted_table()
+        mean = weighted_fsum(values, counts) / self.count
+        if self.count < 2:
+            return mean, 0.0
+
+        deviations = list(map((-mean).__add__, values))
+        squares = list(map(mul, deviations, deviations))
+        return mean, weighted_fsum(squares, counts) / (self.count - 1)
+
+
+def weighted_fsum(values, counts):
+    """
+    Returns fsum() of every value repeated count times without expanding
+    them, in O(len(values)).
+
+    Values with a count of 1 are passed to fsum() as they are. The
+    repeated ones are split into two halves of at most 26 significant
+    bits (Veltkamp splitting), so half * count is an exact float for
+    counts below 2**26 and fsum() of all the terms rounds the exact
+    total once, as fsum() of the expanded values does. Larger counts or
+    values fall back to exact integer arithmetic over the common
+    power-of-two denominator of the values.
+    """
+    repeated = list(map((1).__lt__, counts))
+    if not any(repeated):
+        return fsum(values)
+
+    # Only the repeated values are split; the others go to fsum() as is
+    singles = compress(values, map(not_, repeated))
+    weighted = list(map(float, compress(values, repeated)))
+    counts = list(compress(counts, repeated))
+    non_finite = [value for value in weighted if not isfinite(value)]
+    if non_finite:
+        # Infinities and NaN decide the result whatever their counts
+        return fsum(chain(singles, non_finite))
+
+    if (max(counts) < SPLIT_COUNT_LIMIT
+            and max(map(abs, weighted)) < SPLIT_VALUE_LIMIT):
+        scaled = list(map(SPLIT_FACTOR.__mul__, weighted))
+        highs = list(map(sub, scaled, map(sub, scaled, weighted)))
+        lows = map(sub, weighted, highs)
+        total = fsum(chain(singles, map(mul, highs, counts),
+                           map(mul, lows, counts)))
+    else:
+        singles = list(singles)
+        non_finite = [value for value in singles if not isfinite(value)]
+        if non_finite:
+            return fsum(non_finite)
+        ratios = [value.as_integer_ratio()
+                  for value in chain(weighted, singles)]
+        counts.extend(repeat(1, len(singles)))
+        denominator = max(den for _, den in ratios)
+        total = sum(num * count * (denominator // den)
+                    for (num, den), count in zip(ratios, counts))
+        total /= denominator
+
+    if not total and not any(values):
+        # Keep fsum()'s sign of zero (-0.0 only if every term is -0.0)
+        return fsum(values)
+    return total
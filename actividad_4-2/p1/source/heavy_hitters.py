@@ -0,0 +1,165 @@
+"""
+heavy_hitters.py
+
+Bounded-memory mode estimation used by the --approx mode of
+compute_statistics.py.
+
+MisraGries keeps at most `capacity` counters. Batches are counted with a
+Counter and merged into the summary; whenever more than `capacity`
+values survive, the (capacity + 1)-th largest count is subtracted from
+every counter and only the `capacity` largest are kept (the mergeable
+Misra-Gries summary of Agarwal et al., 2012). Each reported count
+underestimates the true count by at most `error`, and error never
+exceeds n / (capacity + 1) after n numbers.
+
+ModeEstimator counts exactly while the data is low-cardinality and
+switches to MisraGries once the table outgrows its limit.
+"""
+
+from collections import Counter
+from heapq import nlargest
+
+DEFAULT_CAPACITY = 1000
+DEFAULT_EXACT_LIMIT = 100_000
+
+
+class MisraGries:
+    """
+    Heavy-hitters summary with at most `capacity` counters.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, counters=None):
+        self.capacity = capacity
+        self.counters = Counter()
+        self.count = 0
+        self.error = 0
+        if counters:
+            self.update_counts(counters)
+
+    def update_counts(self, counts):
+        """Merges a mapping of value -> count into the summary."""
+        self.counters.update(counts)
+        self.count += sum(counts.values())
+        self._prune()
+
+    def update_many(self, values):
+        """Adds a batch of numbers to the summary."""
+        self.update_counts(Counter(values))
+
+    def merge(self, other):
+        """Adds the contents of another summary to this one."""
+        self.counters.update(other.counters)
+        self.count += other.count
+        self.error += other.error
+        self._prune()
+
+    def _prune(self):
+        """
+        Keeps the summary within its capacity: the (capacity + 1)-th
+        largest count is subtracted from the `capacity` largest counters
+        and the rest are dropped. Counters that tie with it are kept at
+        0 while there is room, so the summary is never emptied.
+        """
+        if len(self.counters) <= self.capacity:
+            return
+        largest = nlargest(self.capacity + 1, self.counters.items(),
+                           key=lambda item: item[1])
+        threshold = largest.pop()[1]
+        self.error += threshold
+        self.counters = Counter({value: count - threshold
+                                 for value, count in largest})
+
+    def top(self, k):
+        """
+        Returns up to k (value, estimated count, max error) tuples, most
+        frequent first. The true count lies in [estimate, estimate + error].
+        """
+        return [(value, count, self.error)
+                for value, count in nlargest(k, self.counters.items(),
+                                             key=lambda item: item[1])]
+
+    def mode(self):
+        """
+        Returns the value with the highest estimated count, or None when
+        no count is positive (no value stands out from the others).
+        """
+        if not self.counters:
+            return 0.0
+        mode_value = max(self.counters, key=self.counters.get)
+        if not self.counters[mode_value]:
+            return None
+        return mode_value
+
+
+class ModeEstimator:
+    """
+    Mode and top-k estimator that picks its own strategy.
+
+    Values are counted exactly until the table holds more than
+    exact_limit distinct values; then the table is folded into a
+    MisraGries summary of `capacity` counters, so memory stays bounded
+    however small the batches are.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY,
+                 exact_limit=DEFAULT_EXACT_LIMIT):
+        self.capacity = capacity
+        self.exact_limit = exact_limit
+        self.exact = Counter()
+        self.summary = None
+
+    @property
+    def is_exact(self):
+        """True while the counts are still exact."""
+        return self.summary is None
+
+    def update_many(self, values):
+        """Adds a batch of numbers to the estimator."""
+        if self.summary is not None:
+            self.summary.update_many(values)
+            return
+
+        self.exact.update(values)
+        if len(self.exact) > self.exact_limit:
+            self._switch()
+
+    def _switch(self):
+        self.summary = MisraGries(self.capacity, self.exact)
+        self.exact = None
+
+    def merge(self, other):
+        """Adds the contents of another estimator to this one."""
+        if self.summary is None and other.summary is None:
+            self.exact.update(other.exact)
+            if len(self.exact) > self.exact_limit:
+                self._switch()
+            return
+
+        if self.summary is None:
+            self._switch()
+        if other.summary is None:
+            self.summary.update_counts(other.exact)
+        else:
+            self.summary.merge(other.summary)
+
+    def top(self, k):
+        """
+        Returns up to k (value, count, max error) tuples, most frequent
+        first. The error is 0 while the counts are exact.
+        """
+        if self.summary is not None:
+            return self.summary.top(k)
+        return [(value, count, 0)
+                for value, count in nlargest(k, self.exact.items(),
+                                             key=lambda item: item[1])]
+
+    def mode(self):
+        """
+        Returns the most frequent number (estimated once the summary is
+        in use, None if it cannot tell). Ties go to the first value read.
+        """
+        if self.summary is not None:
+            return self.summary.mode()
+        if not self.exact:
+            return 0.0
+        return max(self.exact, key=self.exact.get)
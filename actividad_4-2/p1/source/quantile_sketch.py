@@ -0,0 +1,125 @@
+"""
+quantile_sketch.py
+
+KLL quantile sketch (Karnin, Lang and Liberty, 2016) used by the
+--approx mode of compute_statistics.py.
+
+The sketch keeps a hierarchy of compactors. Level h holds items that each
+stand for 2**h of the original numbers; when a level is full it is sorted
+and every other item is promoted to the level above. Memory stays around
+3 * k items no matter how many numbers are added.
+
+Error bound: for a sketch of parameter k the rank of a reported quantile
+is within about 1.65 / (k / 200) percent of the requested rank with 99%
+confidence, i.e. 1.65% of the count for the default k = 200 (the figure
+published for KLL by Apache DataSketches). bench_approx_quantiles.py
+measures the actual rank error of this implementation.
+"""
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+DEFAULT_K = 200
+CAPACITY_DECAY = 2 / 3
+
+
+class KLLSketch:
+    """
+    Streaming quantile sketch with bounded memory.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        if k < 8:
+            raise ValueError("The sketch parameter k must be at least 8.")
+        self.k = k
+        self.count = 0
+        self.compactors = []
+        self.max_size = 0
+        self._rng = random.Random(seed)
+        self._grow()
+
+    def _capacity(self, height):
+        """Capacity of a level; lower levels shrink geometrically."""
+        depth = len(self.compactors) - height - 1
+        return int(CAPACITY_DECAY ** depth * self.k) + 2
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(height)
+                            for height in range(len(self.compactors)))
+
+    def _size(self):
+        return sum(len(compactor) for compactor in self.compactors)
+
+    def _compress(self):
+        """Compacts full levels until the sketch fits its capacity."""
+        for height, compactor in enumerate(self.compactors):
+            if len(compactor) < self._capacity(height):
+                continue
+            if height + 1 == len(self.compactors):
+                self._grow()
+
+            compactor.sort()
+            # Keep the last item when the level has an odd size
+            leftover = [compactor.pop()] if len(compactor) % 2 else []
+            offset = self._rng.randint(0, 1)
+            self.compactors[height + 1].extend(compactor[offset::2])
+            compactor[:] = leftover
+
+            if self._size() < self.max_size:
+                break
+
+    def update(self, value):
+        """Adds a single number to the sketch."""
+        self.update_many((value,))
+
+    def update_many(self, values):
+        """
+        Adds a batch of numbers to the sketch.
+        The whole batch lands on level 0 and is compacted at once, which
+        never adds more rank error than compacting it piece by piece.
+        """
+        base = self.compactors[0]
+        size_before = len(base)
+        base.extend(values)
+        self.count += len(base) - size_before
+        while self._size() >= self.max_size:
+            self._compress()
+
+    def merge(self, other):
+        """Adds the contents of another sketch to this one."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for height, compactor in enumerate(other.compactors):
+            self.compactors[height].extend(compactor)
+        self.count += other.count
+        while self._size() >= self.max_size:
+            self._compress()
+
+    def _weighted_items(self):
+        """Returns the sorted items and their cumulative weights."""
+        weighted = sorted((item, 1 << height)
+                          for height, compactor in enumerate(self.compactors)
+                          for item in compactor)
+        items = [item for item, _ in weighted]
+        cumulative = list(accumulate(weight for _, weight in weighted))
+        return items, cumulative
+
+    def quantiles(self, fractions):
+        """
+        Returns the approximate quantile for each fraction in [0, 1]
+        (e.g., 0.5 for the median).
+        """
+        if not self.count:
+            return [0.0 for _ in fractions]
+
+        items, cumulative = self._weighted_items()
+        last = len(items) - 1
+        return [items[min(bisect_right(cumulative, fraction * self.count),
+                          last)]
+                for fraction in fractions]
+
+    def quantile(self, fraction):
+        """Returns the approximate quantile for one fraction."""
+        return self.quantiles((fraction,))[0]
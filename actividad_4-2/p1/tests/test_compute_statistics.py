@@ -0,0 +1,265 @@
+"""
+Unit tests for the streaming statistics of compute_statistics.py: the
+TC baselines, RunningStatistics, select_kth, weighted_fsum and the
+--incremental checkpoints.
+"""
+
+import contextlib
+import io
+import os
+import pickle
+import random
+import sys
+import tempfile
+import unittest
+from array import array
+from fractions import Fraction
+from math import fsum, inf, isnan, nan
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(TESTS_DIR, '..', 'source')
+sys.path.insert(0, SOURCE_DIR)
+
+# pylint: disable=wrong-import-position
+from checkpoint import get_checkpoint_path, load_checkpoint  # noqa: E402
+from compute_statistics import (  # noqa: E402
+    RunningStatistics, SummaryOptions, calculate_median, compute_summary,
+    format_row, get_output_dir, incremental_stream_file, select_kth,
+    stream_file)
+from frequency_table import weighted_fsum  # noqa: E402
+
+TEST_CASES = [f"TC{number}" for number in range(1, 8)]
+
+
+def quietly(function, *args):
+    """Calls function with its console output (invalid lines) dropped."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args)
+
+
+def baseline_row(test_case):
+    """Returns the committed result row of a TC file without its time."""
+    path = os.path.join(TESTS_DIR, f"StatisticsResults_{test_case}.txt")
+    with open(path, encoding='utf-8') as file:
+        return file.read().splitlines()[1].rsplit(",", 1)[0]
+
+
+def summary_row(test_case, options=SummaryOptions()):
+    """Returns the result row of a TC file without its time."""
+    file_path = os.path.join(SOURCE_DIR, f"{test_case}.txt")
+    summary = quietly(compute_summary, file_path, options)
+    return format_row(summary, 0.0).rsplit(",", 1)[0]
+
+
+def summary_of(stats):
+    """Returns the exact statistics of a RunningStatistics."""
+    mean, variance = stats.exact_mean_variance()
+    return (stats.count, mean, variance, stats.median(), stats.mode(),
+            stats.top_values(5))
+
+
+class TestBaselineResults(unittest.TestCase):
+    """The TC files give the committed StatisticsResults rows."""
+
+    def test_stream_backend(self):
+        """The default single-pass backend."""
+        for test_case in TEST_CASES:
+            with self.subTest(test_case=test_case):
+                self.assertEqual(summary_row(test_case),
+                                 baseline_row(test_case))
+
+    def test_parallel_ranges(self):
+        """Byte ranges merged from two worker processes."""
+        for test_case in TEST_CASES:
+            with self.subTest(test_case=test_case):
+                self.assertEqual(summary_row(test_case,
+                                             SummaryOptions(jobs=2)),
+                                 baseline_row(test_case))
+
+
+class TestRunningStatistics(unittest.TestCase):
+    """Test cases for RunningStatistics."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [round(rng.gauss(50, 20), 1) for _ in range(5000)]
+
+    def single_pass(self):
+        """Returns the statistics of all the values in one batch."""
+        stats = RunningStatistics()
+        stats.update_many(self.values)
+        return stats
+
+    def test_batches_match_single_pass(self):
+        """Any split into batches gives the same exact results."""
+        stats = RunningStatistics()
+        for start in range(0, len(self.values), 333):
+            stats.update_many(self.values[start:start + 333])
+        self.assertEqual(summary_of(stats), summary_of(self.single_pass()))
+
+    def test_merge(self):
+        """Merging partial accumulators matches a single pass."""
+        merged = RunningStatistics()
+        for start in range(0, len(self.values), 1250):
+            part = RunningStatistics()
+            part.update_many(self.values[start:start + 1250])
+            merged.merge(part)
+        expected = self.single_pass()
+        self.assertEqual(summary_of(merged), summary_of(expected))
+        self.assertAlmostEqual(merged.variance(), expected.variance())
+
+    def test_state_round_trip(self):
+        """A pickled state resumes as if nothing had been saved."""
+        stats = RunningStatistics()
+        stats.update_many(self.values[:3000])
+        state = pickle.loads(pickle.dumps(stats.to_state()))
+        resumed = RunningStatistics.from_state(state)
+        resumed.update_many(self.values[3000:])
+        self.assertEqual(summary_of(resumed), summary_of(self.single_pass()))
+
+    def test_mode_ties_go_to_first_value_read(self):
+        """With equal counts the first value read is the mode."""
+        stats = RunningStatistics()
+        stats.update_many([3.0, 1.0, 1.0, 3.0, 2.0])
+        self.assertEqual(stats.mode(), 3.0)
+        resumed = RunningStatistics.from_state(stats.to_state())
+        resumed.update_many([2.0])
+        self.assertEqual(resumed.mode(), 3.0)
+
+
+class TestSelectKth(unittest.TestCase):
+    """Test cases for select_kth and the 'select' median."""
+
+    def test_every_rank(self):
+        """Each rank gives the value of a sorted copy."""
+        rng = random.Random(3)
+        for size in (1, 2, 31, 32, 33, 200):
+            values = [rng.randint(0, 20) for _ in range(size)]
+            for k in range(size):
+                with self.subTest(size=size, k=k):
+                    buffer = array('d', values)
+                    self.assertEqual(select_kth(buffer, k),
+                                     sorted(values)[k])
+                    self.assertLessEqual(max(buffer[:k + 1]), buffer[k])
+
+    def test_median_methods_agree(self):
+        """'select' and 'sort' give the same median."""
+        rng = random.Random(5)
+        for size in (1, 2, 99, 100, 1001):
+            values = [rng.uniform(-1e6, 1e6) for _ in range(size)]
+            with self.subTest(size=size):
+                self.assertEqual(calculate_median(values, "select"),
+                                 calculate_median(values, "sort"))
+
+
+class TestWeightedFsum(unittest.TestCase):
+    """Test cases for weighted_fsum."""
+
+    def test_matches_expanded_fsum(self):
+        """Same float as fsum() of every value repeated count times."""
+        rng = random.Random(11)
+        for _ in range(200):
+            values = [rng.uniform(-1e3, 1e3) * 10 ** rng.randint(-8, 8)
+                      for _ in range(rng.randint(1, 20))]
+            counts = [rng.choice((1, 1, 2, 3, 50)) for _ in values]
+            expanded = [value for value, count in zip(values, counts)
+                        for _ in range(count)]
+            self.assertEqual(weighted_fsum(values, counts), fsum(expanded))
+
+    def test_large_counts_are_exact(self):
+        """Counts beyond the split limit round the exact total once."""
+        values, counts = [0.1, 1e300, -1e300], [3 << 40, 1 << 30, 1 << 30]
+        exact = sum(Fraction(value) * count
+                    for value, count in zip(values, counts))
+        self.assertEqual(weighted_fsum(values, counts), float(exact))
+
+    def test_special_values(self):
+        """Infinities, NaN and the sign of zero follow fsum()."""
+        self.assertEqual(weighted_fsum([inf, 1.0], [2, 3]), inf)
+        with self.assertRaises(ValueError):
+            weighted_fsum([inf, -inf], [2, 2])
+        self.assertTrue(isnan(weighted_fsum([nan, 1.0], [1, 2])))
+        for values, counts in (([-0.0], [4]), ([-0.0, 0.0], [4, 1])):
+            expanded = [value for value, count in zip(values, counts)
+                        for _ in range(count)]
+            self.assertEqual(str(weighted_fsum(values, counts)),
+                             str(fsum(expanded)))
+
+
+class TestIncrementalCheckpoints(unittest.TestCase):
+    """Test cases for the --incremental checkpoints."""
+
+    def setUp(self):
+        # Closed by tearDown()
+        # pylint: disable-next=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "data.txt")
+        self.checkpoint_path = get_checkpoint_path(
+            get_output_dir(self.file_path), self.file_path)
+        self.write("".join(f"{number % 97}.5\n" for number in range(2000)))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, text, mode='w'):
+        """Writes (or appends) text to the input file."""
+        with open(self.file_path, mode, encoding='utf-8') as file:
+            file.write(text)
+
+    def assert_matches_full_read(self, stats):
+        """The resumed statistics equal those of a fresh full read."""
+        self.assertEqual(summary_of(stats),
+                         summary_of(quietly(stream_file, self.file_path)))
+
+    def checkpoint_offset(self):
+        """Returns the offset the current checkpoint resumes from."""
+        checkpoint = quietly(load_checkpoint, self.checkpoint_path,
+                             self.file_path)
+        return None if checkpoint is None else checkpoint["offset"]
+
+    def test_resumes_after_append(self):
+        """Appended lines are read from the saved offset."""
+        self.assert_matches_full_read(
+            incremental_stream_file(self.file_path))
+        self.assertEqual(self.checkpoint_offset(),
+                         os.path.getsize(self.file_path))
+
+        self.write("1e6\n2,5\nbad\n", mode='a')
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            stats = incremental_stream_file(self.file_path)
+        self.assertEqual(output.getvalue(),
+                         "Error: Line 2003 contains invalid data: 'bad'\n")
+        self.assert_matches_full_read(stats)
+        self.assertEqual(self.checkpoint_offset(),
+                         os.path.getsize(self.file_path))
+
+    def test_unterminated_line_is_not_checkpointed(self):
+        """A last line without newline is counted but read again."""
+        self.write("42", mode='a')
+        self.assert_matches_full_read(
+            incremental_stream_file(self.file_path))
+        self.assertEqual(self.checkpoint_offset(),
+                         os.path.getsize(self.file_path) - 2)
+        self.write("0.5\n", mode='a')
+        self.assert_matches_full_read(
+            incremental_stream_file(self.file_path))
+
+    def test_modified_input_invalidates_checkpoint(self):
+        """Edited or truncated data is recomputed from the start."""
+        incremental_stream_file(self.file_path)
+        for text in ("7" + "".join(f"{number % 97}.5\n"
+                                   for number in range(2000))[1:],
+                     "1.5\n2.5\n"):
+            with self.subTest(text=text[:8]):
+                self.write(text)
+                self.assertIsNone(self.checkpoint_offset())
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    stats = incremental_stream_file(self.file_path)
+                self.assertIn("does not match the input", output.getvalue())
+                self.assert_matches_full_read(stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Unit tests for the bounded-memory estimators of the --approx mode: the
+KLL quantile sketch and the Misra-Gries / ModeEstimator mode summaries.
+"""
+
+import os
+import random
+import sys
+import unittest
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'source'))
+
+# pylint: disable=wrong-import-position
+from heavy_hitters import MisraGries, ModeEstimator  # noqa: E402
+from quantile_sketch import KLLSketch  # noqa: E402
+
+# Rank error allowed for k=200: the 1.65% bound with some margin
+RANK_TOLERANCE = 0.03
+FRACTIONS = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+def rank_error(sorted_values, value, fraction):
+    """Returns how far the rank of value is from fraction, as a share."""
+    count = len(sorted_values)
+    low = bisect_left(sorted_values, value) / count
+    high = bisect_right(sorted_values, value) / count
+    if low <= fraction <= high:
+        return 0.0
+    return min(abs(low - fraction), abs(high - fraction))
+
+
+class TestKLLSketch(unittest.TestCase):
+    """Test cases for KLLSketch."""
+
+    def setUp(self):
+        rng = random.Random(1)
+        self.values = [rng.expovariate(0.01) for _ in range(100_000)]
+        self.sorted_values = sorted(self.values)
+
+    def assert_within_bound(self, sketch):
+        """Every quantile of FRACTIONS is within RANK_TOLERANCE."""
+        self.assertEqual(sketch.count, len(self.values))
+        for fraction, value in zip(FRACTIONS, sketch.quantiles(FRACTIONS)):
+            with self.subTest(fraction=fraction):
+                self.assertLessEqual(
+                    rank_error(self.sorted_values, value, fraction),
+                    RANK_TOLERANCE)
+
+    def test_rank_error(self):
+        """Quantiles of a stream are within the published rank error."""
+        sketch = KLLSketch(seed=2)
+        for start in range(0, len(self.values), 1000):
+            sketch.update_many(self.values[start:start + 1000])
+        self.assert_within_bound(sketch)
+        self.assertLess(sum(map(len, sketch.compactors)), 4 * sketch.k)
+
+    def test_merge(self):
+        """Sketches of parts of the stream merge into one for the whole."""
+        merged = KLLSketch(seed=3)
+        for start in range(0, len(self.values), 25_000):
+            part = KLLSketch(seed=start)
+            part.update_many(self.values[start:start + 25_000])
+            merged.merge(part)
+        self.assert_within_bound(merged)
+
+    def test_small_and_empty(self):
+        """Small inputs are exact; an empty sketch reports 0.0."""
+        self.assertEqual(KLLSketch().quantile(0.5), 0.0)
+        sketch = KLLSketch()
+        sketch.update_many([5.0, 1.0, 3.0])
+        self.assertEqual(sketch.quantiles([0.0, 0.5, 1.0]), [1.0, 3.0, 5.0])
+
+    def test_minimum_k(self):
+        """k below 8 is rejected."""
+        with self.assertRaises(ValueError):
+            KLLSketch(k=7)
+
+
+class TestMisraGries(unittest.TestCase):
+    """Test cases for MisraGries."""
+
+    def test_count_bounds(self):
+        """True counts lie in [estimate, estimate + error]."""
+        rng = random.Random(4)
+        values = [min(int(rng.paretovariate(1.2)), 500)
+                  for _ in range(50_000)]
+        summary = MisraGries(capacity=20)
+        for start in range(0, len(values), 777):
+            summary.update_many(values[start:start + 777])
+        counts = Counter(values)
+        self.assertLessEqual(summary.error, len(values) // 21)
+        for value, estimate, error in summary.top(20):
+            with self.subTest(value=value):
+                self.assertLessEqual(estimate, counts[value])
+                self.assertLessEqual(counts[value], estimate + error)
+        self.assertEqual(summary.mode(), counts.most_common(1)[0][0])
+
+    def test_ties_keep_counters(self):
+        """Counts tied at the threshold are kept at 0, not dropped."""
+        summary = MisraGries(capacity=2)
+        summary.update_many([1.0, 2.0, 3.0])
+        self.assertEqual(len(summary.counters), 2)
+        self.assertEqual(summary.error, 1)
+        self.assertIsNone(summary.mode())
+
+        summary.update_many([2.0, 2.0])
+        self.assertEqual(summary.mode(), 2.0)
+
+    def test_merge(self):
+        """Merged summaries keep the bounds of the combined stream."""
+        first, second = MisraGries(capacity=3), MisraGries(capacity=3)
+        first.update_many([1.0] * 50 + [2.0, 3.0, 4.0, 5.0])
+        second.update_many([1.0] * 20 + [6.0] * 30 + [7.0, 8.0])
+        first.merge(second)
+        estimate = {value: count for value, count, _ in first.top(3)}
+        self.assertLessEqual(estimate[1.0], 70)
+        self.assertGreaterEqual(estimate[1.0] + first.error, 70)
+        self.assertEqual(first.mode(), 1.0)
+
+
+class TestModeEstimator(unittest.TestCase):
+    """Test cases for ModeEstimator."""
+
+    def test_exact_until_limit(self):
+        """Below the limit counts are exact and ties go to the first."""
+        estimator = ModeEstimator(capacity=5, exact_limit=10)
+        estimator.update_many([4.0, 2.0, 2.0, 4.0])
+        self.assertTrue(estimator.is_exact)
+        self.assertEqual(estimator.mode(), 4.0)
+        self.assertEqual(estimator.top(1), [(4.0, 2, 0)])
+
+    def test_switches_to_summary(self):
+        """Past the limit the estimator keeps at most capacity counters."""
+        estimator = ModeEstimator(capacity=5, exact_limit=10)
+        estimator.update_many([float(value) for value in range(20)])
+        estimator.update_many([7.0] * 10)
+        self.assertFalse(estimator.is_exact)
+        self.assertLessEqual(len(estimator.summary.counters), 5)
+        self.assertEqual(estimator.mode(), 7.0)
+
+    def test_merge_exact_into_summary(self):
+        """An exact estimator merges into one that switched."""
+        switched = ModeEstimator(capacity=5, exact_limit=10)
+        switched.update_many([float(value) for value in range(20)])
+        exact = ModeEstimator(capacity=5, exact_limit=10)
+        exact.update_many([3.0] * 8)
+        switched.merge(exact)
+        self.assertEqual(switched.mode(), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,52 +5,142 @@ This module reads a file containing numbers and converts them to
 binary and hexadecimal bases using basic algorithms (no built-in functions).
 It handles invalid data, measures execution time, and outputs results
 to the console and a file in CSV format.
+Optional modes print fixed-width two's complement (--width) or convert
+arbitrarily large integers exactly (--bigint).
 """
 
+import argparse
+import math
 import sys
 import time
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'common'))
+
+# pylint: disable=wrong-import-position
+from number_parser import ParseOptions, iter_batches  # noqa: E402
+from binary_reader import (  # noqa: E402
+    FORMATS, detect_format, iter_binary_batches)
+from result_writer import (  # noqa: E402
+    ResultWriter, add_output_arguments, console_mode)
+from pipeline import (  # noqa: E402
+    DEFAULT_QUEUE_SIZE, PipelineConfig, format_report, run_pipeline)
+
+FIXED_WIDTHS = (8, 16, 32, 64)
+# Numbers up to this many bytes are converted byte by byte
+SPLIT_BYTES = 64
+# 0..TABLE_SIZE-1 are precomputed; other values go through the LRU cache
+TABLE_SIZE = 1 << 16
+DEFAULT_CACHE_SIZE = 4096
+# Numbers per batch in the --pipeline mode
+DEFAULT_BATCH_SIZE = 65536
+
+
+def parse_exact(token):
+    """
+    Converts a token to int without going through float, so integers
+    beyond 2**53 keep every digit. Decimals fall back to float.
+    """
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
 
 
-def read_file(file_path):
+def iter_text_numbers(file_path, exact=False, width=None):
+    """
+    Yields lists of valid integers from a text file (see iter_numbers).
     """
-    Reads a file and returns a list of valid numbers.
+    convert = parse_exact if exact else float
+    limit = 1 << (width - 1) if width else None
+    # Only the comma is accepted as a decimal separator
+    options = ParseOptions(separators=b',', convert=convert)
+    for batch in iter_batches(file_path, options):
+        data = []
+        for line_num, number in zip(batch.line_numbers, batch.values):
+            # nan, inf and overflowing values (e.g. 1e400) have no int
+            if isinstance(number, float) and not math.isfinite(number):
+                print(f"Error: Line {line_num} contains invalid data: "
+                      f"'{batch.source_text(line_num)}'")
+                continue
+            # For conversion, we typically want integers.
+            # We cast to int to ensure clean binary/hex conversion.
+            if isinstance(number, float) and not number.is_integer():
+                print(f"Warning: Line {line_num} contains float "
+                      f"'{batch.source_text(line_num)}', "
+                      f"truncating to int.")
+            number = int(number)
+            if limit and not -limit <= number < limit:
+                print(f"Error: Line {line_num} value {number} does not "
+                      f"fit in {width}-bit two's complement.")
+                continue
+            data.append(number)
+        yield data
+
+
+def iter_binary_numbers(file_path, input_format, width=None):
+    """
+    Yields lists of valid integers from a binary int64, float64 or .npy
+    file (see binary_reader.py). Numbers are identified by their item
+    position, starting at 1.
+    """
+    limit = 1 << (width - 1) if width else None
+    item = 0
+    for values in iter_binary_batches(file_path, input_format):
+        numbers = values.tolist()
+        is_float = values.format in "fd"
+        if is_float or limit:
+            data = []
+            for item_num, number in enumerate(numbers, item + 1):
+                if is_float:
+                    if not math.isfinite(number):
+                        print(f"Error: Item {item_num} contains invalid "
+                              f"data: '{number}'")
+                        continue
+                    if not number.is_integer():
+                        print(f"Warning: Item {item_num} contains float "
+                              f"'{number}', truncating to int.")
+                    number = int(number)
+                if limit and not -limit <= number < limit:
+                    print(f"Error: Item {item_num} value {number} does not "
+                          f"fit in {width}-bit two's complement.")
+                    continue
+                data.append(number)
+        else:
+            # Integers need no checks: the list is the batch as is
+            data = numbers
+        item += len(numbers)
+        yield data
+
+
+def iter_numbers(file_path, exact=False, width=None, input_format="text"):
+    """
+    Reads a file in large chunks and yields lists of valid integers.
     Invalid lines are logged to the console.
     Handles numbers with commas as decimal separators (e.g., '12,5' -> 12.5).
+    With exact, integers are read exactly (see parse_exact). With width,
+    numbers outside the range of a width-bit two's complement are logged
+    and skipped. input_format 'int64', 'float64' or 'npy' reads binary
+    numbers instead of text.
     """
-    data = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                stripped_line = line.strip()
-                if not stripped_line:
-                    continue
-                try:
-                    # Handle special case: replace comma with dot for decimals
-                    sanitized_line = stripped_line.replace(',', '.')
-
-                    # Attempt to convert line to float first
-                    number = float(sanitized_line)
-
-                    # For conversion, we typically want integers.
-                    # We cast to int to ensure clean binary/hex conversion.
-                    if number.is_integer():
-                        data.append(int(number))
-                    else:
-                        print(f"Warning: Line {line_num} contains float "
-                              f"'{stripped_line}', truncating to int.")
-                        data.append(int(number))
-                except ValueError:
-                    print(f"Error: Line {line_num} contains invalid data: "
-                          f"'{stripped_line}'")
+        if input_format == "text":
+            yield from iter_text_numbers(file_path, exact, width)
+        else:
+            yield from iter_binary_numbers(file_path, input_format, width)
     except FileNotFoundError:
         print(f"Error: The file '{file_path}' was not found.")
         sys.exit(1)
     except OSError as err:
         print(f"Error reading file: {err}")
         sys.exit(1)
-
-    return data
+    except ValueError as err:
+        print(f"Error: The file '{file_path}' is not valid {input_format} "
+              f"data: {err}")
+        sys.exit(1)
 
 
 def to_binary(number):
@@ -108,10 +198,358 @@ def to_hexadecimal(number):
     return hex_string
 
 
-def write_results(results, input_file_path):
+def build_byte_table():
+    """
+    Returns a 256 entry table with the zero-padded 8-digit binary and
+    2-digit hexadecimal strings of every byte, built with the basic
+    algorithms above.
+    """
+    table = []
+    for byte in range(256):
+        binary_val = to_binary(byte)
+        hex_val = to_hexadecimal(byte)
+        table.append(("0" * (8 - len(binary_val)) + binary_val,
+                      "0" * (2 - len(hex_val)) + hex_val))
+    return tuple(table)
+
+
+BYTE_TABLE = build_byte_table()
+
+
+def to_binary_and_hex(number, table=BYTE_TABLE):
+    """
+    Converts a number to its binary and hexadecimal strings in a single
+    pass, consuming 8 bits per step through the byte lookup table.
+    The result is identical to (to_binary(number), to_hexadecimal(number)).
+    """
+    if number == 0:
+        return "0", "0"
+
+    sign = ""
+    if number < 0:
+        sign = "-"
+        number = -number
+
+    binary_parts = []
+    hex_parts = []
+    while number:
+        binary_byte, hex_byte = table[number & 0xFF]
+        binary_parts.append(binary_byte)
+        hex_parts.append(hex_byte)
+        number >>= 8
+
+    # Bytes come out least significant first, and the top byte is padded
+    binary_parts.reverse()
+    hex_parts.reverse()
+    return (sign + "".join(binary_parts).lstrip("0"),
+            sign + "".join(hex_parts).lstrip("0"))
+
+
+def to_twos_complement(number, width, table=BYTE_TABLE):
+    """
+    Returns the binary and hexadecimal strings of number as a width-bit
+    two's complement (width is a multiple of 8), zero-padded to the full
+    width. Raises ValueError when the number does not fit.
+    """
+    limit = 1 << (width - 1)
+    if not -limit <= number < limit:
+        raise ValueError(f"{number} does not fit in {width} bits")
+
+    # Masking maps negative numbers to 2**width + number
+    number &= (1 << width) - 1
+    binary_parts = []
+    hex_parts = []
+    for _ in range(width // 8):
+        binary_byte, hex_byte = table[number & 0xFF]
+        binary_parts.append(binary_byte)
+        hex_parts.append(hex_byte)
+        number >>= 8
+
+    binary_parts.reverse()
+    hex_parts.reverse()
+    return "".join(binary_parts), "".join(hex_parts)
+
+
+def padded_digits(number, n_bytes, table=BYTE_TABLE):
+    """
+    Returns the binary and hexadecimal digits of a non-negative number
+    zero-padded to n_bytes bytes.
+
+    Large numbers are split in half on a byte boundary and both halves
+    are converted recursively, so each level costs one shift and one
+    mask over the whole number and the total work is O(n log n) instead
+    of the O(n**2) of peeling one byte at a time.
+    """
+    if n_bytes <= SPLIT_BYTES:
+        binary_parts = []
+        hex_parts = []
+        for _ in range(n_bytes):
+            binary_byte, hex_byte = table[number & 0xFF]
+            binary_parts.append(binary_byte)
+            hex_parts.append(hex_byte)
+            number >>= 8
+        binary_parts.reverse()
+        hex_parts.reverse()
+        return "".join(binary_parts), "".join(hex_parts)
+
+    low_bytes = n_bytes // 2
+    low_bits = low_bytes * 8
+    high_binary, high_hex = padded_digits(number >> low_bits,
+                                          n_bytes - low_bytes, table)
+    low_binary, low_hex = padded_digits(number & ((1 << low_bits) - 1),
+                                        low_bytes, table)
+    return high_binary + low_binary, high_hex + low_hex
+
+
+def to_binary_and_hex_big(number, table=BYTE_TABLE):
+    """
+    Same result as to_binary_and_hex(), in subquadratic time for numbers
+    with thousands of digits.
+    """
+    if number == 0:
+        return "0", "0"
+
+    sign = ""
+    if number < 0:
+        sign = "-"
+        number = -number
+
+    n_bytes = (number.bit_length() + 7) // 8
+    binary_val, hex_val = padded_digits(number, n_bytes, table)
+    return sign + binary_val.lstrip("0"), sign + hex_val.lstrip("0")
+
+
+def get_converter(width=None, bigint=False):
+    """
+    Returns the function that maps a number to its (binary, hex) strings.
+    width selects fixed-width two's complement output; bigint the
+    divide-and-conquer conversion for very large numbers.
+    """
+    if width:
+        return lambda number: to_twos_complement(number, width)
+    return to_binary_and_hex_big if bigint else to_binary_and_hex
+
+
+def convert_batch(numbers, width=None, bigint=False):
+    """
+    Converts a batch of numbers and returns a list of
+    (number, binary, hex) tuples in the same order.
+    """
+    convert = get_converter(width, bigint)
+    return [(number,) + convert(number) for number in numbers]
+
+
+def build_small_table(table=BYTE_TABLE):
+    """
+    Returns the (binary, hex) strings of 0..TABLE_SIZE-1, built from the
+    byte table: each value is its stripped high byte followed by its
+    padded low byte.
+    """
+    small = [to_binary_and_hex(byte) for byte in range(256)]
+    for high in range(1, TABLE_SIZE // 256):
+        high_binary, high_hex = small[high]
+        small.extend((high_binary + binary_byte, high_hex + hex_byte)
+                     for binary_byte, hex_byte in table)
+    return tuple(small)
+
+
+class ConversionCache:
+    """
+    Memoized conversions for repetitive inputs.
+
+    Values in 0..TABLE_SIZE-1 are looked up in a table precomputed when
+    the cache is created (sign-magnitude modes only); any other value
+    goes through a bounded LRU cache of maxsize entries (0 disables it).
+    """
+
+    def __init__(self, width=None, bigint=False,
+                 maxsize=DEFAULT_CACHE_SIZE):
+        self.table = None if width else build_small_table()
+        self.table_hits = 0
+        self._convert = lru_cache(maxsize=maxsize)(
+            get_converter(width, bigint))
+
+    def iter_convert(self, numbers):
+        """Yields the (number, binary, hex) tuple of each number."""
+        table = self.table or ()
+        table_size = len(table)
+        convert = self._convert
+        for number in numbers:
+            if 0 <= number < table_size:
+                self.table_hits += 1
+                yield (number,) + table[number]
+            else:
+                yield (number,) + convert(number)
+
+    def convert_batch(self, numbers):
+        """Same as convert_batch(), using the table and the cache."""
+        return list(self.iter_convert(numbers))
+
+    def stats(self):
+        """Returns (table hits, cache hits, cache misses)."""
+        info = self._convert.cache_info()
+        return self.table_hits, info.hits, info.misses
+
+
+def format_rows(numbers, cache):
+    """
+    Converts a batch of numbers with a ConversionCache and returns its
+    CSV rows together with the (table hits, hits, misses) it added.
+    """
+    before = cache.stats()
+    rows = [f"{num}, {binary_val}, {hex_val}"
+            for num, binary_val, hex_val in cache.iter_convert(numbers)]
+    after = cache.stats()
+    return rows, tuple(new - old for new, old in zip(after, before))
+
+
+WORKER_CACHE = None
+
+
+def init_worker(width, bigint, cache_size):
+    """Process pool initializer: builds the worker's ConversionCache."""
+    global WORKER_CACHE  # pylint: disable=global-statement
+    if bigint and hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+    WORKER_CACHE = ConversionCache(width, bigint, cache_size)
+
+
+def format_rows_in_worker(numbers):
+    """Pool task: format_rows() with the worker's cache."""
+    return format_rows(numbers, WORKER_CACHE)
+
+
+def iter_fixed_batches(batches, batch_size):
+    """Re-slices an iterable of lists into lists of batch_size items."""
+    pending = []
+    for batch in batches:
+        pending.extend(batch)
+        while len(pending) >= batch_size:
+            yield pending[:batch_size]
+            del pending[:batch_size]
+    if pending:
+        yield pending
+
+
+class LazyResultWriter:
     """
-    Writes the results to a file in the ../tests directory relative
-    to the source file.
+    ResultWriter that is only created, and its header written, with the
+    first body rows, so an input without valid numbers leaves no
+    results file behind. Use it as a context manager.
+    """
+
+    def __init__(self, header, output_path, console="all", compress=False):
+        self.header = header
+        self.output_path = output_path
+        self.console = console
+        self.compress = compress
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.writer is not None:
+            self.writer.close()
+
+    @property
+    def rows_written(self):
+        """Rows written so far, header included."""
+        return self.writer.rows_written if self.writer else 0
+
+    def write_rows(self, lines):
+        """Adds many body rows, opening the results file if needed."""
+        if self.writer is None:
+            self.writer = ResultWriter(self.output_path, self.console,
+                                       self.compress)
+            self.writer.write_summary(self.header)
+        self.writer.write_rows(lines)
+
+    def write_summary(self, line):
+        """Adds a footer row after the body rows."""
+        self.writer.write_summary(line)
+
+
+def run_pipelined(batches, writer, cache, args):
+    """
+    Streams batches through parse -> convert -> write (see pipeline.py).
+    Returns the pipeline (stages, queues) statistics and the (table
+    hits, hits, misses) of all the batches, worker processes included.
+    """
+    counts = [0, 0, 0]
+
+    def write(result):
+        rows, added = result
+        writer.write_rows(rows)
+        for index, value in enumerate(added):
+            counts[index] += value
+
+    def size(item):
+        return len(item[0]) if isinstance(item, tuple) else len(item)
+
+    fixed_batches = iter_fixed_batches(batches, args.batch_size)
+    if args.workers:
+        with ProcessPoolExecutor(
+                max_workers=args.workers, initializer=init_worker,
+                initargs=(args.width, args.bigint,
+                          args.cache_size)) as executor:
+            report = run_pipeline(
+                fixed_batches, format_rows_in_worker, write,
+                PipelineConfig(args.queue_size, executor, args.workers,
+                               size))
+    else:
+        report = run_pipeline(fixed_batches,
+                              lambda numbers: format_rows(numbers, cache),
+                              write, PipelineConfig(args.queue_size,
+                                                    size=size))
+    return report, tuple(counts)
+
+
+def convert_file(args, writer):
+    """
+    Converts the numbers of args.input_file into the body rows of a
+    LazyResultWriter, directly or through the --pipeline stages, with a
+    ConversionCache set by the command line options. Returns the
+    pipeline report (None without --pipeline) and the (table hits,
+    hits, misses) of the cache.
+    """
+    cache = ConversionCache(args.width, args.bigint, args.cache_size)
+    batches = iter_numbers(args.input_file,
+                           exact=bool(args.bigint or args.width),
+                           width=args.width,
+                           input_format=detect_format(args.input_file,
+                                                      args.format))
+
+    # The batches are handed over untouched: with --pipeline they are
+    # parsed in the parse stage, and an empty input writes no rows
+    if args.pipeline:
+        return run_pipelined(batches, writer, cache, args)
+    for data in batches:
+        if data:
+            # CSV Rows
+            writer.write_rows(f"{num}, {binary_val}, {hex_val}"
+                              for num, binary_val, hex_val
+                              in cache.iter_convert(data))
+    return None, cache.stats()
+
+
+def print_summary(report, cache_counts, elapsed_time):
+    """
+    Prints the conversion cache counts and, with --pipeline, the
+    per-stage and per-queue report to the console (CSV style).
+    """
+    table_hits, cache_hits, cache_misses = cache_counts
+    print(f"Cache, {table_hits} table hits, {cache_hits} hits, "
+          f"{cache_misses} misses,")
+    if report:
+        for line in format_report(*report, elapsed_time):
+            print(line)
+
+
+def get_output_path(input_file_path):
+    """
+    Returns the results path in the ../tests directory relative to the
+    source file, creating the directory if needed.
     """
     input_dir = os.path.dirname(os.path.abspath(input_file_path))
     base_name = os.path.basename(input_file_path)
@@ -124,15 +562,7 @@ def write_results(results, input_file_path):
         output_dir = os.path.join(input_dir, 'tests')
 
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, output_filename)
-
-    try:
-        with open(output_path, "w", encoding='utf-8') as out_file:
-            for line in results:
-                out_file.write(line + "\n")
-        print(f"Results written to: {output_path}")
-    except OSError as err:
-        print(f"Error writing output file: {err}")
+    return os.path.join(output_dir, output_filename)
 
 
 def main():
@@ -141,38 +571,72 @@ def main():
     """
     start_time = time.time()
 
-    if len(sys.argv) != 2:
-        print("Usage: python convert_numbers.py fileWithData.txt")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
-    data = read_file(input_file)
-
-    if not data:
-        print("No valid data found in the file.")
-        sys.exit(1)
-
-    results = []
-    # CSV Header
-    results.append("NUMBER, BINARY, HEX")
-
-    for num in data:
-        binary_val = to_binary(num)
-        hex_val = to_hexadecimal(num)
-        # CSV Row
-        line_str = f"{num}, {binary_val}, {hex_val}"
-        print(line_str)
-        results.append(line_str)
-
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-
-    # Append time execution as a footer row in CSV format
-    time_msg = f"Execution Time, {elapsed_time:.6f} seconds,"
-    print(time_msg)
-    results.append(time_msg)
-
-    write_results(results, input_file)
+    parser = argparse.ArgumentParser(
+        usage="python convert_numbers.py fileWithData.txt "
+              "[--width {8,16,32,64} | --bigint] [--cache-size N] "
+              "[--format FORMAT] [--quiet | --summary-only] [--gzip] "
+              "[--pipeline [--workers N] [--batch-size N] "
+              "[--queue-size N]]")
+    parser.add_argument("input_file")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--width", type=int, choices=FIXED_WIDTHS,
+                      help="print fixed-width two's complement; values "
+                           "out of range are reported and skipped")
+    mode.add_argument("--bigint", action="store_true",
+                      help="read integers exactly and convert numbers "
+                           "of any size in subquadratic time")
+    parser.add_argument("--cache-size", type=int,
+                        default=DEFAULT_CACHE_SIZE,
+                        help="entries of the LRU conversion cache, 0 "
+                             f"disables it (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("--format", choices=FORMATS, default="auto",
+                        help="input format: text, or raw little-endian "
+                             "int64/float64 or .npy read without parsing "
+                             "(default: auto, by extension: .i64, .f64, "
+                             ".npy, anything else is text)")
+    add_output_arguments(parser)
+    parser.add_argument("--pipeline", action="store_true",
+                        help="run parse, convert and write concurrently "
+                             "and report per-stage throughput")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="processes for the convert stage of "
+                             "--pipeline (default: 0, convert in a thread)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"numbers per --pipeline batch "
+                             f"(default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"batches each --pipeline queue can hold "
+                             f"(default: {DEFAULT_QUEUE_SIZE})")
+    args = parser.parse_args()
+    if args.cache_size < 0:
+        parser.error("--cache-size must not be negative")
+    if args.workers < 0 or args.batch_size < 1 or args.queue_size < 1:
+        parser.error("--workers must not be negative; --batch-size and "
+                     "--queue-size must be at least 1")
+    if args.workers and not args.pipeline:
+        parser.error("--workers requires --pipeline")
+
+    if args.bigint and hasattr(sys, "set_int_max_str_digits"):
+        # Lift the 4300-digit limit on int <-> str conversions
+        sys.set_int_max_str_digits(0)
+
+    with LazyResultWriter("NUMBER, BINARY, HEX",
+                          get_output_path(args.input_file),
+                          console_mode(args), args.gzip) as writer:
+        report, cache_counts = convert_file(args, writer)
+        if not writer.rows_written:
+            print("No valid data found in the file.")
+            sys.exit(1)
+
+        end_time = time.time()
+        elapsed_time = end_time - start_time
+
+        # Append time execution as a footer row in CSV format
+        writer.write_summary(f"Execution Time, {elapsed_time:.6f} seconds,")
+
+    # The cache counts and the pipeline report go to the console only
+    if not args.quiet:
+        print_summary(report, cache_counts, elapsed_time)
 
 
 if __name__ == "__main__":
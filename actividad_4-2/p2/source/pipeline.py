@@ -0,0 +1,268 @@
+"""
+pipeline.py
+
+Pipelined execution used by the --pipeline mode of convert_numbers.py.
+
+    parse --[queue]--> convert --[queue]--> write
+
+Parsing and conversion each run in their own thread and hand fixed-size
+batches to the next stage through bounded queues, so a slow stage
+applies back-pressure instead of letting batches pile up in memory.
+The convert stage can fan out to a process pool; results are collected
+in submission order, so the output order never changes.
+
+Every stage records the rows it handled and the time it spent working
+(for a process pool, the time spent converting in the workers, summed
+over all of them), and every queue records how full it was each time a
+batch was put into it and how long producers and consumers waited on
+it. A stage whose input queue is always full and whose output queue is
+always empty is the bottleneck.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_QUEUE_SIZE = 4
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Settings of run_pipeline(): the capacity of each queue, an optional
+    process pool for the convert stage with its number of workers, and
+    the function that gives the rows of a batch or result.
+    """
+
+    queue_size: int = DEFAULT_QUEUE_SIZE
+    executor: Any = None
+    workers: int = 1
+    size: Callable = len
+
+
+class StageStats:
+    """Rows, batches and busy seconds of one pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.batches = 0
+        self.busy = 0.0
+
+    def record(self, rows, seconds):
+        """Adds one batch of rows processed in seconds."""
+        self.rows += rows
+        self.batches += 1
+        self.busy += seconds
+
+    @property
+    def throughput(self):
+        """Rows per busy second."""
+        return self.rows / self.busy if self.busy else 0.0
+
+
+class MonitoredQueue:
+    """
+    Bounded queue that records its occupancy and the time spent waiting
+    on it by the producer (queue full) and the consumer (queue empty).
+    """
+
+    def __init__(self, name, maxsize):
+        self.name = name
+        self._queue = queue.Queue(maxsize)
+        self.puts = 0
+        self.occupancy_total = 0
+        self.occupancy_max = 0
+        self.put_wait = 0.0
+        self.get_wait = 0.0
+
+    def put(self, item):
+        """Puts an item, recording the occupancy it found."""
+        occupancy = self._queue.qsize()
+        self.puts += 1
+        self.occupancy_total += occupancy
+        self.occupancy_max = max(self.occupancy_max, occupancy)
+        start = time.perf_counter()
+        self._queue.put(item)
+        self.put_wait += time.perf_counter() - start
+
+    def get(self):
+        """Gets an item, recording the time spent waiting for it."""
+        start = time.perf_counter()
+        item = self._queue.get()
+        self.get_wait += time.perf_counter() - start
+        return item
+
+    @property
+    def maxsize(self):
+        """Number of batches the queue can hold."""
+        return self._queue.maxsize
+
+    @property
+    def mean_occupancy(self):
+        """Average number of batches already queued at each put."""
+        return self.occupancy_total / self.puts if self.puts else 0.0
+
+
+@dataclass(frozen=True)
+class _Failure:
+    """Carries an exception (including SystemExit) to the next stage."""
+
+    error: BaseException
+
+
+_DONE = object()
+
+
+def _run_stage(items, output, stats, size, source=None):
+    """
+    Puts every item of an iterator into the output queue, timing how
+    long producing each one took (minus the time spent waiting on the
+    source queue) unless stats is None. Ends with _DONE or a _Failure.
+    """
+    try:
+        iterator = iter(items)
+        while True:
+            waited = source.get_wait if source else 0.0
+            start = time.perf_counter()
+            item = next(iterator, _DONE)
+            if item is _DONE:
+                break
+            if stats is not None:
+                if source:
+                    waited = source.get_wait - waited
+                stats.record(size(item),
+                             time.perf_counter() - start - waited)
+            output.put(item)
+    except BaseException as err:  # pylint: disable=broad-exception-caught
+        output.put(_Failure(err))
+        return
+    output.put(_DONE)
+
+
+def _drain(source):
+    """Yields the items of a queue until _DONE; re-raises failures."""
+    while True:
+        item = source.get()
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+def _convert_serial(batches, convert):
+    for batch in batches:
+        yield convert(batch)
+
+
+def _timed_call(function, item):
+    """Pool task: returns function(item) and the seconds it took."""
+    start = time.perf_counter()
+    result = function(item)
+    return result, time.perf_counter() - start
+
+
+def _convert_pool(batches, convert, config, stats):
+    """
+    Yields convert(batch) computed in config.executor, in order, with
+    up to 2 * config.workers batches in flight. stats records the time
+    each batch took in its worker, not the time spent waiting for it.
+    """
+    pending = deque()
+
+    def collect():
+        result, seconds = pending.popleft().result()
+        stats.record(config.size(result), seconds)
+        return result
+
+    for batch in batches:
+        pending.append(config.executor.submit(_timed_call, convert, batch))
+        if len(pending) >= 2 * config.workers:
+            yield collect()
+    while pending:
+        yield collect()
+
+
+def _start_stages(batches, convert, config, stats, queues):
+    """
+    Starts the parse and convert threads, which feed the two queues.
+    Returns the threads.
+    """
+    parse_stats, convert_stats = stats
+    parsed, converted = queues
+    if config.executor is None:
+        results = _convert_serial(_drain(parsed), convert)
+        stage_args = (results, converted, convert_stats, config.size,
+                      parsed)
+    else:
+        # The pool records the time spent in the workers itself
+        results = _convert_pool(_drain(parsed), convert, config,
+                                convert_stats)
+        stage_args = (results, converted, None, config.size)
+
+    # Daemon threads: an error in the write stage must not leave the
+    # interpreter waiting on a producer blocked on a full queue
+    threads = [
+        threading.Thread(target=_run_stage,
+                         args=(batches, parsed, parse_stats, config.size),
+                         daemon=True),
+        threading.Thread(target=_run_stage, args=stage_args, daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def run_pipeline(batches, convert, write, config=PipelineConfig()):
+    """
+    Runs parse -> convert -> write over an iterable of batches.
+
+    convert maps a batch to a result and write consumes each result in
+    order (in the calling thread). With config.executor, convert runs
+    in its processes and must be picklable. Nothing is written for an
+    empty iterable.
+
+    Returns (stages, queues): the StageStats of parse, convert and write
+    and the two MonitoredQueues.
+    """
+    stages = (StageStats("parse"), StageStats("convert"),
+              StageStats("write"))
+    queues = (MonitoredQueue("parse->convert", config.queue_size),
+              MonitoredQueue("convert->write", config.queue_size))
+    threads = _start_stages(batches, convert, config, stages[:2], queues)
+
+    write_stats = stages[2]
+    for result in _drain(queues[1]):
+        start = time.perf_counter()
+        write(result)
+        write_stats.record(config.size(result), time.perf_counter() - start)
+
+    for thread in threads:
+        thread.join()
+    return stages, queues
+
+
+def format_report(stages, queues, elapsed):
+    """Returns the per-stage and per-queue report as CSV lines."""
+    lines = ["Pipeline Stage, Rows, Batches, Busy Seconds, Rows/s, "
+             "Busy %,"]
+    for stage in stages:
+        busy_share = 100 * stage.busy / elapsed if elapsed else 0.0
+        lines.append(f"{stage.name}, {stage.rows}, {stage.batches}, "
+                     f"{stage.busy:.6f}, {stage.throughput:.0f}, "
+                     f"{busy_share:.1f},")
+    lines.append("Pipeline Queue, Capacity, Mean Occupancy, "
+                 "Max Occupancy, Producer Wait Seconds, "
+                 "Consumer Wait Seconds,")
+    for monitored in queues:
+        lines.append(f"{monitored.name}, {monitored.maxsize}, "
+                     f"{monitored.mean_occupancy:.2f}, "
+                     f"{monitored.occupancy_max}, "
+                     f"{monitored.put_wait:.6f}, "
+                     f"{monitored.get_wait:.6f},")
+    return lines
@@ -0,0 +1,155 @@
+"""
+Unit tests for the base conversions of convert_numbers.py: the TC
+baselines, the byte-table, big-integer and two's complement converters
+and the ConversionCache.
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(TESTS_DIR, '..', 'source')
+sys.path.insert(0, SOURCE_DIR)
+
+# pylint: disable=wrong-import-position
+from convert_numbers import (  # noqa: E402
+    ConversionCache, convert_batch, format_rows, format_rows_in_worker,
+    init_worker, iter_fixed_batches, iter_numbers, to_binary,
+    to_binary_and_hex, to_binary_and_hex_big, to_hexadecimal,
+    to_twos_complement)
+from pipeline import PipelineConfig, run_pipeline  # noqa: E402
+
+TEST_CASES = [f"TC{number}" for number in range(1, 5)]
+
+
+def baseline_rows(test_case):
+    """Returns the committed CSV rows of a TC file, without the footer."""
+    path = os.path.join(TESTS_DIR, f"ConvertionResults_{test_case}.txt")
+    with open(path, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    return [line for line in lines[1:]
+            if not line.startswith("Execution Time")]
+
+
+def read_batches(test_case):
+    """Returns the batches of valid integers of a TC file."""
+    file_path = os.path.join(SOURCE_DIR, f"{test_case}.txt")
+    with contextlib.redirect_stdout(io.StringIO()):
+        return list(iter_numbers(file_path))
+
+
+def row_size(item):
+    """Rows of a batch of numbers or of a format_rows() result."""
+    return len(item[0]) if isinstance(item, tuple) else len(item)
+
+
+class TestBaselineResults(unittest.TestCase):
+    """The TC files give the committed ConvertionResults rows."""
+
+    def test_direct_conversion(self):
+        """Rows converted batch by batch through the cache."""
+        for test_case in TEST_CASES:
+            cache = ConversionCache()
+            rows = [f"{num}, {binary_val}, {hex_val}"
+                    for batch in read_batches(test_case)
+                    for num, binary_val, hex_val in cache.iter_convert(batch)]
+            with self.subTest(test_case=test_case):
+                self.assertEqual(rows, baseline_rows(test_case))
+
+    def test_pipeline(self):
+        """Rows of the --pipeline mode, with threads and with workers."""
+        with ProcessPoolExecutor(max_workers=2, initializer=init_worker,
+                                 initargs=(None, False, 16)) as executor:
+            for test_case in TEST_CASES:
+                cache = ConversionCache()
+                for config, convert in (
+                        (PipelineConfig(size=row_size),
+                         lambda numbers, cache=cache: format_rows(numbers,
+                                                                  cache)),
+                        (PipelineConfig(2, executor, 2, row_size),
+                         format_rows_in_worker)):
+                    rows = []
+                    run_pipeline(
+                        iter_fixed_batches(read_batches(test_case), 37),
+                        convert, lambda result, rows=rows: rows.extend(
+                            result[0]),
+                        config)
+                    with self.subTest(test_case=test_case,
+                                      workers=config.workers):
+                        self.assertEqual(rows, baseline_rows(test_case))
+
+
+class TestConverters(unittest.TestCase):
+    """Test cases for the binary and hexadecimal converters."""
+
+    def setUp(self):
+        rng = random.Random(8)
+        self.numbers = [0, 1, -1, 255, 256, -256, 65535, 65536]
+        self.numbers += [rng.randint(-10 ** 12, 10 ** 12)
+                         for _ in range(500)]
+
+    def test_byte_table_matches_basic_algorithms(self):
+        """to_binary_and_hex() equals to_binary() and to_hexadecimal()."""
+        for number in self.numbers:
+            with self.subTest(number=number):
+                self.assertEqual(to_binary_and_hex(number),
+                                 (to_binary(number), to_hexadecimal(number)))
+
+    def test_big_integers(self):
+        """The subquadratic converter matches for thousands of digits."""
+        rng = random.Random(9)
+        for bits in (1, 8, 511, 512, 513, 4096, 20_001):
+            number = rng.getrandbits(bits) | 1 << (bits - 1)
+            for signed in (number, -number):
+                with self.subTest(bits=bits, signed=signed < 0):
+                    sign = "-" if signed < 0 else ""
+                    self.assertEqual(to_binary_and_hex_big(signed),
+                                     (sign + format(number, "b"),
+                                      sign + format(number, "X")))
+        self.assertEqual(to_binary_and_hex_big(0), ("0", "0"))
+
+    def test_twos_complement(self):
+        """Fixed-width output is padded, and out of range is an error."""
+        self.assertEqual(to_twos_complement(-1, 8), ("11111111", "FF"))
+        self.assertEqual(to_twos_complement(5, 16),
+                         ("0000000000000101", "0005"))
+        self.assertEqual(to_twos_complement(-128, 8), ("10000000", "80"))
+        for number in (128, -129):
+            with self.assertRaises(ValueError):
+                to_twos_complement(number, 8)
+
+
+class TestConversionCache(unittest.TestCase):
+    """Test cases for ConversionCache."""
+
+    def test_same_rows_as_convert_batch(self):
+        """Table and cache lookups give the uncached conversions."""
+        numbers = [3, 70_000, -5, 3, 70_000, 2 ** 40, 65_535, 65_536]
+        for width, bigint in ((None, False), (None, True), (64, False)):
+            with self.subTest(width=width, bigint=bigint):
+                cache = ConversionCache(width, bigint, maxsize=2)
+                self.assertEqual(cache.convert_batch(numbers),
+                                 convert_batch(numbers, width, bigint))
+
+    def test_counts(self):
+        """Small values hit the table; repeated large ones the cache."""
+        cache = ConversionCache(maxsize=4)
+        rows, added = format_rows([7, 7, 100_000, 100_000, -3], cache)
+        self.assertEqual(rows[0], "7, 111, 7")
+        self.assertEqual(added, (2, 1, 2))
+        self.assertEqual(cache.stats(), (2, 1, 2))
+
+    def test_fixed_width_has_no_table(self):
+        """Two's complement values always go through the LRU cache."""
+        cache = ConversionCache(width=8)
+        cache.convert_batch([1, 1])
+        self.assertEqual(cache.stats(), (0, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for the parse -> convert -> write pipeline of pipeline.py.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'source'))
+
+# pylint: disable=wrong-import-position
+from pipeline import PipelineConfig, format_report, run_pipeline  # noqa: E402
+
+
+def double(batch):
+    """Convert stage used by the tests."""
+    return [2 * number for number in batch]
+
+
+class TestRunPipeline(unittest.TestCase):
+    """Test cases for run_pipeline."""
+
+    def setUp(self):
+        self.batches = [list(range(start, start + 10))
+                        for start in range(0, 200, 10)]
+
+    def test_order_and_counts(self):
+        """Results are written in order and every stage counts them."""
+        written = []
+        stages, queues = run_pipeline(iter(self.batches), double,
+                                      written.append,
+                                      PipelineConfig(queue_size=1))
+        self.assertEqual(written, [double(batch) for batch in self.batches])
+        for stage in stages:
+            with self.subTest(stage=stage.name):
+                self.assertEqual((stage.rows, stage.batches), (200, 20))
+        for monitored in queues:
+            with self.subTest(queue=monitored.name):
+                # The 20 batches and the end marker
+                self.assertEqual(monitored.puts, 21)
+                self.assertLessEqual(monitored.occupancy_max, 1)
+
+    def test_empty_input(self):
+        """Nothing is written for an empty iterable."""
+        written = []
+        stages, _ = run_pipeline(iter([]), double, written.append)
+        self.assertEqual(written, [])
+        self.assertEqual([stage.rows for stage in stages], [0, 0, 0])
+
+    def test_convert_error_is_raised(self):
+        """An exception in a stage thread reaches the caller."""
+        def convert(batch):
+            if batch[0] == 100:
+                raise ValueError("bad batch")
+            return batch
+
+        with self.assertRaisesRegex(ValueError, "bad batch"):
+            run_pipeline(iter(self.batches), convert, lambda result: None)
+
+    def test_parse_error_is_raised(self):
+        """An exception while reading batches reaches the caller."""
+        def batches():
+            yield [1, 2]
+            raise OSError("read failed")
+
+        with self.assertRaisesRegex(OSError, "read failed"):
+            run_pipeline(batches(), double, lambda result: None)
+
+    def test_format_report(self):
+        """One line per stage and per queue, under their two headers."""
+        stages, queues = run_pipeline(iter(self.batches), double,
+                                      lambda result: None)
+        lines = format_report(stages, queues, 1.0)
+        self.assertEqual(len(lines), 2 + len(stages) + len(queues))
+        self.assertTrue(lines[1].startswith("parse, 200, 20, "))
+        self.assertTrue(lines[5].startswith("parse->convert, 4, "))
+
+
+if __name__ == "__main__":
+    unittest.main()
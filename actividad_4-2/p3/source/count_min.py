@@ -0,0 +1,99 @@
+"""
+count_min.py
+
+Approximate heavy hitters used by 'word_count.py --top K --approx'.
+
+CountMinSketch keeps `depth` rows of `width` counters. Each word adds its
+count to one counter per row, and its estimate is the smallest of those
+counters. Estimates never undercount; with probability 1 - e**-depth
+they overcount by at most e / width of the total number of words
+(Cormode and Muthukrishnan, 2005).
+
+TopWords feeds the sketch with the per-chunk Counters of word_count.py
+and keeps only the words whose estimate can still reach the top K, so
+memory depends on width * depth and K, not on the vocabulary.
+"""
+
+import math
+from hashlib import blake2b
+from heapq import nlargest
+
+DEFAULT_WIDTH = 1 << 16
+DEFAULT_DEPTH = 4
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch over strings.
+    """
+
+    def __init__(self, width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH):
+        if width < 1 or depth < 1:
+            raise ValueError("The sketch width and depth must be positive.")
+        self.width = width
+        self.depth = depth
+        self.count = 0
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def _columns(self, word):
+        """
+        Returns the counter of the word in each row. One 128-bit hash is
+        split into two halves that generate all the rows (Kirsch and
+        Mitzenmacher double hashing).
+        """
+        digest = blake2b(word.encode('utf-8', 'surrogatepass'),
+                         digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + row * second) % self.width
+                for row in range(self.depth)]
+
+    def add(self, word, count=1):
+        """Adds count occurrences of a word and returns its estimate."""
+        self.count += count
+        estimate = None
+        for row, column in zip(self.rows, self._columns(word)):
+            row[column] += count
+            if estimate is None or row[column] < estimate:
+                estimate = row[column]
+        return estimate
+
+    def estimate(self, word):
+        """Returns the estimated count of a word (never too low)."""
+        return min(row[column]
+                   for row, column in zip(self.rows, self._columns(word)))
+
+    def error_bound(self):
+        """
+        Returns the overcount that holds with probability
+        1 - e**-depth: e / width of the words counted so far.
+        """
+        return math.ceil(math.e / self.width * self.count)
+
+
+class TopWords:
+    """
+    Tracks the k most frequent words with a CountMinSketch.
+
+    Candidates are kept in a dict (first-seen order) and pruned back to
+    the k best estimates whenever they exceed 2 * k.
+    """
+
+    def __init__(self, k, width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}
+
+    def update(self, chunk_counts):
+        """Adds the Counter of one chunk of words."""
+        candidates = self.candidates
+        for word, count in chunk_counts.items():
+            candidates[word] = self.sketch.add(word, count)
+        if len(candidates) > 2 * self.k:
+            self.candidates = dict(nlargest(self.k, candidates.items(),
+                                            key=lambda item: item[1]))
+
+    def top(self):
+        """Returns up to k (word, estimated count), most frequent first."""
+        return nlargest(self.k, self.candidates.items(),
+                        key=lambda item: item[1])
@@ -4,45 +4,338 @@ word_count.py
 This module reads a file containing words, identifies distinct words,
 computes their frequency using basic algorithms, and outputs the
 results to the console and a file in CSV format.
-Results are ordered by frequency (descending).
+Results are ordered by frequency (descending); --top K writes only the
+K most frequent words, selected with a bounded heap instead of sorting
+the whole vocabulary.
+Words are counted as the file is read, so memory grows with the number
+of distinct words rather than with the size of the file.
+Words are split on whitespace; --lowercase or --casefold,
+--strip-punctuation and --stopwords FILE normalize and filter them
+before they are counted.
 """
 
+import argparse
+import codecs
+import mmap
+import re
 import sys
 import time
 import os
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from heapq import nlargest
+from itertools import repeat
+from operator import itemgetter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'common'))
+
+# pylint: disable=wrong-import-position
+from result_writer import (  # noqa: E402
+    ResultWriter, add_output_arguments, console_mode)
+from count_min import DEFAULT_DEPTH, DEFAULT_WIDTH, TopWords  # noqa: E402
+
+CHUNK_SIZE = 1 << 20
+# ASCII whitespace never occurs inside a multi-byte UTF-8 sequence
+ASCII_WHITESPACE = re.compile(rb'[ \t\n\r\x0b\x0c]')
+# Unicode assigns no punctuation (P*) or symbol (S*) category above this
+PUNCTUATION_LIMIT = 0x20000
+
+
+@lru_cache(maxsize=None)
+def punctuation_patterns(limit=PUNCTUATION_LIMIT):
+    """
+    Returns the (leading, both ends) regexes of the runs of Unicode
+    punctuation and symbol characters below chr(limit) at the start of
+    a word, or at its start or end (next to whitespace or to the ends of
+    the text). Built once per process and limit.
+    """
+    ranges = []
+    for code in range(limit):
+        if unicodedata.category(chr(code))[0] not in "PS":
+            continue
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    chars = "".join(re.escape(chr(first)) if first == last
+                    else f"{re.escape(chr(first))}-{re.escape(chr(last))}"
+                    for first, last in ranges)
+    run = f"[{chars}]+"
+    # The leading lookahead lets the engine skip to the next candidate
+    # character instead of trying both branches at every position
+    return (re.compile(rf"(?<!\S){run}"),
+            re.compile(rf"(?=[{chars}])(?:(?<!\S){run}|{run}(?!\S))"))
+
+
+def strip_punctuation_runs(text):
+    """
+    Strips the punctuation and symbols from both ends of every word of
+    a text, like word.strip() with every such character, in C-level
+    regex passes (so "don't" and "e-mail" keep theirs).
+    """
+    if text.isascii():
+        return punctuation_patterns(128)[1].sub("", text)
+    # Testing the large Unicode class at every character is slow, so
+    # the trailing runs are stripped as the leading runs of the
+    # reversed text, where the lookbehind rejects most positions first
+    leading = punctuation_patterns()[0]
+    return leading.sub("", leading.sub("", text)[::-1])[::-1]
+
+
+def normalize_text(text, lowercase=False, casefold=False,
+                   strip_punctuation=False):
+    """
+    Normalizes a block of text in single C-level passes: punctuation and
+    symbols are stripped from both ends of every word (see
+    strip_punctuation_runs()), then the text is lowercased or
+    casefolded. Words are never split or joined, so a chunk can be
+    normalized before it is split into words.
+    """
+    if strip_punctuation:
+        text = strip_punctuation_runs(text)
+    if casefold:
+        return text.casefold()
+    if lowercase:
+        return text.lower()
+    return text
+
+
+def build_normalizer(lowercase=False, casefold=False,
+                     strip_punctuation=False):
+    """
+    Returns the chunk normalizer for the selected options, or None when
+    words are counted exactly as split() finds them. The normalizer is
+    a partial of a module-level function, so it can be sent to worker
+    processes.
+    """
+    if not (lowercase or casefold or strip_punctuation):
+        return None
+    return partial(normalize_text, lowercase=lowercase, casefold=casefold,
+                   strip_punctuation=strip_punctuation)
+
+
+def load_stopwords(file_path, normalize=None):
+    """
+    Reads a whitespace-separated stopword file and returns its words as
+    a set, normalized like the counted words.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            text = file.read()
+    except FileNotFoundError:
+        print(f"Error: The stopword file '{file_path}' was not found.")
+        sys.exit(1)
+    except OSError as err:
+        print(f"Error reading file: {err}")
+        sys.exit(1)
+    if normalize is not None:
+        text = normalize(text)
+    return set(text.split())
 
 
-def read_file(file_path):
+def remove_stopwords(frequency, stopwords):
     """
-    Reads a file and returns a list of words.
-    Invalid lines are logged to the console, but execution continues.
+    Removes the stopwords from a Counter in place. Filtering the
+    distinct words once is cheaper than testing every word read.
     """
-    words = []
+    for word in stopwords:
+        frequency.pop(word, None)
+    return frequency
+
+
+def iter_chunk_words(chunks, normalize=None):
+    """
+    Yields the list of words of each text chunk. A word cut by the end
+    of a chunk is carried over to the next, so the words are the same as
+    splitting every line. With normalize, each chunk is normalized once
+    before it is split, after the cut word has been set aside, so that
+    no word is normalized in two pieces.
+    """
+    if normalize is None:
+        carry = ""
+        for chunk in chunks:
+            if not chunk:
+                continue
+            words = (carry + chunk).split()
+            # The last word may continue in the next chunk
+            carry = "" if chunk[-1].isspace() or not words else words.pop()
+            yield words
+        if carry:
+            yield [carry]
+        return
+
+    carry = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        text = carry + chunk
+        # The last word may continue in the next chunk
+        if chunk[-1].isspace():
+            carry = ""
+        else:
+            *rest, carry = text.rsplit(None, 1)
+            text = rest[0] if rest else ""
+        yield normalize(text).split()
+    if carry:
+        yield normalize(carry).split()
+
+
+def count_file(file_path, chunk_size=CHUNK_SIZE, normalize=None):
+    """
+    Counts the frequency of each distinct word of a file while reading
+    it. Each chunk is counted with one Counter.update() call, which runs
+    in C, and no list of all the words is ever built. normalize is an
+    optional chunk normalizer from build_normalizer().
+    Returns a Counter ordered by first occurrence, like count_words().
+    """
+    frequency = Counter()
     try:
         # Open with utf-8 and 'replace' to handle invalid characters gracefully
         with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
-            for line_num, line in enumerate(file, 1):
-                stripped_line = line.strip()
-                if not stripped_line:
-                    continue
+            chunks = iter(partial(file.read, chunk_size), "")
+            for words in iter_chunk_words(chunks, normalize):
+                frequency.update(words)
+    except FileNotFoundError:
+        print(f"Error: The file '{file_path}' was not found.")
+        sys.exit(1)
+    except OSError as err:
+        print(f"Error reading file: {err}")
+        sys.exit(1)
+    return frequency
 
-                # Split line by whitespace to get words
-                line_words = stripped_line.split()
 
-                if not line_words:
-                    print(f"Warning: Line {line_num} contains no valid words.")
-                    continue
+def split_word_ranges(file_path, n_parts):
+    """
+    Splits a file into at most n_parts (start, end) byte ranges of
+    similar size, each one starting just after an ASCII whitespace byte,
+    so that no word and no UTF-8 character is cut.
+    """
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if not size:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            bounds = [0]
+            for part in range(1, n_parts):
+                target = max(size * part // n_parts, bounds[-1])
+                match = ASCII_WHITESPACE.search(mapped, target)
+                if match is None or match.end() >= size:
+                    break
+                bounds.append(match.end())
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_range_text(file_path, start, end, chunk_size=CHUNK_SIZE):
+    """
+    Yields the text of the byte range [start, end) of a file in decoded
+    chunks (utf-8, invalid bytes replaced as in count_file).
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = file.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield decoder.decode(data)
+    yield decoder.decode(b'', final=True)
+
+
+def count_range(file_path, start, end, normalize=None):
+    """
+    Worker task: counts the words of one byte range of a file.
+    """
+    frequency = Counter()
+    for words in iter_chunk_words(iter_range_text(file_path, start, end),
+                                  normalize):
+        frequency.update(words)
+    return frequency
 
-                words.extend(line_words)
 
+def tree_merge(counters):
+    """
+    Merges a list of Counters pairwise, level by level, always adding the
+    right one into the left one. Words therefore keep the order of their
+    first occurrence across the whole list.
+    """
+    while len(counters) > 1:
+        merged = []
+        for index in range(0, len(counters) - 1, 2):
+            left = counters[index]
+            left.update(counters[index + 1])
+            merged.append(left)
+        if len(counters) % 2:
+            merged.append(counters[-1])
+        counters = merged
+    return counters[0] if counters else Counter()
+
+
+def parallel_count_file(file_path, jobs, normalize=None):
+    """
+    Map-reduce word count: the file is split into whitespace-aligned
+    byte ranges that are counted in a pool of jobs worker processes, and
+    the partial Counters are merged with tree_merge(). The result equals
+    count_file(), including the order of the words.
+    """
+    try:
+        ranges = split_word_ranges(file_path, jobs)
+    except FileNotFoundError:
+        print(f"Error: The file '{file_path}' was not found.")
+        sys.exit(1)
+    except OSError as err:
+        print(f"Error reading file: {err}")
+        sys.exit(1)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        partials = list(executor.map(count_range, repeat(file_path),
+                                     [start for start, _ in ranges],
+                                     [end for _, end in ranges],
+                                     repeat(normalize)))
+    return tree_merge(partials)
+
+
+def approximate_top_words(file_path, k, width=DEFAULT_WIDTH,
+                          depth=DEFAULT_DEPTH, chunk_size=CHUNK_SIZE,
+                          normalize=None, stopwords=()):
+    """
+    Finds the k most frequent words of a file with a Count-Min sketch
+    (see count_min.py), holding only the sketch, the candidates and one
+    chunk of words in memory. Stopwords are dropped from each chunk
+    before it reaches the sketch. Returns the TopWords tracker; its
+    counts may be slightly too high, never too low.
+    """
+    tracker = TopWords(k, width, depth)
+    try:
+        # Open with utf-8 and 'replace' to handle invalid characters gracefully
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            chunks = iter(partial(file.read, chunk_size), "")
+            for words in iter_chunk_words(chunks, normalize):
+                tracker.update(remove_stopwords(Counter(words), stopwords))
     except FileNotFoundError:
         print(f"Error: The file '{file_path}' was not found.")
         sys.exit(1)
     except OSError as err:
         print(f"Error reading file: {err}")
         sys.exit(1)
+    return tracker
+
 
-    return words
+def top_items(word_counts, k=None):
+    """
+    Returns the (word, count) items by count (descending), words with
+    equal counts in first-occurrence order. With k, only the first k
+    are selected, in O(V log k) with a heap; the order is the same as
+    the first k items of the full sort.
+    """
+    if k is None:
+        return sorted(word_counts.items(), key=itemgetter(1), reverse=True)
+    return nlargest(k, word_counts.items(), key=itemgetter(1))
 
 
 def count_words(word_list):
@@ -53,19 +346,13 @@ def count_words(word_list):
     if not word_list:
         return {}
 
-    frequency = {}
-    for word in word_list:
-        if word in frequency:
-            frequency[word] += 1
-        else:
-            frequency[word] = 1
-    return frequency
+    return dict(Counter(word_list))
 
 
-def write_results(results, input_file_path):
+def get_output_path(input_file_path):
     """
-    Writes the results to a file in the ../tests directory relative
-    to the source file.
+    Returns the results path in the ../tests directory relative to the
+    source file, creating the directory if needed.
     """
     input_dir = os.path.dirname(os.path.abspath(input_file_path))
     base_name = os.path.basename(input_file_path)
@@ -78,15 +365,111 @@ def write_results(results, input_file_path):
         output_dir = os.path.join(input_dir, 'tests')
 
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, output_filename)
+    return os.path.join(output_dir, output_filename)
+
+
+def parse_arguments():
+    """Parses and checks the command line options."""
+    parser = argparse.ArgumentParser(
+        usage="python word_count.py fileWithData.txt "
+              "[--jobs N] [--top K [--approx]] "
+              "[--lowercase | --casefold] [--strip-punctuation] "
+              "[--stopwords FILE] [--quiet | --summary-only] [--gzip]")
+    parser.add_argument("input_file")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes counting byte ranges of "
+                             "the file (default: 1)")
+    parser.add_argument("--top", type=int, metavar="K",
+                        help="write only the K most frequent words")
+    parser.add_argument("--approx", action="store_true",
+                        help="with --top, find the words with a Count-Min "
+                             "sketch in bounded memory (counts may be "
+                             "slightly high)")
+    parser.add_argument("--sketch-width", type=int, default=DEFAULT_WIDTH,
+                        help="counters per sketch row "
+                             f"(default: {DEFAULT_WIDTH})")
+    parser.add_argument("--sketch-depth", type=int, default=DEFAULT_DEPTH,
+                        help=f"sketch rows (default: {DEFAULT_DEPTH})")
+    case = parser.add_mutually_exclusive_group()
+    case.add_argument("--lowercase", action="store_true",
+                      help="count words in lowercase")
+    case.add_argument("--casefold", action="store_true",
+                      help="count words in Unicode casefold "
+                           "(caseless matching, e.g. 'Straße' = 'strasse')")
+    parser.add_argument("--strip-punctuation", action="store_true",
+                        help="strip punctuation and symbols from the "
+                             "start and end of words")
+    parser.add_argument("--stopwords", metavar="FILE",
+                        help="do not count the whitespace-separated words "
+                             "of FILE")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    if args.approx and args.top is None:
+        parser.error("--approx requires --top")
+    if args.approx and args.jobs > 1:
+        parser.error("--approx cannot be combined with --jobs")
+    if args.sketch_width < 1 or args.sketch_depth < 1:
+        parser.error("--sketch-width and --sketch-depth must be at least 1")
+    return args
+
+
+def count_input(args):
+    """
+    Counts the words of args.input_file with the selected options.
+    Returns (items, total words, max overcount): the (word, count) items
+    to report, by count, the total of every word read (also with --top)
+    and, with --approx, the bound on how high the counts can be (else
+    None).
+    """
+    normalize = build_normalizer(args.lowercase, args.casefold,
+                                 args.strip_punctuation)
+    stopwords = (load_stopwords(args.stopwords, normalize)
+                 if args.stopwords else set())
+
+    if args.approx:
+        tracker = approximate_top_words(args.input_file, args.top,
+                                        args.sketch_width, args.sketch_depth,
+                                        normalize=normalize,
+                                        stopwords=stopwords)
+        return (tracker.top(), tracker.sketch.count,
+                tracker.sketch.error_bound())
+
+    if args.jobs > 1:
+        word_counts = parallel_count_file(args.input_file, args.jobs,
+                                          normalize)
+    else:
+        word_counts = count_file(args.input_file, normalize=normalize)
+    remove_stopwords(word_counts, stopwords)
+    # Sort items by count (descending), or select only the top K
+    return (top_items(word_counts, args.top), sum(word_counts.values()),
+            None)
 
-    try:
-        with open(output_path, "w", encoding='utf-8') as out_file:
-            for line in results:
-                out_file.write(line + "\n")
-        print(f"Results written to: {output_path}")
-    except OSError as err:
-        print(f"Error writing output file: {err}")
+
+def write_report(args, counted, elapsed_time):
+    """
+    Streams the (items, total words, max overcount) of count_input()
+    and the execution time, CSV style, to the console and the results
+    file.
+    """
+    sorted_items, total_words, error_bound = counted
+    with ResultWriter(get_output_path(args.input_file), console_mode(args),
+                      args.gzip) as writer:
+        writer.write_summary("WORD, COUNT")
+
+        for word, count in sorted_items:
+            writer.write_row(f"{word}, {count}")
+
+        # Footer Row: Grand Total (of every word, also with --top)
+        writer.write_summary(f"GRAND TOTAL, {total_words}")
+        if error_bound is not None:
+            writer.write_summary(f"Max Overcount, {error_bound}")
+
+        # Footer Row: Execution Time
+        writer.write_summary(f"Execution Time, {elapsed_time:.6f} seconds")
 
 
 def main():
@@ -94,51 +477,17 @@ def main():
     Main execution function.
     """
     start_time = time.time()
+    args = parse_arguments()
 
-    if len(sys.argv) != 2:
-        print("Usage: python word_count.py fileWithData.txt")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
-    word_list = read_file(input_file)
-
-    if not word_list:
+    # Calculate frequencies while reading
+    counted = count_input(args)
+    if not counted[1]:
         print("No valid data found in the file.")
         sys.exit(1)
 
-    # Calculate frequencies
-    word_counts = count_words(word_list)
-
-    # Sort items by count (descending)
-    sorted_items = sorted(word_counts.items(), key=lambda item: item[1],
-                          reverse=True)
-
     end_time = time.time()
     elapsed_time = end_time - start_time
-
-    # Format Results (CSV Style)
-    results = []
-    results.append("WORD, COUNT")
-
-    grand_total = 0
-
-    for word, count in sorted_items:
-        line = f"{word}, {count}"
-        print(line)
-        results.append(line)
-        grand_total += count
-
-    # Footer Row: Grand Total
-    total_line = f"GRAND TOTAL, {grand_total}"
-    print(total_line)
-    results.append(total_line)
-
-    # Footer Row: Execution Time
-    time_msg = f"Execution Time, {elapsed_time:.6f} seconds"
-    print(time_msg)
-    results.append(time_msg)
-
-    write_results(results, input_file)
+    write_report(args, counted, elapsed_time)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+"""
+Unit tests for word_count.py: the TC baselines, the chunked and parallel
+counts and the tokenizer options (--lowercase, --casefold,
+--strip-punctuation and --stopwords).
+"""
+
+import os
+import random
+import sys
+import tempfile
+import unicodedata
+import unittest
+from collections import Counter
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(TESTS_DIR, '..', 'source')
+sys.path.insert(0, SOURCE_DIR)
+
+# pylint: disable=wrong-import-position
+from word_count import (  # noqa: E402
+    build_normalizer, count_file, load_stopwords, normalize_text,
+    parallel_count_file, remove_stopwords, top_items)
+
+TEST_CASES = [f"TC{number}" for number in range(1, 6)]
+# Every punctuation (P*) and symbol (S*) character
+PUNCTUATION = "".join(chr(code) for code in range(sys.maxunicode + 1)
+                      if unicodedata.category(chr(code))[0] in "PS")
+
+
+def baseline_lines(test_case):
+    """Returns the committed result lines of a TC file without its time."""
+    path = os.path.join(TESTS_DIR, f"WordCountResults_{test_case}.txt")
+    with open(path, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    return [line for line in lines if not line.startswith("Execution Time")]
+
+
+def report_lines(word_counts):
+    """Returns the result lines of the counts of a file."""
+    return (["WORD, COUNT"]
+            + [f"{word}, {count}" for word, count in top_items(word_counts)]
+            + [f"GRAND TOTAL, {sum(word_counts.values())}"])
+
+
+def strip_words(text):
+    """Reference --strip-punctuation: str.strip() of every word."""
+    return [word.strip(PUNCTUATION) for word in text.split()]
+
+
+class TestBaselineResults(unittest.TestCase):
+    """The TC files give the committed WordCountResults lines."""
+
+    def test_count_file(self):
+        """Chunked single-process counts, with a tiny chunk size too."""
+        for test_case in TEST_CASES:
+            file_path = os.path.join(SOURCE_DIR, f"{test_case}.txt")
+            for chunk_size in (7, 1 << 20):
+                with self.subTest(test_case=test_case, chunk_size=chunk_size):
+                    self.assertEqual(
+                        report_lines(count_file(file_path, chunk_size)),
+                        baseline_lines(test_case))
+
+    def test_parallel_count_file(self):
+        """Counts merged from three worker processes."""
+        for test_case in TEST_CASES:
+            file_path = os.path.join(SOURCE_DIR, f"{test_case}.txt")
+            with self.subTest(test_case=test_case):
+                self.assertEqual(
+                    report_lines(parallel_count_file(file_path, 3)),
+                    baseline_lines(test_case))
+
+    def test_top_items(self):
+        """The top k are the first k items of the full sort."""
+        word_counts = count_file(os.path.join(SOURCE_DIR, "TC5.txt"))
+        ordered = top_items(word_counts)
+        for k in (1, 10, 100):
+            with self.subTest(k=k):
+                self.assertEqual(top_items(word_counts, k), ordered[:k])
+
+
+class TestTokenizerOptions(unittest.TestCase):
+    """Test cases for the normalizer and the stopwords."""
+
+    def setUp(self):
+        # Closed by tearDown()
+        # pylint: disable-next=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, text):
+        """Writes text to a file of the temporary directory."""
+        file_path = os.path.join(self.tmp_dir.name, name)
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return file_path
+
+    def test_no_options_has_no_normalizer(self):
+        """Words are counted as split() finds them by default."""
+        self.assertIsNone(build_normalizer())
+
+    def test_strip_punctuation(self):
+        """Only the ends of each word lose their punctuation."""
+        text = "«Hola», don't e-mail... (x) -- ¿qué? 3.5% $9 ''"
+        self.assertEqual(
+            normalize_text(text, strip_punctuation=True).split(),
+            ["Hola", "don't", "e-mail", "x", "qué", "3.5", "9"])
+
+    def test_strip_punctuation_matches_word_strip(self):
+        """The regex passes equal str.strip() of every word."""
+        rng = random.Random(6)
+        alphabet = "ab1 \t\n.,;'-«»¿?¡!()—…€$%“”"
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet)
+                           for _ in range(rng.randint(0, 40)))
+            with self.subTest(text=text):
+                self.assertEqual(
+                    normalize_text(text, strip_punctuation=True).split(),
+                    [word for word in strip_words(text) if word])
+
+    def test_lowercase_and_casefold(self):
+        """casefold() also folds characters lower() keeps."""
+        self.assertEqual(normalize_text("Straße ÉCOLE", lowercase=True),
+                         "straße école")
+        self.assertEqual(normalize_text("Straße ÉCOLE", casefold=True),
+                         "strasse école")
+
+    def test_normalized_counts(self):
+        """Chunked, parallel and whole-text normalization agree."""
+        text = "The cat, THE dog; the «Cat» (dog).\nStraße STRASSE\n" * 50
+        file_path = self.write("words.txt", text)
+        normalize = build_normalizer(casefold=True, strip_punctuation=True)
+        expected = Counter(normalize(text).split())
+        self.assertEqual(expected["the"], 150)
+        self.assertEqual(expected["strasse"], 100)
+        for counts in (count_file(file_path, 5, normalize),
+                       parallel_count_file(file_path, 2, normalize)):
+            self.assertEqual(top_items(counts), top_items(expected))
+
+    def test_stopwords(self):
+        """Stopwords are normalized like the words and then removed."""
+        normalize = build_normalizer(lowercase=True)
+        stopwords = load_stopwords(self.write("stop.txt", "The\nA  of\n"),
+                                   normalize)
+        self.assertEqual(stopwords, {"the", "a", "of"})
+        counts = Counter(normalize("The top of a hill the end").split())
+        self.assertEqual(remove_stopwords(counts, stopwords),
+                         Counter({"top": 1, "hill": 1, "end": 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+bench_group_by.py
+
+Compares two ways of computing the --group-by sums of the same
+synthetic sales record, priced with the TC1 catalogue, for each group:
+
+- arrays: the former group_sums(), adding the sale, quantity and value
+          of every sale to typed arrays indexed by its code
+- lists:  SalesColumns.group_sums(), counting the sales with Counter and
+          adding the sums to lists of floats
+
+Each row reports the best time over the repeats, the number of groups,
+the speedup over arrays and whether both give the same sums.
+
+Usage: python bench_group_by.py [n_sales] [repeat]
+"""
+
+import os
+import random
+import sys
+import time
+from array import array
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(BENCH_DIR, '..', 'source')
+sys.path.insert(0, SOURCE_DIR)
+
+# pylint: disable=wrong-import-position
+from compute_sales import create_price_lookup, load_json_file  # noqa: E402
+from sales_columns import GROUP_FIELDS, SalesColumns  # noqa: E402
+
+
+def generate_sales(price_map, n_sales, seed=42):
+    """Returns n_sales sales of random products over a year of dates."""
+    rng = random.Random(seed)
+    products = list(price_map)
+    return [{"SALE_ID": index // 5 + 1,
+             "SALE_Date": f"{rng.randint(1, 28):02d}/"
+                          f"{rng.randint(1, 12):02d}/23",
+             "Product": rng.choice(products),
+             "Quantity": rng.randint(1, 20)}
+            for index in range(n_sales)]
+
+
+def array_group_sums(columns, group, values):
+    """The former group_sums(): per-sale sums in arrays indexed by code."""
+    keys = columns.codes[group]
+    n_groups = len(keys)
+    rows = array('l', bytes(n_groups * array('l').itemsize))
+    quantities = array('d', bytes(n_groups * 8))
+    totals = array('d', bytes(n_groups * 8))
+    for code, quantity, value in zip(columns.columns[group],
+                                     columns.quantities, values):
+        rows[code] += 1
+        quantities[code] += quantity
+        totals[code] += value
+    return [group_row for group_row in zip(keys, rows, quantities, totals)
+            if group_row[1]]
+
+
+def list_group_sums(columns, group, values):
+    """SalesColumns.group_sums()."""
+    return columns.group_sums(group, values)
+
+
+def best_time(function, repeat, *args):
+    """Returns (result, best seconds over repeat calls)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    """
+    Main execution function.
+    """
+    n_sales = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    price_map = create_price_lookup(
+        load_json_file(os.path.join(SOURCE_DIR, "TC1.ProductList.json")))
+    columns = SalesColumns(price_map)
+    columns.extend(generate_sales(price_map, n_sales))
+    values = columns.values()
+
+    print("Group,Mode,Sales,Groups,Time (s),Speedup,Same sums")
+    for group in GROUP_FIELDS:
+        results = {name: best_time(function, repeat, columns, group, values)
+                   for name, function in (("arrays", array_group_sums),
+                                          ("lists", list_group_sums))}
+        reference, array_time = results["arrays"]
+        for name, (group_rows, elapsed) in results.items():
+            print(f"{group},{name},{n_sales},{len(group_rows)},"
+                  f"{elapsed:.4f},{array_time / elapsed:.2f},"
+                  f"{group_rows == reference}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+bench_money.py
+
+Compares three ways of totalling the same synthetic sales record, priced
+with the TC1 catalogue:
+
+- float:   compute_total_cost(), the default
+- fixed:   compute_fixed_total() in integer cents (--money fixed),
+           including the time to build its price map
+- decimal: a naive decimal.Decimal running total, for reference
+
+Each row reports the best time over the repeats, the total and how many
+cents it is off from the exact (fixed) total.
+
+Usage: python bench_money.py [n_sales] [repeat]
+"""
+
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(BENCH_DIR, '..', 'source')
+sys.path.insert(0, SOURCE_DIR)
+
+# pylint: disable=wrong-import-position
+from compute_sales import (  # noqa: E402
+    compute_fixed_total, compute_total_cost, create_fixed_price_lookup,
+    create_price_lookup, load_json_file)
+
+
+def generate_sales(price_map, n_sales, seed=42):
+    """Returns n_sales sales of random catalogue products."""
+    rng = random.Random(seed)
+    products = list(price_map)
+    return [{"SALE_ID": index // 5 + 1,
+             "SALE_Date": "01/12/23",
+             "Product": rng.choice(products),
+             "Quantity": rng.randint(1, 20)}
+            for index in range(n_sales)]
+
+
+def decimal_total(price_map, sales_record):
+    """Naive exact total: one Decimal multiplication per sale."""
+    prices = {title: Decimal(repr(price))
+              for title, price in price_map.items()}
+    total_cost = Decimal(0)
+    for sale in sales_record:
+        total_cost += prices[sale["Product"]] * sale["Quantity"]
+    return total_cost
+
+
+def fixed_total(price_map, sales_record):
+    """compute_fixed_total() with its price map built inside the timing."""
+    return compute_fixed_total(*create_fixed_price_lookup(price_map),
+                               sales_record)
+
+
+def best_time(function, repeat, *args):
+    """Returns (result, best seconds over repeat calls)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    """
+    Main execution function.
+    """
+    n_sales = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    price_map = create_price_lookup(
+        load_json_file(os.path.join(SOURCE_DIR, "TC1.ProductList.json")))
+    sales_record = generate_sales(price_map, n_sales)
+
+    results = {}
+    for name, function in (("float", compute_total_cost),
+                           ("fixed", fixed_total),
+                           ("decimal", decimal_total)):
+        results[name] = best_time(function, repeat, price_map, sales_record)
+
+    exact = results["fixed"][0]
+    float_time = results["float"][1]
+    print("Mode,Sales,Time (s),Relative to float,Total,Cents off exact")
+    for name, (total_cost, elapsed) in results.items():
+        cents_off = (Decimal(total_cost) - exact).scaleb(2)
+        print(f"{name},{n_sales},{elapsed:.4f},{elapsed / float_time:.2f},"
+              f"{total_cost:.2f},{cents_off:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+This module keeps a compiled copy of a price catalogue for the
+--catalogue-cache mode of compute_sales.py.
+
+The cache is a pickle file in the 'tests' folder holding the price map
+(title -> price) together with the modification time, size and SHA-256
+of the catalogue it was built from. Loading it skips parsing the JSON
+catalogue and rebuilding the map. It is used when the catalogue's
+modification time and size are unchanged, or when its content hash is
+unchanged (e.g. the file was only touched); otherwise it is rebuilt.
+"""
+
+import hashlib
+import os
+import pickle
+
+CACHE_VERSION = 1
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def get_cache_path(output_dir, price_file_path):
+    """Returns the cache path that belongs to a price catalogue."""
+    base_name = os.path.basename(price_file_path)
+    file_name_no_ext = os.path.splitext(base_name)[0]
+    return os.path.join(output_dir, f"{file_name_no_ext}.pricecache")
+
+
+def file_hash(file_path):
+    """Returns the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache(cache_path, price_file_path):
+    """
+    Returns the cached price map, or None when there is no cache or it
+    does not match the current catalogue.
+    """
+    if not (os.path.exists(cache_path) and os.path.exists(price_file_path)):
+        return None
+    try:
+        with open(cache_path, 'rb') as file:
+            cache = pickle.load(file)
+        if cache.get("version") != CACHE_VERSION:
+            return None
+        stat = os.stat(price_file_path)
+        if (cache["mtime_ns"], cache["size"]) == (stat.st_mtime_ns,
+                                                  stat.st_size):
+            return cache["prices"]
+        if (cache["size"] == stat.st_size
+                and cache["sha256"] == file_hash(price_file_path)):
+            # Same content with a new modification time
+            save_cache(cache_path, (stat.st_mtime_ns, stat.st_size,
+                                    cache["sha256"]), cache["prices"])
+            return cache["prices"]
+        return None
+    except (OSError, EOFError, ValueError, KeyError, TypeError,
+            AttributeError, pickle.UnpicklingError) as err:
+        print(f"Warning: Ignoring unreadable catalogue cache "
+              f"'{cache_path}': {err}")
+        return None
+
+
+def catalogue_key(price_file_path):
+    """Returns the (mtime_ns, size, sha256) that identify a catalogue."""
+    stat = os.stat(price_file_path)
+    return stat.st_mtime_ns, stat.st_size, file_hash(price_file_path)
+
+
+def save_cache(cache_path, key, price_map):
+    """Writes the price map built from a catalogue with the given key."""
+    mtime_ns, size, sha256 = key
+    cache = {
+        "version": CACHE_VERSION,
+        "mtime_ns": mtime_ns,
+        "size": size,
+        "sha256": sha256,
+        "prices": price_map,
+    }
+    temp_path = cache_path + ".tmp"
+    try:
+        with open(temp_path, 'wb') as file:
+            pickle.dump(cache, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError as err:
+        print(f"Warning: Could not write catalogue cache "
+              f"'{cache_path}': {err}")
+
+
+def load_price_map(cache_path, price_file_path, build_price_map):
+    """
+    Returns (price map, hit): the cached price map of a catalogue, or
+    the one returned by build_price_map() on a cache miss, which is
+    then cached. The price map is None if it could not be built.
+    """
+    price_map = load_cache(cache_path, price_file_path)
+    if price_map is not None:
+        return price_map, True
+    try:
+        # Taken before reading, so a concurrent edit invalidates the cache
+        key = catalogue_key(price_file_path)
+    except OSError:
+        key = None
+    price_map = build_price_map()
+    if price_map is not None and key is not None:
+        save_cache(cache_path, key, price_map)
+    return price_map, False
@@ -1,12 +1,53 @@
 """
 This module computes the total sales from a JSON file using a price catalogue.
 It handles file paths dynamically to save results in a sibling 'tests' folder.
+
+The sales record is read one sale at a time, either from a top-level
+JSON array or from a JSON Lines (NDJSON) file, so the total is
+accumulated in constant memory whatever the size of the record.
+With --group-by, the sales are loaded into a columnar table instead
+(see sales_columns.py) and totals by product, date and/or sale ID are
+written to a CSV report next to the results file.
+Many sales files (or directories of them) are totalled in a process
+pool that receives the price map once, and are merged into a combined
+report with the time spent on each file. With --catalogue-cache, the
+price map is loaded from a compiled cache of the catalogue (see
+catalogue_cache.py) that is rebuilt whenever the catalogue changes.
+With --money fixed, the total is accumulated exactly in integer cents
+(or finer units when a price has more decimals) instead of in a float.
 """
 
+import argparse
+import glob
+import gzip
 import sys
 import json
+import re
 import time
 import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import (
+    Context, Decimal, MAX_EMAX, MAX_PREC, MIN_EMIN, localcontext)
+from itertools import repeat
+
+from catalogue_cache import get_cache_path, load_price_map
+from sales_columns import GROUP_FIELDS, SalesColumns, format_group_report
+
+SALES_FORMATS = ("auto", "json", "ndjson")
+MONEY_MODES = ("float", "fixed")
+# Prices are kept in cents unless a price has more decimal places
+MIN_PRICE_PLACES = 2
+# Decimal arithmetic of --money fixed: nothing is ever rounded
+EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+NDJSON_EXTENSIONS = (".jsonl", ".ndjson")
+SALES_EXTENSIONS = (".json",) + NDJSON_EXTENSIONS
+READ_CHUNK_SIZE = 1 << 16
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# The separator after an array item, with the whitespace around it
+ITEM_SEPARATOR = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+# Text at the end of the buffer that may be the start of a longer
+# number or literal (e.g. '1.' of '1.5', 'tr' of 'true')
+PARTIAL_TOKEN = re.compile(r'[\w.+-]*\Z')
 
 
 def load_json_file(filename):
@@ -31,6 +72,148 @@ def load_json_file(filename):
         return None
 
 
+def detect_sales_format(filename, requested="auto"):
+    """
+    Returns the format of a sales file: the requested one, or for 'auto'
+    'ndjson' for .jsonl/.ndjson files and files that do not start with
+    a JSON array, 'json' otherwise.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    if requested != "auto":
+        return requested
+    if filename.lower().endswith(NDJSON_EXTENSIONS):
+        return "ndjson"
+    with open(filename, 'r', encoding='utf-8') as file:
+        while True:
+            chunk = file.read(READ_CHUNK_SIZE)
+            stripped = chunk.lstrip()
+            if stripped or not chunk:
+                return "json" if stripped[:1] in ("[", "") else "ndjson"
+
+
+def iter_json_array(file, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yields the items of the top-level JSON array of a text file one at a
+    time, with json.JSONDecoder.raw_decode() on a sliding buffer. Only
+    the unparsed part of the buffer is kept, so memory is bounded by
+    the largest single item.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        """
+        Reads one more chunk, at least as large as the unparsed part of
+        the buffer so that a large item is not re-parsed too often.
+        Returns False at end of file.
+        """
+        nonlocal buffer, pos, eof
+        chunk = file.read(max(chunk_size, len(buffer) - pos))
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace():
+        """Moves pos to the next non-whitespace character, if any."""
+        nonlocal pos
+        while True:
+            pos = JSON_WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or not fill():
+                return
+
+    def expect(characters):
+        """Consumes and returns one of characters or raises an error."""
+        nonlocal pos
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] not in characters:
+            raise json.JSONDecodeError(f"Expecting one of {characters!r}",
+                                       buffer, pos)
+        pos += 1
+        return buffer[pos - 1]
+
+    expect("[")
+    skip_whitespace()
+    closed = buffer[pos:pos + 1] == "]"
+    if closed:
+        pos += 1
+    while not closed:
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # A value followed only by a partial token up to the end
+                # of the buffer (e.g. '1' of '1.5') may continue in the
+                # next chunk
+                if eof or not PARTIAL_TOKEN.match(buffer, end):
+                    break
+            except json.JSONDecodeError as err:
+                # Only an item cut off by the end of the buffer is worth
+                # reading more for; anything else is malformed
+                if eof or not (err.pos >= len(buffer)
+                               or err.msg.startswith("Unterminated string")
+                               or PARTIAL_TOKEN.match(buffer, err.pos)):
+                    raise
+            fill()
+        pos = end
+        yield item
+
+        # Fast path: the separator and the next item start are buffered
+        match = ITEM_SEPARATOR.match(buffer, pos)
+        if match and match.end() < len(buffer):
+            closed = match.group(1) == "]"
+            pos = match.end()
+        else:
+            closed = expect(",]") == "]"
+            skip_whitespace()
+
+    skip_whitespace()
+    if pos < len(buffer):
+        raise json.JSONDecodeError("Extra data", buffer, pos)
+
+
+def iter_json_lines(file):
+    """
+    Yields the JSON value of each non-blank line of a JSON Lines file.
+    Invalid lines are logged to the console, but execution continues.
+    """
+    for line_num, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            print(f"Error: Line {line_num} contains invalid JSON.")
+
+
+def iter_sales(filename, sales_format="auto"):
+    """
+    Yields the sales of a sales record one at a time.
+
+    Args:
+        filename (str): The path to the sales file.
+        sales_format (str): 'json' (top-level array), 'ndjson' or 'auto'.
+
+    Raises:
+        OSError: If the file cannot be read.
+        json.JSONDecodeError: If a JSON array file is invalid.
+    """
+    sales_format = detect_sales_format(filename, sales_format)
+    with open(filename, 'r', encoding='utf-8') as file:
+        if sales_format == "ndjson":
+            yield from iter_json_lines(file)
+        else:
+            yield from iter_json_array(file)
+
+
 def create_price_lookup(catalogue):
     """
     Creates a dictionary for O(1) price lookups from the product catalogue.
@@ -50,13 +233,55 @@ def create_price_lookup(catalogue):
     return price_map
 
 
+def create_fixed_price_lookup(price_map):
+    """
+    Converts a price map to fixed point for exact money arithmetic.
+
+    Every price is read as the shortest decimal that round-trips to the
+    float (e.g. 28.1, not 28.100000000000001) and stored as an integer
+    number of 10**-places units: cents, unless some price has more
+    decimal places. Non-finite prices are reported and left out.
+
+    Args:
+        price_map (dict): Dictionary of product prices.
+
+    Returns:
+        tuple: (dict mapping product titles to integer prices, places).
+    """
+    decimals = {}
+    for title, price in price_map.items():
+        decimal_price = Decimal(repr(price))
+        if not decimal_price.is_finite():
+            print(f"Error: Invalid price for '{title}'.")
+            continue
+        decimals[title] = decimal_price
+
+    places = max([MIN_PRICE_PLACES] +
+                 [-price.as_tuple().exponent for price in decimals.values()])
+    fixed_map = {title: int(price.scaleb(places, context=EXACT_CONTEXT))
+                 for title, price in decimals.items()}
+    return fixed_map, places
+
+
+def build_price_map(price_file):
+    """
+    Loads a price catalogue and returns its price map, or None if an
+    error occurs.
+    """
+    catalogue = load_json_file(price_file)
+    if catalogue is None:
+        return None
+    return create_price_lookup(catalogue)
+
+
 def compute_total_cost(price_map, sales_record):
     """
     Calculates the total cost of sales based on the price map.
 
     Args:
         price_map (dict): Dictionary of product prices.
-        sales_record (list): List of sales transactions.
+        sales_record (iterable): Sales transactions, e.g. a list or
+            the iter_sales() generator.
 
     Returns:
         float: The total calculated cost.
@@ -81,7 +306,108 @@ def compute_total_cost(price_map, sales_record):
     return total_cost
 
 
-def get_output_path(sales_file_path):
+def compute_file_total(price_map, sales_file, sales_format="auto",
+                       columns=None, fixed=None):
+    """
+    Computes the total cost of one sales file, read one sale at a time.
+    With columns (a SalesColumns table), the sales are loaded into it
+    and the total is computed from its columns. With fixed, the
+    (fixed_map, places) of create_fixed_price_lookup(), the total is
+    computed exactly with compute_fixed_total().
+
+    Exits with an error message if the file cannot be read or is not
+    valid JSON.
+    """
+    try:
+        sales_record = iter_sales(sales_file, sales_format)
+        if fixed is not None:
+            return compute_fixed_total(*fixed, sales_record)
+        if columns is None:
+            return compute_total_cost(price_map, sales_record)
+        columns.extend(sales_record)
+        return columns.total(columns.values())
+    except FileNotFoundError:
+        print(f"Error: File '{sales_file}' not found.")
+        sys.exit(1)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        print(f"Error: File '{sales_file}' contains invalid JSON.")
+        sys.exit(1)
+    except OSError as error:
+        print(f"Error reading file '{sales_file}': {error}")
+        sys.exit(1)
+
+
+def expand_sales_paths(paths, exclude=()):
+    """
+    Expands directories (their .json, .jsonl and .ndjson files) and glob
+    patterns into sorted sales file paths. Patterns without matches are
+    kept so that they report as missing. Paths in exclude (e.g. the
+    price catalogue) are never returned from a directory or pattern.
+    """
+    excluded = {os.path.abspath(path) for path in exclude}
+    sales_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(os.path.normpath(os.path.join(path, name))
+                             for name in os.listdir(path)
+                             if name.lower().endswith(SALES_EXTENSIONS))
+        else:
+            matches = sorted(glob.glob(path))
+            if not matches:
+                sales_files.append(path)
+                continue
+        sales_files.extend(match for match in matches
+                           if os.path.isfile(match) and
+                           os.path.abspath(match) not in excluded)
+    return sales_files
+
+
+def compute_fixed_total(fixed_map, places, sales_record):
+    """
+    Calculates the exact total cost of sales in fixed point.
+
+    Sales with integer quantities (the usual case) are accumulated as
+    Python ints in 10**-places units, so no rounding happens at all;
+    fractional quantities are added as Decimals in EXACT_CONTEXT, whose
+    precision never rounds the products or the sum. Invalid sales
+    are reported as in compute_total_cost().
+
+    Args:
+        fixed_map (dict): Integer prices from create_fixed_price_lookup().
+        places (int): Decimal places of the integer prices.
+        sales_record (iterable): Sales transactions.
+
+    Returns:
+        Decimal: The total calculated cost.
+    """
+    total_units = 0
+    fractional_units = Decimal(0)
+
+    for sale in sales_record:
+        product = sale.get("Product")
+        quantity = sale.get("Quantity")
+
+        if product not in fixed_map:
+            print(f"Error: Product '{product}' not found in catalogue.")
+            continue
+
+        if isinstance(quantity, int):
+            total_units += fixed_map[product] * quantity
+        elif isinstance(quantity, float):
+            if quantity.is_integer():
+                total_units += fixed_map[product] * int(quantity)
+            else:
+                fractional_units = EXACT_CONTEXT.fma(
+                    fixed_map[product], Decimal(repr(quantity)),
+                    fractional_units)
+        else:
+            print(f"Error: Invalid quantity for '{product}'.")
+
+    with localcontext(EXACT_CONTEXT):
+        return (total_units + fractional_units).scaleb(-places)
+
+
+def get_output_path(sales_file_path, full_stem=False):
     """
     Constructs the output file path based on the sales filename
     and directory structure.
@@ -89,6 +415,8 @@ def get_output_path(sales_file_path):
 
     Args:
         sales_file_path (str): The path provided in command line.
+        full_stem (bool): Use the whole filename without its extension
+            (e.g. "TC1.Sales") instead of the ID before the first dot.
 
     Returns:
         str: The full path where the result file should be saved.
@@ -97,7 +425,10 @@ def get_output_path(sales_file_path):
     filename = os.path.basename(sales_file_path)
 
     # 2. Extract ID (e.g., "TC1") assuming format "ID.Something.json"
-    file_id = filename.split('.')[0]
+    if full_stem:
+        file_id = os.path.splitext(filename)[0]
+    else:
+        file_id = filename.split('.')[0]
 
     # 3. Determine directory structure
     # If path is 'actividad_5-2/source/file.json', base is parent dir
@@ -127,51 +458,342 @@ def get_output_path(sales_file_path):
     return os.path.join(tests_dir, output_filename)
 
 
-def main():
+def get_batch_output_paths(sales_files):
     """
-    Main function to execute the sales computation.
+    Returns the results path of every file of a batch, all different.
+    Files whose IDs collide (e.g. 'TC1.Sales.json' and 'TC1.Returns.json')
+    are named after their whole filename without the extension instead,
+    with a number added if even that is shared (e.g. the same filename
+    in two folders).
+    """
+    id_paths = [get_output_path(sales_file) for sales_file in sales_files]
+    shared = {path for path in id_paths if id_paths.count(path) > 1}
+
+    output_paths = []
+    for sales_file, path in zip(sales_files, id_paths):
+        if path in shared:
+            path = get_output_path(sales_file, full_stem=True)
+        root, extension = os.path.splitext(path)
+        number = 1
+        while path in output_paths:
+            number += 1
+            path = f"{root}_{number}{extension}"
+        output_paths.append(path)
+    return output_paths
+
+
+def get_groups_path(results_path):
+    """
+    Returns the path of the --group-by CSV report that goes next to a
+    results file: SalesResults_<ID>.txt -> SalesGroups_<ID>.csv.
+    """
+    directory, filename = os.path.split(results_path)
+    file_id = os.path.splitext(filename)[0].replace("SalesResults_", "", 1)
+    return os.path.join(directory, f"SalesGroups_{file_id}.csv")
+
+
+def format_results(total_cost, elapsed_time):
+    """Returns the TOTAL SALES COST report of one sales record."""
+    return (
+        f"TOTAL SALES COST\n"
+        f"{'-' * 30}\n"
+        f"Total Cost:   ${total_cost:,.2f}\n"
+        f"Execution Time: {elapsed_time:.4f} seconds\n"
+    )
+
+
+def write_results(results, output_path, compress=False):
+    """
+    Writes the results text to output_path, gzip-compressed (with a .gz
+    suffix) when compress is set.
+
+    Returns:
+        str: The path written, or None if an error occurs.
+    """
+    if compress:
+        output_path += ".gz"
+    try:
+        if compress:
+            with gzip.open(output_path, "wt",
+                           encoding='utf-8') as result_file:
+                result_file.write(results)
+        else:
+            with open(output_path, "w", encoding='utf-8') as result_file:
+                result_file.write(results)
+        return output_path
+    except IOError as error:
+        print(f"Error writing to results file: {error}")
+        return None
+
+
+WORKER_PRICE_MAP = None
+WORKER_FIXED = None
+
+
+def init_worker(price_map, fixed=None):
+    """
+    Process pool initializer: keeps the price map (and its fixed-point
+    version), built once by the parent, for every file the worker
+    totals.
+    """
+    global WORKER_PRICE_MAP, WORKER_FIXED  # pylint: disable=global-statement
+    WORKER_PRICE_MAP = price_map
+    WORKER_FIXED = fixed
+
+
+def timed_total(sales_file, sales_format="auto"):
+    """
+    Worker task for batch mode: returns the total cost of one sales file
+    (None if it could not be read) and the seconds spent on it.
     """
     start_time = time.time()
+    try:
+        total_cost = compute_file_total(WORKER_PRICE_MAP, sales_file,
+                                        sales_format, fixed=WORKER_FIXED)
+    except SystemExit:
+        total_cost = None
+    return total_cost, time.time() - start_time
 
-    if len(sys.argv) != 3:
-        print("Usage: python compute_sales.py priceCatalogue.json "
-              "salesRecord.json")
-        sys.exit(1)
 
-    price_file = sys.argv[1]
-    sales_file = sys.argv[2]
+def iter_batch_totals(price_map, sales_files, args, fixed=None):
+    """
+    Yields the (total cost, seconds) of each sales file, in order,
+    computed in a pool of args.jobs worker processes that share one
+    price map. The total is None for a file that could not be read.
+    """
+    # Small files: hand them to the workers a few at a time
+    chunksize = max(1, len(sales_files) // (4 * args.jobs))
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker,
+                             initargs=(price_map, fixed)) as executor:
+        yield from executor.map(timed_total, sales_files,
+                                repeat(args.sales_format),
+                                chunksize=chunksize)
+
+
+def save_file_results(total_cost, elapsed_time, results_path, args):
+    """Writes the report of one file of a batch to results_path."""
+    output_path = write_results(format_results(total_cost, elapsed_time),
+                                results_path, args.gzip)
+    if output_path and not args.quiet:
+        print(f"Results saved to: {output_path}")
 
-    catalogue = load_json_file(price_file)
-    sales_record = load_json_file(sales_file)
 
-    if catalogue is None or sales_record is None:
-        sys.exit(1)
+def save_combined_report(rows, summary, output_dir, args):
+    """
+    Prints the combined report of a batch as the console mode asks and
+    writes it to args.combined (output_dir/SalesResults_Batch.txt by
+    default).
+    """
+    report = "\n".join(rows) + "\n" + summary
+    console = get_console_mode(args)
+    if console == "all":
+        print(report)
+    elif console == "summary":
+        print(summary)
+
+    combined_path = args.combined or os.path.join(output_dir,
+                                                  "SalesResults_Batch.txt")
+    output_path = write_results(report, combined_path, args.gzip)
+    if output_path and console != "quiet":
+        print(f"Combined results saved to: {output_path}")
+
+
+def run_batch(price_map, sales_files, args, fixed=None):
+    """
+    Computes the total cost of many sales files with iter_batch_totals().
+
+    Every file gets its own SalesResults_*.txt (see
+    get_batch_output_paths()) and a row, with its own time, in a
+    combined report (see save_combined_report()) that ends with the
+    total of all the files. fixed is passed on to compute_file_total().
+    Returns the number of files that produced results.
+    """
+    start_time = time.time()
+    output_paths = get_batch_output_paths(sales_files)
+    # An int start keeps the sum a Decimal in fixed mode
+    grand_total = 0
+    n_done = 0
+
+    rows = ["TOTAL SALES COST BY FILE", "-" * 30,
+            "File,Total Cost,Execution Time"]
+    for sales_file, results_path, (total_cost, elapsed_time) in zip(
+            sales_files, output_paths,
+            iter_batch_totals(price_map, sales_files, args, fixed)):
+        if total_cost is None:
+            continue
+        save_file_results(total_cost, elapsed_time, results_path, args)
+        rows.append(f"{sales_file},{total_cost:.2f},{elapsed_time:.4f}")
+        with localcontext(EXACT_CONTEXT):
+            grand_total += total_cost
+        n_done += 1
+
+    summary = (
+        f"{'-' * 30}\n"
+        f"Files:        {n_done} of {len(sales_files)}\n"
+        f"Total Cost:   ${grand_total:,.2f}\n"
+        f"Execution Time: {time.time() - start_time:.4f} seconds\n"
+    )
+    save_combined_report(rows, summary, os.path.dirname(output_paths[0]),
+                         args)
+    return n_done
 
-    price_map = create_price_lookup(catalogue)
-    total_cost = compute_total_cost(price_map, sales_record)
+
+def run_single(price_map, sales_file, args, fixed=None, start_time=None):
+    """
+    Computes the total cost of one sales file, prints it and writes its
+    SalesResults_*.txt, plus its SalesGroups_*.csv with args.group_by.
+    start_time (default: now) is when the execution time starts.
+    """
+    if start_time is None:
+        start_time = time.time()
+    columns = SalesColumns(price_map) if args.group_by else None
+    total_cost = compute_file_total(price_map, sales_file, args.sales_format,
+                                    columns, fixed)
 
     end_time = time.time()
     elapsed_time = end_time - start_time
 
     # Formatting results
-    results = (
-        f"TOTAL SALES COST\n"
-        f"{'-' * 30}\n"
-        f"Total Cost:   ${total_cost:,.2f}\n"
-        f"Execution Time: {elapsed_time:.4f} seconds\n"
-    )
+    results = format_results(total_cost, elapsed_time)
 
     # Print to screen
-    print(results)
+    if not args.quiet:
+        print(results)
 
     # Write to file in tests folder
-    output_path = get_output_path(sales_file)
-    try:
-        with open(output_path, "w", encoding='utf-8') as result_file:
-            result_file.write(results)
+    results_path = get_output_path(sales_file)
+    output_path = write_results(results, results_path, args.gzip)
+    if output_path and not args.quiet:
         print(f"Results saved to: {output_path}")
-    except IOError as error:
-        print(f"Error writing to results file: {error}")
+
+    if args.group_by:
+        groups = list(dict.fromkeys(args.group_by))
+        groups_path = write_results(
+            format_group_report(columns, groups),
+            get_groups_path(results_path), args.gzip)
+        if groups_path and not args.quiet:
+            print(f"Group totals saved to: {groups_path}")
+
+
+def get_console_mode(args):
+    """Returns the console mode of the options: all, summary or quiet."""
+    if args.quiet:
+        return "quiet"
+    if args.summary_only:
+        return "summary"
+    return "all"
+
+
+def build_parser():
+    """Returns the command line parser of compute_sales.py."""
+    parser = argparse.ArgumentParser(
+        usage="python compute_sales.py priceCatalogue.json "
+              "salesRecord.json [more.json | directory ...] "
+              "[--sales-format FORMAT] [--jobs N] [--combined PATH] "
+              "[--group-by COLUMN ...] [--catalogue-cache] "
+              "[--money {float,fixed}] "
+              "[--quiet | --summary-only] [--gzip]")
+    parser.add_argument("price_file")
+    parser.add_argument("sales_files", nargs="+",
+                        help="sales files, glob patterns (e.g. "
+                             "'*.Sales.json') or directories")
+    parser.add_argument("--sales-format", choices=SALES_FORMATS,
+                        default="auto",
+                        help="sales record format: a JSON array or JSON "
+                             "Lines (default: auto, from the extension "
+                             "and first character)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes for many sales files "
+                             "(default: CPU count)")
+    parser.add_argument("--combined", default=None,
+                        help="combined report path for many sales files")
+    parser.add_argument("--group-by", nargs="+", metavar="COLUMN",
+                        choices=list(GROUP_FIELDS),
+                        help="also write totals by product, date and/or "
+                             "sale (SALE_ID) to SalesGroups_<ID>.csv")
+    parser.add_argument("--catalogue-cache", action="store_true",
+                        help="load the price map from a compiled cache of "
+                             "the catalogue, rebuilt when it changes, and "
+                             "report whether the cache was hit")
+    parser.add_argument("--money", choices=MONEY_MODES, default="float",
+                        help="accumulate the total in a float, or exactly "
+                             "in integer cents (default: float)")
+    console = parser.add_mutually_exclusive_group()
+    console.add_argument("--quiet", action="store_true",
+                         help="do not echo results to the console")
+    console.add_argument("--summary-only", action="store_true",
+                         help="echo only the summary (the whole report "
+                              "for a single sales file)")
+    parser.add_argument("--gzip", action="store_true",
+                        help="write the results file gzip-compressed "
+                             "(adds .gz to its name)")
+    return parser
+
+
+def check_arguments(parser, args):
+    """
+    Validates the options and returns the sales files they name.
+    Exits with an error message on invalid options or no sales files.
+    """
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    sales_files = expand_sales_paths(args.sales_files,
+                                     exclude=[args.price_file])
+    if not sales_files:
+        print("Error: No sales files found.")
+        sys.exit(1)
+    if len(sales_files) > 1 and args.group_by:
+        parser.error("--group-by supports a single sales file")
+    if args.group_by and args.money == "fixed":
+        parser.error("--group-by supports only --money float")
+    return sales_files
+
+
+def load_catalogue(price_file, use_cache=False, quiet=False):
+    """
+    Returns the price map of a catalogue, from its compiled cache with
+    use_cache (reporting whether the cache was hit unless quiet).
+    Exits if the price map cannot be built.
+    """
+    if use_cache:
+        cache_path = get_cache_path(
+            os.path.dirname(get_output_path(price_file)), price_file)
+        price_map, hit = load_price_map(
+            cache_path, price_file, lambda: build_price_map(price_file))
+        if price_map is not None and not quiet:
+            print(f"Catalogue cache {'hit' if hit else 'miss'}: "
+                  f"{cache_path}")
+    else:
+        price_map = build_price_map(price_file)
+
+    if price_map is None:
+        sys.exit(1)
+    return price_map
+
+
+def main():
+    """
+    Main function to execute the sales computation.
+    """
+    start_time = time.time()
+
+    parser = build_parser()
+    args = parser.parse_args()
+    sales_files = check_arguments(parser, args)
+
+    price_map = load_catalogue(args.price_file, args.catalogue_cache,
+                               args.quiet)
+    fixed = (create_fixed_price_lookup(price_map)
+             if args.money == "fixed" else None)
+
+    if len(sales_files) > 1:
+        args.jobs = args.jobs or os.cpu_count() or 1
+        if not run_batch(price_map, sales_files, args, fixed):
+            sys.exit(1)
+        return
+
+    run_single(price_map, sales_files[0], args, fixed, start_time)
 
 
 if __name__ == "__main__":
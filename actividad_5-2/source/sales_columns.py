@@ -0,0 +1,188 @@
+"""
+This module stores sales records column by column for the grouped
+reports of 'compute_sales.py --group-by'.
+
+Product names, sale dates and sale IDs are interned to integer codes,
+and the codes, quantities and catalogue prices are kept in typed arrays
+(a few bytes per sale instead of one dict per sale). Sale values and
+grouped sums are then computed over whole columns in a single pass.
+"""
+
+import csv
+import io
+import operator
+from array import array
+from collections import Counter
+from functools import reduce
+from itertools import islice, repeat
+
+# --group-by choice -> sale field
+GROUP_FIELDS = {
+    "product": "Product",
+    "date": "SALE_Date",
+    "sale": "SALE_ID",
+}
+BATCH_SIZE = 1 << 16
+
+
+def intern(codes, value):
+    """
+    Returns the integer code of a value in a dict of codes, assigning
+    the next one if it is new. The dict keeps the values in first-seen
+    order. Unhashable values are interned by their text.
+    """
+    try:
+        return codes.setdefault(value, len(codes))
+    except TypeError:
+        return codes.setdefault(str(value), len(codes))
+
+
+class SalesColumns:
+    """
+    Columnar table of the valid sales of a record.
+
+    Args:
+        price_map (dict): Dictionary of product prices, as returned by
+            create_price_lookup(). Its products get the first codes.
+    """
+
+    def __init__(self, price_map):
+        self.price_map = price_map
+        self.prices = array('d', price_map.values())
+        # --group-by choice -> {value: code} and the column of codes
+        self.codes = {group: {} for group in GROUP_FIELDS}
+        self.codes["product"] = {title: code
+                                 for code, title in enumerate(price_map)}
+        self.columns = {group: array('l') for group in GROUP_FIELDS}
+        self.quantities = array('d')
+        self._fields = [(field, self.codes[group], self.columns[group])
+                        for group, field in GROUP_FIELDS.items()]
+
+    def __len__(self):
+        return len(self.quantities)
+
+    def append(self, sale):
+        """
+        Adds one sale. Invalid sales are logged to the console and
+        skipped, exactly as compute_total_cost() does.
+        """
+        product = sale.get("Product")
+        quantity = sale.get("Quantity")
+
+        if product not in self.price_map:
+            print(f"Error: Product '{product}' not found in catalogue.")
+            return
+
+        if not isinstance(quantity, (int, float)):
+            print(f"Error: Invalid quantity for '{product}'.")
+            return
+
+        for field, codes, column in self._fields:
+            column.append(intern(codes, sale.get(field)))
+        self.quantities.append(quantity)
+
+    def extend(self, sales_record, batch_size=BATCH_SIZE):
+        """
+        Adds every sale of an iterable of sales, batch_size at a time.
+        A batch whose sales are all valid is added column by column with
+        map() and array.extend(); any other batch goes through append().
+        """
+        sales_record = iter(sales_record)
+        while True:
+            batch = list(islice(sales_record, batch_size))
+            if not batch:
+                return
+            try:
+                added = self._extend_valid(batch)
+            except TypeError:
+                # A sale that is not a dict, or an unhashable value
+                added = False
+            if not added:
+                for sale in batch:
+                    self.append(sale)
+
+    def _extend_valid(self, batch):
+        """
+        Adds a batch of sales if they are all valid; returns False, and
+        adds nothing, otherwise.
+        """
+        products = list(map(dict.get, batch, repeat("Product")))
+        quantities = list(map(dict.get, batch, repeat("Quantity")))
+        if not (all(map(self.price_map.__contains__, products)) and
+                all(map(isinstance, quantities, repeat((int, float))))):
+            return False
+
+        keys = {"product": products}
+        for group, field in GROUP_FIELDS.items():
+            if group not in keys:
+                keys[group] = list(map(dict.get, batch, repeat(field)))
+        for group, values in keys.items():
+            codes = self.codes[group]
+            for value in dict.fromkeys(values):
+                if value not in codes:
+                    codes[value] = len(codes)
+        for group, values in keys.items():
+            self.columns[group].extend(map(self.codes[group].__getitem__,
+                                           values))
+        self.quantities.extend(quantities)
+        return True
+
+    def values(self):
+        """Returns the value (price * quantity) of every sale."""
+        return array('d', map(operator.mul,
+                              map(self.prices.__getitem__,
+                                  self.columns["product"]),
+                              self.quantities))
+
+    @staticmethod
+    def total(values):
+        """
+        Returns the sum of values, added left to right like the running
+        total of compute_total_cost(), so both give the same float.
+        """
+        return reduce(operator.add, values, 0.0)
+
+    def group_sums(self, group, values):
+        """
+        Returns (key, sales, quantity, total) for every distinct value of
+        a --group-by column that has sales, in first-seen order
+        (catalogue order for products).
+
+        The sales per code are counted by Counter in C; the quantity and
+        value sums are added left to right into lists of floats, which
+        unlike arrays do not box and unbox every running sum.
+        """
+        keys = self.codes[group]
+        column = self.columns[group]
+        sales = Counter(column)
+        quantities = [0.0] * len(keys)
+        totals = [0.0] * len(keys)
+        for code, quantity, value in zip(column, self.quantities, values):
+            quantities[code] += quantity
+            totals[code] += value
+
+        return [(key, sales[code], quantities[code], totals[code])
+                for code, key in enumerate(keys) if code in sales]
+
+
+def format_quantity(quantity):
+    """Formats a quantity sum without a decimal part when it is whole."""
+    return str(int(quantity)) if quantity.is_integer() else str(quantity)
+
+
+def format_group_report(columns, groups, values=None):
+    """
+    Returns the per-group CSV report of a SalesColumns table:
+    GROUP, KEY, SALES, QUANTITY, TOTAL with one row per distinct value
+    of each requested group.
+    """
+    if values is None:
+        values = columns.values()
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(["GROUP", "KEY", "SALES", "QUANTITY", "TOTAL"])
+    for group in groups:
+        for key, count, quantity, total in columns.group_sums(group, values):
+            writer.writerow([group, "" if key is None else key, count,
+                             format_quantity(quantity), f"{total:.2f}"])
+    return output.getvalue()
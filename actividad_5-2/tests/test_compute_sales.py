@@ -0,0 +1,111 @@
+"""
+Unit tests for the streaming JSON array parser and the fixed-point totals
+of compute_sales.py.
+"""
+
+import io
+import json
+import os
+import sys
+import unittest
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'source'))
+
+# pylint: disable=wrong-import-position
+from compute_sales import (  # noqa: E402
+    compute_fixed_total, create_fixed_price_lookup, iter_json_array)
+
+SALES_TEXT = """[
+  {"SALE_ID": 1, "Product": "Rustic breakfast", "Quantity": 1.5},
+  {"SALE_ID": 2, "Product": "Caf\\u00e9 \\"con leche\\"", "Quantity": -2E+3},
+  1.5, 2, -0.25e-2, 10E2, true, false, null, "a, b ] c",
+  [1.5, {"nested": [2.5e1]}], {} ,[]
+]"""
+
+
+class ReadCounter(io.StringIO):
+    """StringIO that counts the characters handed out by read()."""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.characters_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.characters_read += len(chunk)
+        return chunk
+
+
+def parse(text, chunk_size):
+    """Returns the list of items of a JSON array text."""
+    return list(iter_json_array(io.StringIO(text), chunk_size))
+
+
+class TestIterJsonArray(unittest.TestCase):
+    """Test cases for iter_json_array."""
+
+    def test_every_chunk_size(self):
+        """Items split at any chunk boundary parse like json.loads."""
+        expected = json.loads(SALES_TEXT)
+        for chunk_size in range(1, len(SALES_TEXT) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(parse(SALES_TEXT, chunk_size), expected)
+
+    def test_numbers_split_before_fraction_or_exponent(self):
+        """A number cut before '.', 'e' or 'E' is read whole."""
+        for text in ("[1.5, 2]", "[1e3, 2]", "[1E3, 2]", "[-1.25E-2]"):
+            for chunk_size in (1, 2, 3):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(parse(text, chunk_size),
+                                     json.loads(text))
+
+    def test_empty_array(self):
+        """An empty array yields nothing."""
+        for chunk_size in (1, 4):
+            self.assertEqual(parse(" [ ] ", chunk_size), [])
+
+    def test_malformed_input(self):
+        """Malformed arrays raise JSONDecodeError at every chunk size."""
+        for text in ("", "{}", "[1, x]", "[1 2]", "[1,]", '[{"a" 1}]',
+                     "[1, 2", '[1, "abc', "[1] 2", "[tru]", "[1.]"):
+            for chunk_size in (1, 3, 64):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(json.JSONDecodeError):
+                        parse(text, chunk_size)
+
+    def test_malformed_item_fails_without_reading_ahead(self):
+        """A malformed item is reported without reading the rest."""
+        tail = ", ".join(['{"Quantity": 1}'] * 10_000) + "]"
+        for bad_item in ('{"Quantity" 1}', "[1, oops]", "@"):
+            file = ReadCounter(f"[{bad_item}, {tail}")
+            with self.subTest(bad_item=bad_item):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_array(file, chunk_size=64))
+                self.assertLess(file.characters_read, 256)
+
+
+class TestComputeFixedTotal(unittest.TestCase):
+    """Test cases for compute_fixed_total."""
+
+    def test_total_beyond_default_precision(self):
+        """Totals of more than 28 significant digits are not rounded."""
+        fixed_map, places = create_fixed_price_lookup(
+            {"Gadget": 12345678.91, "Widget": 0.37})
+        sales = [{"Product": "Gadget", "Quantity": 10 ** 18},
+                 {"Product": "Widget", "Quantity": 0.3333333333333333}]
+        self.assertEqual(
+            compute_fixed_total(fixed_map, places, sales),
+            Decimal("12345678910000000000000000.123333333333333321"))
+
+    def test_fractional_quantities_only(self):
+        """Fractional quantities are multiplied and added exactly."""
+        fixed_map, places = create_fixed_price_lookup({"Tea": 0.1})
+        sales = [{"Product": "Tea", "Quantity": 0.1}] * 3
+        self.assertEqual(compute_fixed_total(fixed_map, places, sales),
+                         Decimal("0.03"))
+
+
+if __name__ == "__main__":
+    unittest.main()